@@ -118,6 +118,40 @@ def send_claim_approval_notification(claim: Claim):
     )
 
 
+def send_claim_decline_notification(claim: Claim, decline_reason=None):
+    """Send claim decline notification via SMS and email"""
+    from configurations.utils.notification_service import NotificationService
+
+    notification_service = NotificationService()
+
+    subject = f"Claim Declined - {claim.transaction_number}"
+    message = f"Your claim {claim.transaction_number} has been declined. Reason: {decline_reason or 'See claim details'}. Provider: {claim.provider.name}"
+
+    result = notification_service.send_notification(
+        recipient=claim.beneficiary.member,
+        subject=subject,
+        message=message,
+        notification_type='notification'
+    )
+
+
+def send_claim_review_notification(claim: Claim):
+    """Send notification that a claim has been referred for review"""
+    from configurations.utils.notification_service import NotificationService
+
+    notification_service = NotificationService()
+
+    subject = f"Claim Under Review - {claim.transaction_number}"
+    message = f"Your claim {claim.transaction_number} has been referred for review. We will notify you once it has been assessed. Provider: {claim.provider.name}"
+
+    result = notification_service.send_notification(
+        recipient=claim.beneficiary.member,
+        subject=subject,
+        message=message,
+        notification_type='notification'
+    )
+
+
 def send_authorization_notification(service_request):
     """Send authorization notification via SMS and email"""
     from configurations.utils.notification_service import NotificationService
@@ -135,6 +169,23 @@ def send_authorization_notification(service_request):
     )
 
 
+def send_service_request_decline_notification(service_request, decline_reason=None):
+    """Send service request decline notification via SMS and email"""
+    from configurations.utils.notification_service import NotificationService
+
+    notification_service = NotificationService()
+
+    subject = f"Authorization Declined - {service_request.request_number}"
+    message = f"Your service request {service_request.request_number} has been declined. Reason: {decline_reason or 'See request details'}. Provider: {service_request.service_provider.name}"
+
+    result = notification_service.send_notification(
+        recipient=service_request.beneficiary.member,
+        subject=subject,
+        message=message,
+        notification_type='notification'
+    )
+
+
 def send_kyc_completion_notification(member):
     """Send KYC completion notification"""
     try:
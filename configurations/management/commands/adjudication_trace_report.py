@@ -0,0 +1,60 @@
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'Show percentiles of adjudication step and rule timings from stored traces'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24, help='Look back this many hours (default 24)')
+        parser.add_argument('--rules', type=int, default=10, help='Show the slowest N rules by p99 (default 10)')
+        parser.add_argument('--service-requests', action='store_true',
+                            help='Report pre-authorizations instead of claims')
+        parser.add_argument('--json', action='store_true', help='Print the full summary as JSON')
+
+    def _write_row(self, row):
+        self.stdout.write(
+            f"  {row['name']:<32} {row['count']:>8} {row['p50_ms']:>10.2f} {row['p90_ms']:>10.2f} "
+            f"{row['p99_ms']:>10.2f} {row['max_ms']:>10.2f} {row['mean_queries']:>8.2f}"
+        )
+
+    def handle(self, *args, **options):
+        from services.functions.adjudication_trace import TraceSummary
+        from services.models import AdjudicationResult
+
+        results = AdjudicationResult.objects.filter(
+            processed_at__gte=timezone.now() - timedelta(hours=options['hours']),
+            processing_type='AUTOMATIC',
+            trace__isnull=False,
+        )
+        if options['service_requests']:
+            results = results.filter(service_request__isnull=False)
+        else:
+            results = results.filter(claim__isnull=False)
+
+        summary = TraceSummary().add_all(results.values_list('trace', flat=True).iterator(chunk_size=2000)).as_dict()
+
+        if options['json']:
+            self.stdout.write(json.dumps(summary, indent=2))
+            return
+
+        if not summary['total']['count']:
+            self.stdout.write(self.style.WARNING("No traced adjudications in this period"))
+            return
+
+        header = f"  {'':<32} {'count':>8} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'max ms':>10} {'queries':>8}"
+
+        self.stdout.write(f"Adjudication steps over the last {options['hours']} hours:")
+        self.stdout.write(header)
+        self._write_row(summary['total'])
+        for row in summary['steps']:
+            self._write_row(row)
+
+        if summary['rules'] and options['rules']:
+            self.stdout.write("Slowest rule evaluations:")
+            self.stdout.write(header)
+            for row in summary['rules'][:options['rules']]:
+                self._write_row(row)
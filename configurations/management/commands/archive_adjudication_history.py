@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Move superseded adjudication history of closed claims into compressed archives'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int,
+                            help='Archive history older than this many days (default ADJUDICATION_ARCHIVE_AFTER_DAYS)')
+        parser.add_argument('--limit', type=int, help='Archive at most this many claims')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Claims archived per transaction (default 500)')
+
+    def handle(self, *args, **options):
+        from services.functions.adjudication_archive import archive_adjudication_history
+
+        summary = archive_adjudication_history(
+            older_than_days=options['days'], chunk_size=options['chunk_size'], limit=options['limit']
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {summary['results']} results, {summary['messages']} messages and "
+                f"{summary['overrides']} overrides of {summary['claims']} claims"
+            )
+        )
@@ -0,0 +1,56 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        'Build a synthetic claims corpus and benchmark the adjudication paths. '
+        'Writes to the default database: point DB_ENGINE/DB_NAME at a scratch SQLite or Postgres database.'
+    )
+
+    def add_arguments(self, parser):
+        from services.functions.benchmark import SCALES, SCENARIOS
+
+        parser.add_argument('--scale', choices=sorted(SCALES), default='small', help='Corpus size preset')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for the corpus (default 1)')
+        parser.add_argument('--members', type=int, help='Override the number of members')
+        parser.add_argument('--claims', type=int, help='Override the number of claims per scenario')
+        parser.add_argument('--scenario', action='append', dest='scenarios', choices=SCENARIOS,
+                            help='Scenario to run (can be repeated, default all)')
+        parser.add_argument('--batch-size', type=int, default=50, help='Claims per process_batch_adjudication call')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+        parser.add_argument('--force', action='store_true',
+                            help='Run even though the database holds claims that are not from a benchmark')
+
+    def handle(self, *args, **options):
+        from services.functions.benchmark import BENCHMARK_INVOICE_PREFIX, SCENARIOS, run_benchmark
+        from services.models import Claim
+
+        if not options['force'] and Claim.objects.exclude(invoice_number__startswith=BENCHMARK_INVOICE_PREFIX).exists():
+            raise CommandError(
+                "The database holds real claims. Run the benchmark against a scratch database, or pass --force"
+            )
+
+        report = run_benchmark(
+            seed=options['seed'],
+            scale=options['scale'],
+            scenarios=options['scenarios'] or SCENARIOS,
+            batch_size=options['batch_size'],
+            members=options['members'],
+            claims=options['claims'],
+        )
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                report_file.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Benchmark report written to {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+        for scenario, result in report['scenarios'].items():
+            self.stderr.write(
+                f"{scenario}: {result['claims_per_second']} claims/s, p50 {result['p50_ms']} ms, "
+                f"p99 {result['p99_ms']} ms, {result['queries_per_claim']} queries/claim"
+            )
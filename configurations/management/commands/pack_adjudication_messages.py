@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Move adjudication message rows into compact message arrays on their results'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Results packed per transaction (default 1000)')
+        parser.add_argument('--limit', type=int, help='Pack at most this many results')
+
+    def handle(self, *args, **options):
+        from services.functions.compact_messages import pack_result_messages
+
+        summary = pack_result_messages(chunk_size=options['chunk_size'], limit=options['limit'])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Packed {summary['messages']} messages into {summary['results']} adjudication results")
+        )
@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the adjudicator daily metrics rollup from manual adjudication results'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int,
+                            help='Only rebuild the last N days (default: from the first manual decision)')
+
+    def handle(self, *args, **options):
+        from django.db.models import Min
+
+        from services.functions.adjudicator_metrics import rollup_adjudicator_metrics
+        from services.models import AdjudicationResult
+
+        if options['days']:
+            since = timezone.localdate() - timedelta(days=options['days'] - 1)
+        else:
+            first = AdjudicationResult.objects.filter(
+                processing_type='MANUAL', processed_by__isnull=False
+            ).aggregate(first=Min('processed_at'))['first']
+            if first is None:
+                self.stdout.write(self.style.WARNING("No manual decisions to roll up"))
+                return
+            since = timezone.localdate(first)
+
+        rows = rollup_adjudicator_metrics(since=since)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} adjudicator daily metrics rows since {since}"))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = ('Rebuild the claim fraud counters, invoice fingerprints and amount statistics from approved and paid claims, '
+            'and backfill missing claim content fingerprints')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--provider', action='append', dest='providers',
+                            help='Only rebuild this provider identification number (can be repeated)')
+
+    def handle(self, *args, **options):
+        from configurations.models import ServiceProvider
+        from services.functions.fraud_signals import (
+            backfill_content_fingerprints, rebuild_amount_statistics, rebuild_fraud_signals
+        )
+
+        provider_ids = None
+        if options['providers']:
+            provider_ids = list(
+                ServiceProvider.objects.filter(
+                    identification_no__in=options['providers']
+                ).values_list('id', flat=True)
+            )
+
+            if not provider_ids:
+                self.stdout.write(self.style.ERROR("No matching service providers found"))
+                return
+
+        summary = rebuild_fraud_signals(provider_ids=provider_ids)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {summary['provider_days']} provider days, {summary['beneficiary_days']} beneficiary days "
+                f"and {summary['fingerprints']} invoice fingerprints"
+            )
+        )
+
+        fingerprinted = backfill_content_fingerprints(provider_ids=provider_ids)
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {fingerprinted} claim content fingerprints"))
+
+        # Amount statistics span providers, so they are only rebuilt in full
+        if provider_ids is None:
+            records = rebuild_amount_statistics()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {records} claim amount statistics records"))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the beneficiary utilization ledger from approved and paid claims'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--membership-number', help='Only rebuild beneficiaries of this membership number')
+        parser.add_argument('--year', type=int, action='append', dest='years',
+                            help='Only rebuild this benefit year (can be repeated)')
+
+    def handle(self, *args, **options):
+        from membership.models import Beneficiary
+        from services.functions.utilization import rebuild_utilization
+
+        beneficiary_ids = None
+        if options['membership_number']:
+            beneficiary_ids = list(
+                Beneficiary.objects.filter(
+                    membership_number=options['membership_number']
+                ).values_list('id', flat=True)
+            )
+
+            if not beneficiary_ids:
+                self.stdout.write(self.style.ERROR(f"No beneficiaries found for {options['membership_number']}"))
+                return
+
+        summary = rebuild_utilization(beneficiary_ids=beneficiary_ids, benefit_years=options['years'])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {summary['annual_rows']} annual and {summary['category_rows']} category utilization rows, "
+                f"{summary['visit_rows']} service visit rows"
+            )
+        )
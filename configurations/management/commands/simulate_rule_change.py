@@ -0,0 +1,77 @@
+import json
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Replay historical claims against a proposed adjudication rule set without writing anything'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='start_date', required=True, help='First service date (YYYY-MM-DD)')
+        parser.add_argument('--to', dest='end_date', required=True, help='Last service date (YYYY-MM-DD)')
+        parser.add_argument('--add-rule', action='append', dest='add_rules', default=[],
+                            help='Rule name to add to the active rules, active or not (can be repeated)')
+        parser.add_argument('--remove-rule', action='append', dest='remove_rules', default=[],
+                            help='Rule name to drop from the active rules (can be repeated)')
+        parser.add_argument('--as-of', dest='rule_date',
+                            help='Evaluate rule effective dates on this date (YYYY-MM-DD, default today)')
+        parser.add_argument('--chunk-size', type=int, help='Claims per chunk')
+        parser.add_argument('--workers', type=int, default=1, help='Worker processes')
+        parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+
+    def _parse_date(self, value):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise CommandError(f"Invalid date: {value}")
+
+    def _rule_ids(self, names):
+        from services.models import AdjudicationRule
+
+        rules = dict(AdjudicationRule.objects.filter(name__in=names).values_list('name', 'id'))
+        missing = set(names) - set(rules)
+        if missing:
+            raise CommandError(f"Unknown adjudication rules: {', '.join(sorted(missing))}")
+        return list(rules.values())
+
+    def handle(self, *args, **options):
+        from services.functions.rule_simulation import run_rule_simulation
+
+        if not options['add_rules'] and not options['remove_rules']:
+            raise CommandError("Give at least one --add-rule or --remove-rule")
+
+        report = run_rule_simulation(
+            start_date=self._parse_date(options['start_date']),
+            end_date=self._parse_date(options['end_date']),
+            add_rule_ids=self._rule_ids(options['add_rules']),
+            remove_rule_ids=self._rule_ids(options['remove_rules']),
+            rule_date=self._parse_date(options['rule_date']) if options['rule_date'] else None,
+            chunk_size=options['chunk_size'],
+            workers=options['workers']
+        )
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(
+            f"Replayed {report['claims']} claims ({report['errors']} errors), "
+            f"{report['changed']} with a different outcome"
+        )
+        self.stdout.write(
+            f"Payout: current rules {report['baseline_payout']:,.2f}, proposed {report['proposed_payout']:,.2f}, "
+            f"change {report['payout_delta']:+,.2f} (historical {report['historical_payout']:,.2f})"
+        )
+
+        for transition in report['transitions']:
+            self.stdout.write(f"  {transition['from']} -> {transition['to']}: {transition['claims']}")
+
+        self.stdout.write("Rule hits (current -> proposed):")
+        for rule in report['rules']:
+            self.stdout.write(
+                f"  {rule['name']}: {rule['baseline_hits']} -> {rule['proposed_hits']}, "
+                f"payout change on affected claims {rule['payout_delta']:+,.2f}"
+            )
+
+        self.stdout.write(self.style.SUCCESS("Simulation complete, nothing was written"))
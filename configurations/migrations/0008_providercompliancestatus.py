@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-19 11:20
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configurations', '0007_importresult_importerror_importsuccess'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProviderComplianceStatus',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('status', models.CharField(choices=[('C', 'Compliant'), ('N', 'Non-Compliant')], default='C', max_length=1, verbose_name='Compliance Status')),
+                ('missing_documents', models.JSONField(blank=True, default=list, verbose_name='Missing Documents')),
+                ('expired_documents', models.JSONField(blank=True, default=list, verbose_name='Expired Documents')),
+                ('next_expiry_date', models.DateField(blank=True, null=True, verbose_name='Next Expiry Date')),
+                ('checked_at', models.DateTimeField(verbose_name='Checked At')),
+                ('service_provider', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='compliance_status', to='configurations.serviceprovider')),
+            ],
+            options={
+                'verbose_name': 'Provider Compliance Status',
+                'verbose_name_plural': 'Provider Compliance Statuses',
+            },
+        ),
+    ]
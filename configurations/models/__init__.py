@@ -2,7 +2,7 @@ from .member import Member, MemberKYCRequirement, MemberKYCDocument
 from .tier import Tier
 from .package import Package, PackageLimit
 from .currency import Currency
-from .service_provider import ServiceProviderType, ServiceProvider, ServiceProviderDocument, ServiceProviderTypeRequirement, ServiceProviderDocumentType
+from .service_provider import ServiceProviderType, ServiceProvider, ServiceProviderDocument, ServiceProviderTypeRequirement, ServiceProviderDocumentType, ProviderComplianceStatus
 from .agents import Agent, AgentCommission, AgentCommissionTerm
 from .vendor import Vendor
 from .package import Package, PackageLimit
@@ -24,6 +24,7 @@ __all__ = [
     'ServiceProviderDocument',
     'ServiceProviderTypeRequirement',
     'ServiceProviderDocumentType',
+    'ProviderComplianceStatus',
     'Agent',
     'AgentCommission',
     'AgentCommissionTerm',
@@ -171,3 +171,39 @@ class ServiceProviderDocument(BaseModel):
         verbose_name = "Service Provider Document"
         verbose_name_plural = "Service Provider Documents"
         ordering = ["service_provider", "document_type"]
+
+
+class ProviderComplianceStatus(BaseModel):
+    service_provider = models.OneToOneField(ServiceProvider, on_delete=models.CASCADE, related_name="compliance_status")
+
+    STATUS_CHOICES = [
+        ("C", "Compliant"),
+        ("N", "Non-Compliant"),
+    ]
+    status = models.CharField(max_length=1, choices=STATUS_CHOICES, default="C", verbose_name="Compliance Status")
+
+    # Required document types not uploaded / past their expiry date: [{"id", "name", "withhold"}]
+    missing_documents = models.JSONField(default=list, blank=True, verbose_name="Missing Documents")
+    expired_documents = models.JSONField(default=list, blank=True, verbose_name="Expired Documents")
+
+    # Earliest expiry among the provider's current documents; the status is stale once it has passed
+    next_expiry_date = models.DateField(null=True, blank=True, verbose_name="Next Expiry Date")
+    checked_at = models.DateTimeField(verbose_name="Checked At")
+
+    @property
+    def missing_document_names(self):
+        return [document["name"] for document in self.missing_documents]
+
+    @property
+    def expired_document_names(self):
+        return [document["name"] for document in self.expired_documents]
+
+    def is_stale(self, on_date):
+        return bool(self.next_expiry_date and self.next_expiry_date < on_date)
+
+    def __str__(self):
+        return f"{self.service_provider.name} - {self.get_status_display()}"
+
+    class Meta:
+        verbose_name = "Provider Compliance Status"
+        verbose_name_plural = "Provider Compliance Statuses"
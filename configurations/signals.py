@@ -9,7 +9,7 @@ import logging
 
 from .models import (
     Member, Agent, ServiceProvider, ServiceProviderDocument,
-    ServiceProviderTypeRequirement, Currency, PaymentMethod, AgentCommission, Vendor
+    ServiceProviderTypeRequirement, ProviderComplianceStatus, Currency, PaymentMethod, AgentCommission, Vendor
 )
 from membership.models import Beneficiary
 # from accounts.models import MemberAccount, MemberTransaction, TopUp
@@ -367,37 +367,18 @@ def create_provider_account(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=ServiceProviderDocument)
 def check_document_compliance(sender, instance, created, **kwargs):
-    """Check provider compliance when document is uploaded or updated"""
+    """Refresh provider compliance when document is uploaded or updated"""
     try:
+        from .functions import send_compliance_notification
+        from services.functions.provider_compliance import refresh_provider_compliance, withheld_document_issues
+
         provider = instance.service_provider
+        refresh_provider_compliance([provider.id])
 
-        # Get all requirements for this provider type
-        requirements = ServiceProviderTypeRequirement.objects.filter(
-            provider_type=provider.type,
-            is_required=True
+        compliance_issues = withheld_document_issues(
+            ProviderComplianceStatus.objects.get(service_provider_id=provider.id)
         )
 
-        compliance_issues = []
-        missing_docs = []
-        expired_docs = []
-
-        for requirement in requirements:
-            try:
-                doc = ServiceProviderDocument.objects.get(
-                    service_provider=provider,
-                    document_type=requirement.document_type
-                )
-
-                # Check if expired
-                if doc.is_expired and requirement.withhold_payment_if_expired:
-                    expired_docs.append(requirement.document_type)
-                    compliance_issues.append(f"Expired: {requirement.document_type.name}")
-
-            except ServiceProviderDocument.DoesNotExist:
-                if requirement.withhold_payment_if_missing:
-                    missing_docs.append(requirement.document_type)
-                    compliance_issues.append(f"Missing: {requirement.document_type.name}")
-
         # Update provider compliance status
         if compliance_issues:
             logger.warning(f"Compliance issues for provider {provider.account_no}: {compliance_issues}")
@@ -415,6 +396,57 @@ def check_document_compliance(sender, instance, created, **kwargs):
         logger.error(f"Failed to check document compliance: {str(e)}")
 
 
+@receiver(post_delete, sender=ServiceProviderDocument)
+def refresh_compliance_on_document_delete(sender, instance, **kwargs):
+    """Refresh provider compliance when a document is removed"""
+    try:
+        from services.functions.provider_compliance import refresh_provider_compliance
+
+        refresh_provider_compliance([instance.service_provider_id])
+
+    except Exception as e:
+        logger.error(f"Failed to refresh provider compliance: {str(e)}")
+
+
+@receiver(pre_save, sender=ServiceProvider)
+def remember_provider_type(sender, instance, update_fields=None, **kwargs):
+    """Keep the stored provider type so a change of type can be picked up after save"""
+    instance._stored_type_id = None
+    if instance._state.adding or (update_fields is not None and 'type' not in update_fields):
+        return
+
+    instance._stored_type_id = sender.objects.filter(pk=instance.pk).values_list('type_id', flat=True).first()
+
+
+@receiver(post_save, sender=ServiceProvider)
+def refresh_compliance_on_type_change(sender, instance, created, **kwargs):
+    """Refresh provider compliance when the provider moves to a type with other document requirements"""
+    stored_type_id = getattr(instance, '_stored_type_id', None)
+    if created or stored_type_id is None or stored_type_id == instance.type_id:
+        return
+
+    try:
+        from services.functions.provider_compliance import refresh_provider_compliance
+
+        refresh_provider_compliance([instance.id])
+
+    except Exception as e:
+        logger.error(f"Failed to refresh provider compliance: {str(e)}")
+
+
+@receiver(post_save, sender=ServiceProviderTypeRequirement)
+@receiver(post_delete, sender=ServiceProviderTypeRequirement)
+def refresh_compliance_on_requirement_change(sender, instance, **kwargs):
+    """Refresh the compliance of every provider of a type when its document requirements change"""
+    try:
+        from services.functions.provider_compliance import refresh_provider_type_compliance
+
+        refresh_provider_type_compliance(instance.provider_type_id)
+
+    except Exception as e:
+        logger.error(f"Failed to refresh provider compliance: {str(e)}")
+
+
 @receiver(pre_save, sender=ServiceProviderDocument)
 def check_document_expiry_alerts(sender, instance, **kwargs):
     """Send alerts for documents nearing expiry"""
@@ -97,4 +97,16 @@ def refresh_expiring_payment_tokens():
                 logger.error(f"Token refresh error for {token_info.gateway.name}: {str(e)}")
 
     except Exception as e:
-        logger.error(f"Failed to refresh expiring tokens: {str(e)}")
\ No newline at end of file
+        logger.error(f"Failed to refresh expiring tokens: {str(e)}")
+
+@shared_task
+def check_document_expiry():
+    """Refresh provider compliance for documents that have expired since it was last checked"""
+    try:
+        from services.functions.provider_compliance import refresh_stale_provider_compliance
+
+        refreshed = refresh_stale_provider_compliance()
+        logger.info(f"Document expiry sweep refreshed {refreshed} provider compliance statuses")
+
+    except Exception as e:
+        logger.error(f"Failed to check document expiry: {str(e)}")
@@ -308,6 +308,18 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'services.tasks.process_pending_adjudications',
         'schedule': timedelta(minutes=30),
     },
+    'sync-review-queue': {
+        'task': 'services.tasks.sync_review_queue',
+        'schedule': timedelta(minutes=15),
+    },
+    'rollup-adjudicator-metrics': {
+        'task': 'services.tasks.rollup_adjudicator_metrics',
+        'schedule': timedelta(hours=1),
+    },
+    'archive-adjudication-history': {
+        'task': 'services.tasks.archive_adjudication_history',
+        'schedule': timedelta(days=1),
+    },
     'check-document-expiry': {
         'task': 'configurations.tasks.check_document_expiry',
         'schedule': timedelta(hours=12),
@@ -440,6 +452,24 @@ FISCO_HUB_SUITE_SETTINGS = {
     'MAX_CLAIM_AGE_DAYS': config('MAX_CLAIM_AGE_DAYS', default=365, cast=int),
     'AUTO_ADJUDICATION_LIMIT': config('AUTO_ADJUDICATION_LIMIT', default=5000, cast=float),
     'HIGH_VALUE_CLAIM_THRESHOLD': config('HIGH_VALUE_CLAIM_THRESHOLD', default=10000, cast=float),
+    'ADJUDICATION_BATCH_CHUNK_SIZE': config('ADJUDICATION_BATCH_CHUNK_SIZE', default=200, cast=int),
+    'AUTHORIZATION_CODE_BLOCK_SIZE': config('AUTHORIZATION_CODE_BLOCK_SIZE', default=100, cast=int),
+    'PREAUTHORIZATION_REFERENCE_TTL': config('PREAUTHORIZATION_REFERENCE_TTL', default=60, cast=int),
+    'ELIGIBILITY_CACHE_TTL': config('ELIGIBILITY_CACHE_TTL', default=300, cast=int),
+    'ADJUDICATION_TRACING': config('ADJUDICATION_TRACING', default=True, cast=bool),
+    'REVIEW_TARGET_HOURS': config('REVIEW_TARGET_HOURS', default=72, cast=int),
+    'REVIEW_LEASE_SECONDS': config('REVIEW_LEASE_SECONDS', default=900, cast=int),
+    'BULK_REVIEW_CHUNK_SIZE': config('BULK_REVIEW_CHUNK_SIZE', default=500, cast=int),
+    'ADJUDICATION_ARCHIVE_AFTER_DAYS': config('ADJUDICATION_ARCHIVE_AFTER_DAYS', default=365, cast=int),
+    'ADJUDICATION_COMPACT_MESSAGES': config('ADJUDICATION_COMPACT_MESSAGES', default=False, cast=bool),
+
+    # Fraud Detection
+    'FRAUD_MAX_SAME_DAY_CLAIMS': config('FRAUD_MAX_SAME_DAY_CLAIMS', default=3, cast=int),
+    'FRAUD_MAX_PROVIDER_DAILY_CLAIMS': config('FRAUD_MAX_PROVIDER_DAILY_CLAIMS', default=50, cast=int),
+    'FRAUD_HIGH_AMOUNT_MULTIPLIER': config('FRAUD_HIGH_AMOUNT_MULTIPLIER', default=5, cast=float),
+    'FRAUD_AMOUNT_Z_SCORE': config('FRAUD_AMOUNT_Z_SCORE', default=3, cast=float),
+    'FRAUD_AMOUNT_MIN_OBSERVATIONS': config('FRAUD_AMOUNT_MIN_OBSERVATIONS', default=5, cast=int),
+    'FRAUD_AMOUNT_HALF_LIFE_DAYS': config('FRAUD_AMOUNT_HALF_LIFE_DAYS', default=90, cast=int),
 
     # SMS Configuration
     'SMS_GATEWAY_URL': config('SMS_GATEWAY_URL', default=''),
@@ -580,6 +580,11 @@ class BeneficiaryDetailView(LoginRequiredMixin, NotificationMixin, DetailView):
         # Add claims if available
         if hasattr(self.object, 'claims'):
             context['recent_claims'] = self.object.claims.order_by('-created_at')[:5]
+
+        # Current benefit year utilization from the ledger
+        context['utilization'] = self.object.utilization.filter(
+            benefit_year=timezone.now().year
+        ).first()
         
         return context
 
@@ -8,7 +8,8 @@ from membership.models import Beneficiary
 from services.models import (
     AdjudicationRule, AdjudicationMessageCode, AdjudicationResult,
     AdjudicationMessage, Claim, ClaimServiceLine, ServiceRequest,
-    ServiceRequestItem
+    ServiceRequestItem, BeneficiaryUtilization, BeneficiaryCategoryUtilization,
+    AdjudicationBatch, ReviewQueueItem, AdjudicatorDailyMetrics, AdjudicationArchive
 )
 
 
@@ -106,3 +107,59 @@ class ClaimAdmin(ImportExportModelAdmin, ExportActionMixin):
                     'beneficiary__last_name', 'provider__name')
     readonly_fields = ('transaction_number',)
     date_hierarchy = 'created_at'
+
+
+@admin.register(BeneficiaryUtilization)
+class BeneficiaryUtilizationAdmin(admin.ModelAdmin):
+    list_display = ('beneficiary', 'benefit_year', 'total_amount', 'claim_count', 'updated_at')
+    list_filter = ('benefit_year',)
+    search_fields = ('beneficiary__membership_number', 'beneficiary__first_name', 'beneficiary__last_name')
+    readonly_fields = ('beneficiary', 'benefit_year', 'total_amount', 'claim_count')
+
+
+@admin.register(BeneficiaryCategoryUtilization)
+class BeneficiaryCategoryUtilizationAdmin(admin.ModelAdmin):
+    list_display = ('beneficiary', 'benefit_year', 'service_provider_type', 'total_amount', 'claim_count')
+    list_filter = ('benefit_year', 'service_provider_type')
+    search_fields = ('beneficiary__membership_number', 'beneficiary__first_name', 'beneficiary__last_name')
+    readonly_fields = ('beneficiary', 'benefit_year', 'service_provider_type', 'total_amount', 'claim_count')
+
+
+@admin.register(AdjudicationBatch)
+class AdjudicationBatchAdmin(admin.ModelAdmin):
+    list_display = (
+        'created_at', 'status', 'total_claims', 'processed', 'approved', 'declined',
+        'pending_review', 'errors', 'chunks_completed', 'chunk_count', 'completed_at'
+    )
+    list_filter = ('status',)
+    readonly_fields = (
+        'status', 'created_by', 'total_claims', 'chunk_count', 'chunks_completed', 'processed',
+        'approved', 'declined', 'pending_review', 'pending_clinical', 'errors', 'started_at', 'completed_at'
+    )
+
+
+@admin.register(ReviewQueueItem)
+class ReviewQueueItemAdmin(admin.ModelAdmin):
+    list_display = ('claim', 'clinical', 'claimed_amount', 'queued_at', 'due_at', 'assigned_to', 'leased_until')
+    list_filter = ('clinical',)
+    readonly_fields = ('claim', 'claimed_amount', 'queued_at')
+
+
+@admin.register(AdjudicatorDailyMetrics)
+class AdjudicatorDailyMetricsAdmin(admin.ModelAdmin):
+    list_display = ('date', 'adjudicator', 'decisions', 'approved', 'declined', 'modified', 'claimed_amount', 'adjudicated_amount')
+    list_filter = ('date',)
+    search_fields = ('adjudicator__username',)
+    readonly_fields = (
+        'adjudicator', 'date', 'decisions', 'approved', 'declined', 'modified', 'claimed_amount',
+        'adjudicated_amount', 'turnaround_seconds', 'turnaround_count'
+    )
+
+
+@admin.register(AdjudicationArchive)
+class AdjudicationArchiveAdmin(admin.ModelAdmin):
+    list_display = ('claim', 'partition', 'period_start', 'period_end', 'result_count', 'message_count', 'override_count')
+    list_filter = ('partition',)
+    search_fields = ('claim__transaction_number',)
+    exclude = ('payload',)
+    readonly_fields = ('claim', 'partition', 'period_start', 'period_end', 'result_count', 'message_count', 'override_count')
@@ -0,0 +1,234 @@
+import json
+import logging
+import zlib
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from services.models import (
+    AdjudicationArchive, AdjudicationMessage, AdjudicationOverride, AdjudicationResult,
+    AdjudicationRuleApplication, Claim
+)
+
+logger = logging.getLogger(__name__)
+
+# Claims whose outcome can no longer change
+CLOSED_CLAIM_STATUSES = ('P', 'D', 'C')
+
+DEFAULT_ARCHIVE_AFTER_DAYS = 365
+DEFAULT_ARCHIVE_CHUNK_SIZE = 500
+
+
+def get_archive_after_days() -> int:
+    return getattr(settings, 'FISCO_HUB_SUITE_SETTINGS', {}).get(
+        'ADJUDICATION_ARCHIVE_AFTER_DAYS', DEFAULT_ARCHIVE_AFTER_DAYS
+    )
+
+
+def _row(instance) -> Dict:
+    """Column values of a model instance, foreign keys as ids"""
+    return {field.attname: getattr(instance, field.attname) for field in instance._meta.concrete_fields}
+
+
+def pack_history(history: Dict) -> bytes:
+    """Compress a claim's archived rows (lists of column dicts keyed by table) for storage"""
+    return zlib.compress(json.dumps(history, cls=DjangoJSONEncoder, separators=(',', ':')).encode(), 6)
+
+
+def unpack_history(payload) -> Dict:
+    return json.loads(zlib.decompress(bytes(payload)))
+
+
+def _compact_entries(compact: Optional[List]) -> List[Dict]:
+    entries = []
+    for entry in compact or []:
+        code, description, title = (list(entry) + [None, None])[:3]
+        entries.append({'code': code, 'title': title, 'description': description})
+    return entries
+
+
+def history_entries(results: Iterable[Dict], messages: Iterable[Dict], archived: bool) -> List[Dict]:
+    """
+    Shape result and message column dicts into claim history entries
+
+    Live and archived rows go through the same shape, so the claim detail
+    page does not need to know where a result came from.
+    """
+
+    by_result = {}
+    for message in sorted(messages, key=lambda message: message['sequence_number']):
+        by_result.setdefault(str(message['adjudication_result_id']), []).append({
+            'code': message.get('code'),
+            'title': message.get('custom_title'),
+            'description': message.get('custom_description'),
+        })
+
+    entries = []
+    for result in results:
+        # Archived timestamps come back from JSON as ISO strings
+        processed_at = result['processed_at']
+        if isinstance(processed_at, str):
+            processed_at = parse_datetime(processed_at)
+
+        entries.append({
+            'id': str(result['id']),
+            'result': result['result'],
+            'processing_type': result['processing_type'],
+            'original_amount': str(result['original_amount']),
+            'adjudicated_amount': str(result['adjudicated_amount']),
+            'processed_at': processed_at.isoformat() if processed_at else None,
+            'review_notes': result['review_notes'],
+            'decline_reason': result['decline_reason'],
+            'is_active': result['is_active'],
+            'archived': archived,
+            'messages': by_result.get(str(result['id'])) or _compact_entries(result.get('compact_messages')),
+        })
+    return entries
+
+
+def _message_row(message: AdjudicationMessage) -> Dict:
+    return dict(_row(message), code=message.message_code.code)
+
+
+def _archive_chunk(claim_ids: List, cutoff) -> Dict:
+    """Move one chunk of claims' old inactive results into archive rows"""
+
+    counts = {'claims': 0, 'results': 0, 'messages': 0, 'overrides': 0}
+
+    with transaction.atomic():
+        results = list(
+            AdjudicationResult.objects.filter(
+                claim_id__in=claim_ids,
+                claim__status__in=CLOSED_CLAIM_STATUSES,
+                is_active=False,
+                created_at__lt=cutoff
+            ).order_by('created_at')
+        )
+        if not results:
+            return counts
+        result_ids = [result.id for result in results]
+
+        messages = list(
+            AdjudicationMessage.objects.filter(adjudication_result_id__in=result_ids).select_related('message_code')
+        )
+        applications = list(AdjudicationRuleApplication.objects.filter(adjudication_result_id__in=result_ids))
+
+        # Overrides still pointed at by a result that stays behind are kept
+        kept_overrides = AdjudicationResult.objects.filter(
+            claim_id__in=claim_ids, override_record__isnull=False
+        ).exclude(id__in=result_ids).values('override_record_id')
+        overrides = list(
+            AdjudicationOverride.objects.filter(
+                claim_id__in=claim_ids, created_at__lt=cutoff
+            ).exclude(id__in=kept_overrides)
+        )
+
+        history = {}
+        for result in results:
+            history.setdefault(result.claim_id, {
+                'results': [], 'messages': [], 'rule_applications': [], 'overrides': []
+            })['results'].append(_row(result))
+        claim_of = {result.id: result.claim_id for result in results}
+        for message in messages:
+            history[claim_of[message.adjudication_result_id]]['messages'].append(_message_row(message))
+        for application in applications:
+            history[claim_of[application.adjudication_result_id]]['rule_applications'].append(_row(application))
+        for override in overrides:
+            if override.claim_id in history:
+                history[override.claim_id]['overrides'].append(_row(override))
+
+        archives = []
+        for claim_id, rows in history.items():
+            created = [row['created_at'] for row in rows['results']]
+            archives.append(AdjudicationArchive(
+                claim_id=claim_id,
+                partition=max(created).strftime('%Y-%m'),
+                period_start=min(created),
+                period_end=max(created),
+                result_count=len(rows['results']),
+                message_count=len(rows['messages']),
+                override_count=len(rows['overrides']),
+                payload=pack_history(rows),
+            ))
+        AdjudicationArchive.objects.bulk_create(archives)
+
+        AdjudicationMessage.objects.filter(adjudication_result_id__in=result_ids).delete()
+        AdjudicationRuleApplication.objects.filter(adjudication_result_id__in=result_ids).delete()
+        AdjudicationResult.objects.filter(id__in=result_ids).delete()
+        AdjudicationOverride.objects.filter(
+            id__in=[row['id'] for rows in history.values() for row in rows['overrides']]
+        ).delete()
+
+        counts['claims'] = len(archives)
+        counts['results'] = len(results)
+        counts['messages'] = len(messages)
+        counts['overrides'] = sum(archive.override_count for archive in archives)
+
+    return counts
+
+
+def archive_adjudication_history(older_than_days: Optional[int] = None, chunk_size: int = DEFAULT_ARCHIVE_CHUNK_SIZE,
+                                 limit: Optional[int] = None) -> Dict:
+    """
+    Move superseded adjudication history of closed claims into compressed archives
+
+    Inactive results older than ADJUDICATION_ARCHIVE_AFTER_DAYS of paid,
+    declined and cancelled claims are written, with their messages, rule
+    applications and overrides, to one AdjudicationArchive row per claim and
+    deleted from the hot tables. Active results are never archived. Each
+    chunk of claims is moved in its own transaction. Returns the counts moved.
+    """
+
+    cutoff = timezone.now() - timedelta(days=older_than_days or get_archive_after_days())
+
+    claim_ids = Claim.objects.filter(
+        status__in=CLOSED_CLAIM_STATUSES,
+        adjudication_results__is_active=False,
+        adjudication_results__created_at__lt=cutoff
+    ).values_list('id', flat=True).distinct().order_by('id')
+    if limit:
+        claim_ids = claim_ids[:limit]
+    claim_ids = list(claim_ids)
+
+    totals = {'claims': 0, 'results': 0, 'messages': 0, 'overrides': 0}
+    for start in range(0, len(claim_ids), chunk_size):
+        counts = _archive_chunk(claim_ids[start:start + chunk_size], cutoff)
+        for key, value in counts.items():
+            totals[key] += value
+
+    if totals['results']:
+        logger.info(
+            f"Archived {totals['results']} adjudication results, {totals['messages']} messages and "
+            f"{totals['overrides']} overrides of {totals['claims']} claims"
+        )
+    return totals
+
+
+def get_claim_adjudication_history(claim: Claim, include_archived: bool = False) -> List[Dict]:
+    """
+    A claim's adjudication results with their messages, newest first
+
+    Archived results are only unpacked when asked for, from the claim's
+    archive rows.
+    """
+
+    results = list(claim.adjudication_results.all())
+    messages = AdjudicationMessage.objects.filter(
+        adjudication_result__claim=claim
+    ).select_related('message_code')
+
+    entries = history_entries(
+        [_row(result) for result in results], [_message_row(message) for message in messages], archived=False
+    )
+
+    if include_archived:
+        for archive in claim.adjudication_archives.all():
+            history = unpack_history(archive.payload)
+            entries.extend(history_entries(history['results'], history['messages'], archived=True))
+
+    return sorted(entries, key=lambda entry: entry['processed_at'] or '', reverse=True)
@@ -0,0 +1,252 @@
+import logging
+from decimal import Decimal
+from typing import Dict, FrozenSet, List, Optional
+
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from accounting.models import MemberAccount
+from configurations.models import ProviderComplianceStatus, ServiceProvider
+from membership.models import Beneficiary
+from services.functions.coverage import CoverageLimit, CoverageMatrix, get_coverage_matrix
+from services.functions.fraud_signals import FraudSignals, load_fraud_signals
+from services.functions.provider_compliance import get_provider_compliance
+from services.functions.tariff import TariffIndex, get_tariff_index
+from services.functions.utilization import (
+    ServiceVisitHistory, get_annual_utilization, get_category_utilization, get_service_visit_history
+)
+from services.models import Claim, ClaimServiceLine, ServiceRequest
+
+logger = logging.getLogger(__name__)
+
+
+class AdjudicationContext:
+    """
+    Read-only snapshot of everything the adjudication engine looks at for one claim.
+
+    The snapshot is loaded once, in a fixed number of queries, and every
+    adjudication step reads from it instead of going back to the database:
+    - Claim, beneficiary, member, package and provider (with tier and type)
+    - Service lines with their services
+    - Package limits keyed by service provider type, from the process-wide coverage matrix
+    - The provider's precomputed document compliance status
+    - Effective-dated tier prices, from the process-wide tariff index
+    - The member account in the member's currency
+    - The beneficiary's utilization for the current benefit year, in total and per category
+    - The beneficiary's visits to the claim's services over the past year
+
+    Fraud counters are only needed once a claim gets past the coverage and
+    rule checks, so they are loaded on first access.
+    """
+
+    def __init__(self, claim, beneficiary, provider, service_lines: List,
+                 package_limits: Dict, provider_compliance: Optional[ProviderComplianceStatus],
+                 member_account: Optional[MemberAccount],
+                 annual_utilization: Decimal = Decimal('0.00'), category_utilization: Optional[Dict] = None,
+                 service_request: Optional[ServiceRequest] = None,
+                 service_visits: Optional[ServiceVisitHistory] = None, visit_date=None,
+                 tariffs: Optional[TariffIndex] = None):
+        self.claim = claim
+        self.beneficiary = beneficiary
+        self.member = beneficiary.member
+        self.package = self.member.default_package if self.member else None
+        self.provider = provider
+        self.service_lines = service_lines
+        self.package_limits = package_limits
+        self.provider_compliance = provider_compliance
+        self.member_account = member_account
+        self.annual_utilization = annual_utilization
+        self.category_utilization = category_utilization or {}
+        self.service_request = service_request
+        self.service_visits = service_visits or ServiceVisitHistory()
+        self.visit_date = visit_date or timezone.now().date()
+        self.tariffs = tariffs or TariffIndex(None, ())
+
+    @property
+    def services(self) -> List:
+        return [line.service for line in self.service_lines]
+
+    @cached_property
+    def service_ids(self) -> FrozenSet:
+        return frozenset(line.service_id for line in self.service_lines)
+
+    @cached_property
+    def service_provider_type_ids(self) -> FrozenSet:
+        return frozenset(line.service.service_provider_type_id for line in self.service_lines)
+
+    @cached_property
+    def fraud_signals(self) -> FraudSignals:
+        return load_fraud_signals(self.claim, self.service_ids)
+
+    @property
+    def total_claimed(self) -> Decimal:
+        return sum((line.claimed_amount for line in self.service_lines), Decimal('0.00'))
+
+    @property
+    def requires_authorization(self) -> bool:
+        return any(line.service.requires_authorization for line in self.service_lines)
+
+    def get_package_limit(self, service_provider_type_id) -> Optional[CoverageLimit]:
+        """Get the package limit covering a service provider type, if any"""
+        return self.package_limits.get(service_provider_type_id)
+
+    def get_category_utilization(self, service_provider_type_id) -> Decimal:
+        """Get the beneficiary's utilization for a service provider type this benefit year"""
+        return self.category_utilization.get(service_provider_type_id, Decimal('0.00'))
+
+    def count_service_visits(self, service_ids, days: int) -> int:
+        """Count the beneficiary's visits to the services in the given number of days up to the visit date"""
+        return self.service_visits.count_in_window(service_ids, self.visit_date, days)
+
+
+def _load_beneficiary(beneficiary_id) -> Beneficiary:
+    return Beneficiary.objects.select_related(
+        'member__default_package', 'member__currency'
+    ).get(pk=beneficiary_id)
+
+
+def _load_provider(provider_id) -> ServiceProvider:
+    return ServiceProvider.objects.select_related('tier', 'type', 'compliance_status').get(pk=provider_id)
+
+
+class AdjudicationReferenceData:
+    """
+    Provider and package data shared by the claims of one batch
+
+    Claims in a batch mostly come from the same few providers, so these are
+    loaded once and reused for every claim's snapshot. The coverage matrix
+    and tariff index are pinned for the batch so every claim sees the same
+    package limits and prices.
+    Beneficiary data (account balance, utilization) is not shared: it
+    changes as each claim is adjudicated.
+    """
+
+    def __init__(self):
+        self.providers: Dict = {}
+        self._coverage: Optional[CoverageMatrix] = None
+        self._tariffs: Optional[TariffIndex] = None
+
+    def get_provider(self, provider_id) -> ServiceProvider:
+        if provider_id not in self.providers:
+            self.providers[provider_id] = _load_provider(provider_id)
+        return self.providers[provider_id]
+
+    def get_package_limits(self, package_id) -> Dict:
+        if self._coverage is None:
+            self._coverage = get_coverage_matrix()
+        return self._coverage.for_package(package_id)
+
+    def get_tariffs(self) -> TariffIndex:
+        if self._tariffs is None:
+            self._tariffs = get_tariff_index()
+        return self._tariffs
+
+
+def _load_shared_context(beneficiary: Beneficiary, provider: ServiceProvider,
+                         reference: Optional[AdjudicationReferenceData] = None) -> Dict:
+    """Load the package, provider and account data common to claims and service requests"""
+
+    member = beneficiary.member
+
+    if reference is not None:
+        package_limits = reference.get_package_limits(member.default_package_id)
+        tariffs = reference.get_tariffs()
+    else:
+        package_limits = get_coverage_matrix().for_package(member.default_package_id)
+        tariffs = get_tariff_index()
+
+    member_account = MemberAccount.objects.filter(
+        member_id=member.id,
+        currency_id=member.currency_id
+    ).first()
+
+    benefit_year = timezone.now().year
+
+    return {
+        'annual_utilization': get_annual_utilization(beneficiary.id, benefit_year),
+        'category_utilization': get_category_utilization(beneficiary.id, benefit_year),
+        'package_limits': package_limits,
+        'provider_compliance': get_provider_compliance(provider),
+        'member_account': member_account,
+        'tariffs': tariffs,
+    }
+
+
+def load_adjudication_context(claim: Claim, reference: Optional[AdjudicationReferenceData] = None) -> AdjudicationContext:
+    """
+    Load the adjudication snapshot for a claim
+
+    The number of queries is fixed regardless of how many service lines,
+    package limits or provider requirements the claim touches. Package
+    limits come from the coverage matrix; with reference data, provider
+    queries are shared across claims too.
+    """
+
+    beneficiary = _load_beneficiary(claim.beneficiary_id)
+    if reference is not None:
+        provider = reference.get_provider(claim.provider_id)
+    else:
+        provider = _load_provider(claim.provider_id)
+
+    # Share the loaded instances with the claim so callers see the same objects
+    claim.beneficiary = beneficiary
+    claim.provider = provider
+
+    service_lines = list(
+        ClaimServiceLine.objects.filter(claim_id=claim.pk).select_related(
+            'service__service_provider_type'
+        )
+    )
+
+    service_request = None
+    if claim.service_request_id:
+        service_request = ServiceRequest.objects.get(pk=claim.service_request_id)
+        claim.service_request = service_request
+
+    return AdjudicationContext(
+        claim=claim,
+        beneficiary=beneficiary,
+        provider=provider,
+        service_lines=service_lines,
+        service_request=service_request,
+        service_visits=get_service_visit_history(
+            beneficiary.id, {line.service_id for line in service_lines}, claim.start_date
+        ),
+        visit_date=claim.start_date,
+        **_load_shared_context(beneficiary, provider, reference)
+    )
+
+
+def load_service_request_context(service_request: ServiceRequest,
+                                 reference: Optional[AdjudicationReferenceData] = None) -> AdjudicationContext:
+    """Load the adjudication snapshot for a service request (pre-authorization)"""
+
+    beneficiary = _load_beneficiary(service_request.beneficiary_id)
+    if reference is not None:
+        provider = reference.get_provider(service_request.service_provider_id)
+    else:
+        provider = _load_provider(service_request.service_provider_id)
+
+    service_request.beneficiary = beneficiary
+    service_request.service_provider = provider
+
+    # Request items stand in for claim lines; they carry an estimate instead of a claimed amount
+    service_lines = list(
+        service_request.items.select_related('service__service_provider_type')
+    )
+    for item in service_lines:
+        item.claimed_amount = item.estimated_amount
+        item.service_date = service_request.proposed_service_date
+
+    return AdjudicationContext(
+        claim=service_request,
+        beneficiary=beneficiary,
+        provider=provider,
+        service_lines=service_lines,
+        service_request=service_request,
+        service_visits=get_service_visit_history(
+            beneficiary.id, {item.service_id for item in service_lines}, service_request.proposed_service_date
+        ),
+        visit_date=service_request.proposed_service_date,
+        **_load_shared_context(beneficiary, provider, reference)
+    )
@@ -0,0 +1,163 @@
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import connection
+
+# Histogram buckets grow by 10% from 10 microseconds up to about two minutes,
+# so percentiles read from a histogram are within 10% of the true value
+HISTOGRAM_MIN_MS = 0.01
+HISTOGRAM_GROWTH = 1.1
+HISTOGRAM_BUCKETS = 172
+
+
+def tracing_enabled() -> bool:
+    return getattr(settings, 'FISCO_HUB_SUITE_SETTINGS', {}).get('ADJUDICATION_TRACING', True)
+
+
+class AdjudicationTrace:
+    """
+    Wall time and query count of each adjudication step and rule evaluation
+
+    Queries are counted with a connection execute wrapper installed by
+    capture(), so the counts include every query the step runs, however
+    deep. A disabled trace records nothing and installs no wrapper.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.queries = 0
+        self.steps: List[List] = []
+        self.rules: List[List] = []
+        self._started = time.perf_counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def capture(self):
+        """Count the queries run on the default connection while the block runs"""
+        if not self.enabled:
+            return nullcontext()
+        self._started = time.perf_counter()
+        return connection.execute_wrapper(self)
+
+    @contextmanager
+    def _measure(self, entries: List, name: str):
+        if not self.enabled:
+            yield
+            return
+
+        started, queries = time.perf_counter(), self.queries
+        try:
+            yield
+        finally:
+            entries.append([name, round((time.perf_counter() - started) * 1000, 3), self.queries - queries])
+
+    def step(self, name: str):
+        return self._measure(self.steps, name)
+
+    def rule(self, name: str):
+        return self._measure(self.rules, name)
+
+    def as_dict(self) -> Optional[Dict]:
+        """Compact form stored on AdjudicationResult.trace: [name, ms, queries] entries"""
+        if not self.enabled:
+            return None
+        return {
+            'ms': round((time.perf_counter() - self._started) * 1000, 3),
+            'q': self.queries,
+            'steps': self.steps,
+            'rules': self.rules,
+        }
+
+
+class TraceHistogram:
+    """Log-bucketed histogram of timings in milliseconds, with query totals"""
+
+    bounds = [HISTOGRAM_MIN_MS * HISTOGRAM_GROWTH ** i for i in range(HISTOGRAM_BUCKETS)]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.queries = 0
+
+    def add(self, ms: float, queries: int = 0) -> None:
+        self.counts[bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.queries += queries
+
+    def percentile(self, percent: float) -> float:
+        """Upper bound of the bucket holding the given percentile, capped at the largest value seen"""
+        if not self.count:
+            return 0.0
+
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                if index == len(self.bounds):
+                    return self.max_ms
+                return min(self.bounds[index], self.max_ms)
+        return self.max_ms
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    @property
+    def mean_queries(self) -> float:
+        return self.queries / self.count if self.count else 0.0
+
+
+class TraceSummary:
+    """Per-step and per-rule histograms over many stored traces"""
+
+    def __init__(self):
+        self.total = TraceHistogram()
+        self.steps: Dict[str, TraceHistogram] = {}
+        self.rules: Dict[str, TraceHistogram] = {}
+
+    def add(self, trace: Dict) -> None:
+        self.total.add(trace['ms'], trace['q'])
+        for name, ms, queries in trace.get('steps', ()):
+            self.steps.setdefault(name, TraceHistogram()).add(ms, queries)
+        for name, ms, queries in trace.get('rules', ()):
+            self.rules.setdefault(name, TraceHistogram()).add(ms, queries)
+
+    def add_all(self, traces: Iterable[Dict]) -> 'TraceSummary':
+        for trace in traces:
+            if trace:
+                self.add(trace)
+        return self
+
+    @staticmethod
+    def _row(name: str, histogram: TraceHistogram) -> Dict:
+        return {
+            'name': name,
+            'count': histogram.count,
+            'p50_ms': round(histogram.percentile(50), 3),
+            'p90_ms': round(histogram.percentile(90), 3),
+            'p99_ms': round(histogram.percentile(99), 3),
+            'max_ms': round(histogram.max_ms, 3),
+            'mean_ms': round(histogram.mean_ms, 3),
+            'mean_queries': round(histogram.mean_queries, 2),
+        }
+
+    def as_dict(self) -> Dict:
+        return {
+            'total': self._row('total', self.total),
+            'steps': [self._row(name, histogram) for name, histogram in self.steps.items()],
+            'rules': sorted(
+                (self._row(name, histogram) for name, histogram in self.rules.items()),
+                key=lambda row: row['p99_ms'], reverse=True
+            ),
+        }
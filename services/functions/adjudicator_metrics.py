@@ -0,0 +1,165 @@
+import logging
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Max, Min, OuterRef, Subquery, Sum
+from django.utils import timezone
+
+from services.models import AdjudicationResult, AdjudicatorDailyMetrics
+
+logger = logging.getLogger(__name__)
+
+METRIC_FIELDS = (
+    'decisions', 'approved', 'declined', 'modified', 'claimed_amount', 'adjudicated_amount',
+    'turnaround_seconds', 'turnaround_count',
+)
+
+PENDING_RESULTS = ('PENDING_REVIEW', 'PENDING_CLINICAL', 'PENDING_DOCS')
+
+
+def _empty_metrics() -> Dict:
+    return {
+        'decisions': 0, 'approved': 0, 'declined': 0, 'modified': 0,
+        'claimed_amount': Decimal('0.00'), 'adjudicated_amount': Decimal('0.00'),
+        'turnaround_seconds': 0, 'turnaround_count': 0,
+    }
+
+
+def summarize_adjudicator_days(rows: Iterable) -> Dict:
+    """
+    Roll manual decisions up by adjudicator and local day
+
+    rows are (adjudicator_id, processed_at, referred_at, result, is_modified,
+    original_amount, adjudicated_amount) tuples, where referred_at is when
+    automatic adjudication referred the claim for review (None when it was
+    not referred). Returns metrics dicts keyed by (adjudicator_id, date).
+    """
+
+    days = {}
+    for adjudicator_id, processed_at, referred_at, result, is_modified, original_amount, adjudicated_amount in rows:
+        metrics = days.setdefault((adjudicator_id, timezone.localdate(processed_at)), _empty_metrics())
+
+        metrics['decisions'] += 1
+        if result == 'APPROVED':
+            metrics['approved'] += 1
+        elif result == 'DECLINED':
+            metrics['declined'] += 1
+        if is_modified:
+            metrics['modified'] += 1
+
+        metrics['claimed_amount'] += original_amount
+        metrics['adjudicated_amount'] += adjudicated_amount
+
+        if referred_at and referred_at <= processed_at:
+            metrics['turnaround_seconds'] += int((processed_at - referred_at).total_seconds())
+            metrics['turnaround_count'] += 1
+
+    return days
+
+
+def _day_start(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def rollup_adjudicator_metrics(since: Optional[date] = None, until: Optional[date] = None) -> int:
+    """
+    Recompute the daily metrics of every adjudicator from since to until
+
+    By default picks up from the last day already rolled up (which may have
+    been partial) through today, or from the first manual decision when the
+    table is empty, so a scheduled run only rereads the latest day or two.
+    The days are replaced in one transaction. Returns the rows written.
+    """
+
+    until = until or timezone.localdate()
+    if since is None:
+        since = AdjudicatorDailyMetrics.objects.aggregate(latest=Max('date'))['latest']
+    if since is None:
+        first = AdjudicationResult.objects.filter(
+            processing_type='MANUAL', processed_by__isnull=False
+        ).aggregate(first=Min('processed_at'))['first']
+        if first is None:
+            return 0
+        since = timezone.localdate(first)
+
+    referred_at = AdjudicationResult.objects.filter(
+        claim_id=OuterRef('claim_id'),
+        processing_type='AUTOMATIC',
+        result__in=PENDING_RESULTS,
+        processed_at__lte=OuterRef('processed_at')
+    ).order_by('-processed_at').values('processed_at')[:1]
+
+    rows = AdjudicationResult.objects.filter(
+        processing_type='MANUAL',
+        processed_by__isnull=False,
+        processed_at__gte=_day_start(since),
+        processed_at__lt=_day_start(until + timedelta(days=1))
+    ).annotate(referred_at=Subquery(referred_at)).values_list(
+        'processed_by_id', 'processed_at', 'referred_at', 'result', 'is_modified',
+        'original_amount', 'adjudicated_amount'
+    )
+
+    days = summarize_adjudicator_days(rows.iterator(chunk_size=5000))
+
+    with transaction.atomic():
+        AdjudicatorDailyMetrics.objects.filter(date__gte=since, date__lte=until).delete()
+        AdjudicatorDailyMetrics.objects.bulk_create([
+            AdjudicatorDailyMetrics(adjudicator_id=adjudicator_id, date=day, **metrics)
+            for (adjudicator_id, day), metrics in days.items()
+        ], batch_size=1000)
+
+    logger.info(f"Rolled up {len(days)} adjudicator days from {since} to {until}")
+    return len(days)
+
+
+def quality_metrics(totals: Dict, days: int) -> Dict:
+    """Turn summed daily metrics into the quality report's rates and averages"""
+
+    total_decisions = totals['decisions'] or 0
+    if total_decisions == 0:
+        return {'message': 'No recent decisions found'}
+
+    total_claimed = totals['claimed_amount'] or Decimal('0')
+    total_adjudicated = totals['adjudicated_amount'] or Decimal('0')
+    turnaround_count = totals['turnaround_count'] or 0
+
+    return {
+        'period_days': days,
+        'total_decisions': total_decisions,
+        'approval_rate': (totals['approved'] / total_decisions) * 100,
+        'decline_rate': (totals['declined'] / total_decisions) * 100,
+        'modification_rate': (totals['modified'] / total_decisions) * 100,
+        'total_claimed_amount': float(total_claimed),
+        'total_adjudicated_amount': float(total_adjudicated),
+        'savings_percentage': float(
+            (total_claimed - total_adjudicated) / total_claimed * 100) if total_claimed > 0 else 0,
+        'average_claim_value': float(total_adjudicated / total_decisions),
+        'average_turnaround_hours': round(
+            totals['turnaround_seconds'] / turnaround_count / 3600, 2) if turnaround_count else None,
+    }
+
+
+def _period_metrics(days: int):
+    return AdjudicatorDailyMetrics.objects.filter(date__gt=timezone.localdate() - timedelta(days=days))
+
+
+def get_adjudicator_quality(adjudicator, days: int = 30) -> Dict:
+    """Quality metrics of one adjudicator over the last days, read from the rollup in one query"""
+
+    totals = _period_metrics(days).filter(adjudicator=adjudicator).aggregate(
+        **{field: Sum(field) for field in METRIC_FIELDS}
+    )
+    return quality_metrics(totals, days)
+
+
+def get_team_quality(days: int = 30) -> Dict:
+    """Quality metrics of every adjudicator over the last days, keyed by adjudicator id, in one query"""
+
+    return {
+        row['adjudicator_id']: quality_metrics({field: row[f'{field}_total'] for field in METRIC_FIELDS}, days)
+        for row in _period_metrics(days).values('adjudicator_id').annotate(
+            **{f'{field}_total': Sum(field) for field in METRIC_FIELDS}
+        )
+    }
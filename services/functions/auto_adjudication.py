@@ -1,17 +1,27 @@
 import logging
 from decimal import Decimal
 from typing import Dict, List, Tuple, Optional
+from django.conf import settings
 from django.utils import timezone
 from django.db import transaction
-from django.db.models import Q, Sum
 
-from services.models import (
-    Claim, ClaimServiceLine, AdjudicationRule, AdjudicationResult,
-    AdjudicationMessage, AdjudicationMessageCode
-)
+from accounting.models import MemberAccount
+from services.models import Claim, AdjudicationResult
 from membership.models import Beneficiary
 from configurations.models import ServiceProvider, Service
-from accounts.models import MemberAccount, MemberTransaction
+from services.functions.adjudication_context import (
+    AdjudicationContext, AdjudicationReferenceData, load_adjudication_context
+)
+from services.functions.adjudication_trace import AdjudicationTrace, tracing_enabled
+from services.functions.claim_pipeline import reserve_claim_funds
+from services.functions.fraud_signals import (
+    BENEFICIARY_SCOPE, PROVIDER_SCOPE, SERVICE_SCOPE, claim_content_fingerprint, find_content_duplicate,
+    get_fraud_setting
+)
+from services.functions.rule_cache import CompiledRule, get_compiled_rules
+from services.functions.review_queue import enqueue_claim_for_review
+from services.functions.unit_of_work import AdjudicationUnitOfWork
+from services.functions.utilization import ANNUAL_VISIT_WINDOW_DAYS, MONTHLY_VISIT_WINDOW_DAYS
 
 logger = logging.getLogger(__name__)
 
@@ -28,61 +38,74 @@ class ClaimAdjudicationEngine:
     - Fraud detection patterns
     """
 
-    def __init__(self, claim: Claim):
+    def __init__(self, claim: Claim, context: Optional[AdjudicationContext] = None,
+                 defer_financials: bool = False, unit_of_work: Optional[AdjudicationUnitOfWork] = None):
         self.claim = claim
-        self.beneficiary = claim.beneficiary
-        self.provider = claim.provider
-        self.member = self.beneficiary.member
+        # Leave the member account reservation to the caller (pre-authorizations and simulations)
+        self.defer_financials = defer_financials
+        self.context = context or load_adjudication_context(claim)
+        self.unit_of_work = unit_of_work or AdjudicationUnitOfWork()
+        self.beneficiary = self.context.beneficiary
+        self.provider = self.context.provider
+        self.member = self.context.member
         self.messages = []
         self.total_claimed = Decimal('0.00')
+        self.total_shortfall = Decimal('0.00')
         self.total_accepted = Decimal('0.00')
         self.total_adjudicated = Decimal('0.00')
         self.co_payment_amount = Decimal('0.00')
         self.result_status = 'PENDING'
         self.decline_reason = None
+        self.trace = AdjudicationTrace(enabled=tracing_enabled())
 
-    def process_adjudication(self) -> AdjudicationResult:
-        """Main adjudication process"""
+    def process_adjudication(self) -> Optional[AdjudicationResult]:
+        """Main adjudication process, None when the claim was adjudicated elsewhere meanwhile"""
 
         logger.info(f"Starting adjudication for claim {self.claim.transaction_number}")
 
         try:
-            with transaction.atomic():
+            with self.trace.capture(), transaction.atomic():
+                # The pipeline task and the pending sweep can both pick up a new claim,
+                # and a double submission queues two identical ones
+                if not self._lock_claim():
+                    logger.info(f"Claim {self.claim.transaction_number} no longer awaiting adjudication")
+                    return None
+
                 # Step 1: Pre-validation checks
-                if not self._pre_validation_checks():
+                if not self._step(self._pre_validation_checks):
                     return self._create_adjudication_result('DECLINED')
 
                 # Step 2: Calculate totals from service lines
-                self._calculate_claim_totals()
+                self._step(self._calculate_claim_totals)
 
                 # Step 3: Beneficiary eligibility checks
-                if not self._check_beneficiary_eligibility():
+                if not self._step(self._check_beneficiary_eligibility):
                     return self._create_adjudication_result('DECLINED')
 
                 # Step 4: Service coverage validation
-                if not self._validate_service_coverage():
+                if not self._step(self._validate_service_coverage):
                     return self._create_adjudication_result('DECLINED')
 
                 # Step 5: Provider compliance checks
-                if not self._check_provider_compliance():
+                if not self._step(self._check_provider_compliance):
                     return self._create_adjudication_result('DECLINED')
 
                 # Step 6: Authorization validation
-                if not self._validate_authorization():
+                if not self._step(self._validate_authorization):
                     return self._create_adjudication_result('DECLINED')
 
                 # Step 7: Apply business rules
-                adjudication_result = self._apply_business_rules()
+                adjudication_result = self._step(self._apply_business_rules)
                 if adjudication_result:
                     return adjudication_result
 
                 # Step 8: Fraud detection
-                fraud_flags = self._fraud_detection_checks()
+                fraud_flags = self._step(self._fraud_detection_checks)
                 if fraud_flags:
                     return self._create_adjudication_result('PENDING_REVIEW')
 
                 # Step 9: Account balance checks
-                if not self._check_account_balance():
+                if not self._step(self._check_account_balance):
                     return self._create_adjudication_result('PENDING_REVIEW')
 
                 # Step 10: Final approval
@@ -93,6 +116,22 @@ class ClaimAdjudicationEngine:
             self._add_message('REVW001', f"System error during adjudication: {str(e)}")
             return self._create_adjudication_result('PENDING_REVIEW')
 
+    def _step(self, method):
+        """Run an adjudication step, recording its time and query count in the trace"""
+
+        with self.trace.step(method.__name__):
+            return method()
+
+    def _lock_claim(self) -> bool:
+        """Lock the beneficiary and claim rows until the decision commits and check the claim is still new"""
+
+        # A beneficiary's claims are decided one at a time, so of two identical
+        # claims submitted together the second sees the first's content fingerprint
+        Beneficiary.objects.select_for_update().filter(pk=self.claim.beneficiary_id).values_list('pk').first()
+
+        status = Claim.objects.select_for_update().filter(pk=self.claim.pk).values_list('status', flat=True).first()
+        return status == 'N'
+
     def _pre_validation_checks(self) -> bool:
         """Pre-validation checks before starting adjudication"""
 
@@ -102,14 +141,15 @@ class ClaimAdjudicationEngine:
             return False
 
         # Check if claim has service lines
-        if not self.claim.services.exists():
+        if not self.context.service_lines:
             self._add_message('SERV001', 'No services found on claim')
             return False
 
         # Check service dates
-        for service_line in self.claim.services.all():
+        max_claim_age_days = getattr(settings, 'FISCO_HUB_SUITE_SETTINGS', {}).get('MAX_CLAIM_AGE_DAYS', 365)
+        for service_line in self.context.service_lines:
             days_old = (timezone.now().date() - service_line.service_date).days
-            if days_old > 365:  # Configurable limit
+            if days_old > max_claim_age_days:
                 self._add_message('TIME001', f'Service date too old: {service_line.service_date}')
                 return False
 
@@ -117,17 +157,42 @@ class ClaimAdjudicationEngine:
                 self._add_message('TIME002', f'Future service date: {service_line.service_date}')
                 return False
 
+        # Check for the same visit resubmitted under another invoice number
+        self.claim.content_fingerprint = claim_content_fingerprint(
+            self.claim.beneficiary_id,
+            self.claim.provider_id,
+            [(line.service.code, line.quantity, line.claimed_amount, line.service_date)
+             for line in self.context.service_lines]
+        )
+        self.unit_of_work.save_claim(self.claim, ['content_fingerprint'])
+
+        duplicate = find_content_duplicate(self.claim.pk, self.claim.content_fingerprint)
+        if duplicate:
+            self._add_message('FRAU001', f'Duplicate of claim {duplicate}: same services, amounts and dates')
+            return False
+
         return True
 
     def _calculate_claim_totals(self) -> None:
-        """Calculate claim totals from service lines"""
+        """Calculate claim totals from service lines, repricing each line against the provider's tier tariff"""
+
+        self.total_claimed = self.context.total_claimed
+        self.total_shortfall = self.context.tariffs.reprice(self.context.service_lines, self.provider.tier_id)
+
+        if self.total_shortfall:
+            self._add_message('TARF001', f'Amount reduced to tier tariff: ${self.total_shortfall} above maximum payable')
 
-        service_lines = self.claim.services.all()
+        logger.info(f"Claim totals - Claimed: {self.total_claimed}, Shortfall: {self.total_shortfall}")
 
-        for line in service_lines:
-            self.total_claimed += line.claimed_amount
+    @property
+    def total_payable(self) -> Decimal:
+        """Claimed amount within the tier tariff"""
+        return self.total_claimed - self.total_shortfall
 
-        logger.info(f"Claim totals - Claimed: {self.total_claimed}")
+    @property
+    def net_payable(self) -> Decimal:
+        """Accepted amount less the co-payment, never below zero"""
+        return max(self.total_accepted - self.co_payment_amount, Decimal('0.00'))
 
     def _check_beneficiary_eligibility(self) -> bool:
         """Check beneficiary eligibility and status"""
@@ -155,12 +220,12 @@ class ClaimAdjudicationEngine:
             self._add_message('LIMT002', 'Annual limit exceeded')
             return False
 
-        if self.total_claimed > remaining_limit:
+        if self.total_payable > remaining_limit:
             # Partial approval up to remaining limit
             self.total_accepted = remaining_limit
             self._add_message('LIMT001', f'Amount reduced to remaining annual limit: ${remaining_limit}')
         else:
-            self.total_accepted = self.total_claimed
+            self.total_accepted = self.total_payable
 
         self._add_message('BENF100', 'Beneficiary eligibility confirmed')
         return True
@@ -168,7 +233,7 @@ class ClaimAdjudicationEngine:
     def _validate_service_coverage(self) -> bool:
         """Validate service coverage and requirements"""
 
-        for service_line in self.claim.services.all():
+        for service_line in self.context.service_lines:
             service = service_line.service
 
             # Check if service is active
@@ -177,25 +242,22 @@ class ClaimAdjudicationEngine:
                 return False
 
             # Check package coverage
-            if self.beneficiary.package:
-                package_limits = self.beneficiary.package.limits.filter(
-                    category=service.category
-                )
+            if self.context.package:
+                package_limit = self.context.get_package_limit(service.service_provider_type_id)
 
-                if not package_limits.exists():
+                if not package_limit:
                     self._add_message('PACK002', f'Service not covered under package: {service.description}')
                     return False
 
                 # Check waiting period
-                package_limit = package_limits.first()
-                if package_limit.waiting_period_days > 0:
+                if package_limit.waiting_period_days > 0 and self.beneficiary.benefit_start_date:
                     membership_days = (timezone.now().date() - self.beneficiary.benefit_start_date).days
                     if membership_days < package_limit.waiting_period_days:
                         self._add_message('PACK003', f'Service in waiting period: {service.description}')
                         return False
 
             # Check service requirements
-            if service.requires_referral and not self.claim.referring_provider_number:
+            if service.requires_referral and not self._has_referral():
                 self._add_message('SERV002', f'Referral required for: {service.description}')
                 return False
 
@@ -212,6 +274,69 @@ class ClaimAdjudicationEngine:
                 self._add_message('AGER001', f'Age restriction for geriatric service')
                 return False
 
+        return self._check_category_limits()
+
+    def _check_category_limits(self) -> bool:
+        """
+        Apply package category limits: per-visit caps, annual limits against the ledger, then co-payments
+
+        The categories' capped amounts are totalled before the beneficiary's
+        remaining annual limit (already applied to total_accepted) caps the
+        claim, and each category's co-payment is taken from its share of
+        the final accepted amount.
+        """
+
+        if not self.context.package:
+            return True
+
+        claimed_by_category = {}
+        for service_line in self.context.service_lines:
+            category_id = service_line.service.service_provider_type_id
+            payable = service_line.claimed_amount - service_line.shortfall_amount
+            claimed_by_category[category_id] = claimed_by_category.get(category_id, Decimal('0.00')) + payable
+
+        accepted_by_category = {}
+        for category_id, category_claimed in claimed_by_category.items():
+            package_limit = self.context.get_package_limit(category_id)
+            if not package_limit:
+                accepted_by_category[category_id] = category_claimed
+                continue
+
+            # A claim is one visit, so the per-visit limit caps the category's lines together
+            category_accepted = package_limit.cap_visit(category_claimed)
+            if category_accepted < category_claimed:
+                self._add_message('PACK001', f'Amount reduced to {package_limit.name} per-visit limit: ${package_limit.per_visit_limit}')
+
+            if package_limit.annual_limit > 0:
+                remaining_limit = package_limit.annual_limit - self.context.get_category_utilization(category_id)
+
+                if remaining_limit <= 0:
+                    self._add_message('LIMT006', f'Category annual limit exceeded: {package_limit.name}')
+                    return False
+
+                if category_accepted > remaining_limit:
+                    category_accepted = remaining_limit
+                    self._add_message('LIMT005', f'Amount reduced to remaining {package_limit.name} limit: ${remaining_limit}')
+
+            accepted_by_category[category_id] = category_accepted
+
+        categories_accepted = sum(accepted_by_category.values(), Decimal('0.00'))
+        self.total_accepted = min(self.total_accepted, categories_accepted)
+        if not categories_accepted:
+            return True
+
+        # Categories give up the same fraction of their amount to the annual limit
+        share = self.total_accepted / categories_accepted
+        for category_id, category_accepted in accepted_by_category.items():
+            package_limit = self.context.get_package_limit(category_id)
+            if not package_limit:
+                continue
+
+            co_payment = package_limit.co_payment((category_accepted * share).quantize(Decimal('0.01')))
+            if co_payment:
+                self.co_payment_amount += co_payment
+                self._add_message('PACK004', f'{package_limit.name} co-payment applied: ${co_payment}')
+
         return True
 
     def _check_provider_compliance(self) -> bool:
@@ -225,19 +350,10 @@ class ClaimAdjudicationEngine:
                 self._add_message('PROV002', 'Service provider is suspended')
             return False
 
-        # Check provider documents
-        missing_docs = []
-        expired_docs = []
-
-        required_docs = self.provider.type.requirements.filter(is_required=True)
-
-        for requirement in required_docs:
-            try:
-                doc = self.provider.documents.get(document_type=requirement.document_type)
-                if doc.is_expired:
-                    expired_docs.append(doc.document_type.name)
-            except:
-                missing_docs.append(requirement.document_type.name)
+        # Check provider documents against the precomputed compliance status
+        compliance = self.context.provider_compliance
+        missing_docs = compliance.missing_document_names if compliance else []
+        expired_docs = compliance.expired_document_names if compliance else []
 
         if missing_docs:
             self._add_message('PROV004', f'Missing documents: {", ".join(missing_docs)}')
@@ -253,19 +369,14 @@ class ClaimAdjudicationEngine:
         """Validate prior authorization if required"""
 
         # Check if any services require authorization
-        services_requiring_auth = self.claim.services.filter(
-            service__requires_authorization=True
-        )
-
-        if not services_requiring_auth.exists():
+        if not self.context.requires_authorization:
             return True
 
-        if not self.claim.service_request:
+        service_request = self.context.service_request
+        if not service_request:
             self._add_message('AUTH001', 'Prior authorization required')
             return False
 
-        service_request = self.claim.service_request
-
         # Check authorization status
         if service_request.status != 'A':
             self._add_message('AUTH001', 'Valid authorization not found')
@@ -291,77 +402,56 @@ class ClaimAdjudicationEngine:
     def _apply_business_rules(self) -> Optional[AdjudicationResult]:
         """Apply adjudication business rules"""
 
-        # Get applicable rules ordered by priority
-        rules = AdjudicationRule.objects.filter(
-            is_active=True,
-            effective_from__lte=timezone.now().date()
-        ).filter(
-            Q(effective_to__isnull=True) | Q(effective_to__gte=timezone.now().date())
-        ).order_by('priority')
+        for rule in self._candidate_rules():
+            with self.trace.rule(rule.name):
+                applies = self._rule_applies(rule)
 
-        for rule in rules:
-            if self._rule_applies(rule):
+            if applies:
                 action_result = self._execute_rule_action(rule)
                 if action_result:
                     return action_result
 
         return None
 
-    def _rule_applies(self, rule: AdjudicationRule) -> bool:
-        """Check if a rule applies to this claim"""
-
-        # Check amount range
-        if rule.min_amount and self.total_accepted < rule.min_amount:
-            return False
-        if rule.max_amount and self.total_accepted > rule.max_amount:
-            return False
-
-        # Check beneficiary type
-        if rule.beneficiary_type and self.beneficiary.type not in rule.beneficiary_type.split(','):
-            return False
-
-        # Check member types
-        if rule.member_types and self.member.type not in rule.member_types.split(','):
-            return False
+    def _candidate_rules(self) -> List[CompiledRule]:
+        """Get the candidate rules for this claim, ordered by priority"""
 
-        # Check provider tiers
-        if rule.provider_tiers.exists() and self.provider.tier not in rule.provider_tiers.all():
-            return False
-
-        # Check services
-        claim_services = set(self.claim.services.values_list('service_id', flat=True))
-        if rule.services.exists():
-            rule_services = set(rule.services.values_list('id', flat=True))
-            if not claim_services.intersection(rule_services):
-                return False
+        return get_compiled_rules().candidate_rules(
+            timezone.now().date(),
+            service_ids=self.context.service_ids,
+            service_provider_type_ids=self.context.service_provider_type_ids,
+            provider_tier_id=self.provider.tier_id,
+            rule_type='C'
+        )
 
-        # Check categories
-        claim_categories = set(self.claim.services.values_list('service__category_id', flat=True))
-        if rule.categories.exists():
-            rule_categories = set(rule.categories.values_list('id', flat=True))
-            if not claim_categories.intersection(rule_categories):
-                return False
+    def _rule_applies(self, rule: CompiledRule) -> bool:
+        """Check if a rule applies to this claim"""
 
-        # Check age limits
-        beneficiary_age = self._calculate_age(self.beneficiary.date_of_birth)
-        if rule.min_age and beneficiary_age < rule.min_age:
+        if not rule.matches(
+            amount=self.total_accepted,
+            beneficiary_type=self.beneficiary.type,
+            member_type=self.member.type,
+            provider_tier_id=self.provider.tier_id,
+            service_ids=self.context.service_ids,
+            service_provider_type_ids=self.context.service_provider_type_ids,
+            age=self._calculate_age(self.beneficiary.date_of_birth),
+        ):
             return False
-        if rule.max_age and beneficiary_age > rule.max_age:
-            return False
-
-        # Check service frequency
-        if rule.max_visits_per_year or rule.max_visits_per_month:
-            # Count recent claims for same services
-            recent_claims_count = self._count_recent_service_usage(rule)
 
-            if rule.max_visits_per_year and recent_claims_count >= rule.max_visits_per_year:
+        # Check service frequency, each limit against its own window
+        if rule.has_frequency_limit:
+            if rule.max_visits_per_year and (
+                self._count_recent_service_usage(rule, ANNUAL_VISIT_WINDOW_DAYS) >= rule.max_visits_per_year
+            ):
                 return False
-            if rule.max_visits_per_month and recent_claims_count >= rule.max_visits_per_month:
+            if rule.max_visits_per_month and (
+                self._count_recent_service_usage(rule, MONTHLY_VISIT_WINDOW_DAYS) >= rule.max_visits_per_month
+            ):
                 return False
 
         return True
 
-    def _execute_rule_action(self, rule: AdjudicationRule) -> Optional[AdjudicationResult]:
+    def _execute_rule_action(self, rule: CompiledRule) -> Optional[AdjudicationResult]:
         """Execute the action defined by the rule"""
 
         if rule.action == 'AUTO_APPROVE':
@@ -393,59 +483,52 @@ class ClaimAdjudicationEngine:
                 self._add_message('LIMT001', f'Amount capped at ${rule.reduction_amount}')
 
         elif rule.action == 'APPLY_COPAYMENT':
+            # Added to any co-payment the package limits already applied
             if rule.co_payment_percentage:
-                self.co_payment_amount = (self.total_accepted * rule.co_payment_percentage) / 100
+                self.co_payment_amount += (self.total_accepted * rule.co_payment_percentage) / 100
             elif rule.co_payment_amount:
-                self.co_payment_amount = rule.co_payment_amount
+                self.co_payment_amount += rule.co_payment_amount
 
-            self.total_adjudicated = self.total_accepted - self.co_payment_amount
+            self.total_adjudicated = self.net_payable
             self._add_message('PACK004', f'Co-payment applied: ${self.co_payment_amount}')
 
         return None
 
     def _fraud_detection_checks(self) -> List[str]:
-        """Perform fraud detection checks"""
+        """Perform fraud detection checks against the precomputed fraud counters"""
 
         fraud_flags = []
+        signals = self.context.fraud_signals
 
         # Check for duplicate claims
-        duplicate_claims = Claim.objects.filter(
-            beneficiary=self.beneficiary,
-            provider=self.provider,
-            invoice_number=self.claim.invoice_number,
-            status__in=['A', 'P']
-        ).exclude(id=self.claim.id)
-
-        if duplicate_claims.exists():
+        if signals.duplicate_invoice:
             fraud_flags.append('DUPLICATE_CLAIM')
             self._add_message('FRAU001', 'Duplicate claim detected')
 
         # Check claim frequency (same provider, same day)
-        same_day_claims = Claim.objects.filter(
-            beneficiary=self.beneficiary,
-            provider=self.provider,
-            start_date=self.claim.start_date,
-            status__in=['A', 'P']
-        ).exclude(id=self.claim.id).count()
-
-        if same_day_claims >= 3:
+        if signals.same_day_claims >= get_fraud_setting('FRAUD_MAX_SAME_DAY_CLAIMS'):
             fraud_flags.append('HIGH_FREQUENCY')
             self._add_message('FRAU002', 'High claim frequency detected')
 
-        # Check unusually high amount
-        avg_claim_amount = self._get_average_claim_amount()
-        if avg_claim_amount and self.total_claimed > (avg_claim_amount * 5):
+        # Check unusually high amount against the beneficiary's, provider's and services' history
+        claim_date = self.claim.start_date
+        outliers = []
+        if signals.get_amount_statistics(BENEFICIARY_SCOPE, self.beneficiary.id).is_outlier(self.total_claimed, claim_date):
+            outliers.append('beneficiary')
+        if signals.get_amount_statistics(PROVIDER_SCOPE, self.provider.id).is_outlier(self.total_claimed, claim_date):
+            outliers.append('provider')
+        for service_line in self.context.service_lines:
+            if signals.get_amount_statistics(SERVICE_SCOPE, service_line.service_id).is_outlier(
+                service_line.claimed_amount, claim_date
+            ):
+                outliers.append(f'service {service_line.service.code}')
+
+        if outliers:
             fraud_flags.append('HIGH_AMOUNT')
-            self._add_message('FRAU003', 'Unusually high claim amount')
+            self._add_message('FRAU003', f"Unusually high claim amount for {', '.join(outliers)}")
 
         # Provider pattern checks
-        provider_daily_claims = Claim.objects.filter(
-            provider=self.provider,
-            start_date=self.claim.start_date,
-            status__in=['A', 'P']
-        ).count()
-
-        if provider_daily_claims > 50:  # Configurable threshold
+        if signals.provider_daily_claims > get_fraud_setting('FRAUD_MAX_PROVIDER_DAILY_CLAIMS'):
             fraud_flags.append('PROVIDER_PATTERN')
             self._add_message('FRAU004', 'Unusual provider pattern detected')
 
@@ -455,14 +538,16 @@ class ClaimAdjudicationEngine:
         """Check member account balance"""
 
         try:
-            account = self.member.accounts.filter(
-                currency=self.member.currency
-            ).first()
+            account = self.context.member_account
 
             if not account:
                 self._add_message('ACCT003', 'Member account not found')
                 return False
 
+            # Held until the reservation commits, so claims of the member's other beneficiaries wait for it
+            account = MemberAccount.objects.select_for_update().get(pk=account.pk)
+            self.context.member_account = account
+
             if account.available_balance < self.total_adjudicated:
                 if account.available_balance > 0:
                     self.total_adjudicated = account.available_balance
@@ -482,29 +567,23 @@ class ClaimAdjudicationEngine:
 
         # Set final amounts
         if result == 'APPROVED':
-            self.total_adjudicated = self.total_accepted - self.co_payment_amount
+            self.total_adjudicated = self.net_payable
         elif result == 'DECLINED':
             self.total_adjudicated = Decimal('0.00')
 
-        # Create adjudication result
-        adjudication_result = AdjudicationResult.objects.create(
+        # Queue adjudication result and messages
+        adjudication_result = self.unit_of_work.add_result(AdjudicationResult(
             claim=self.claim,
             result=result,
-            claimed_amount=self.total_claimed,
-            accepted_amount=self.total_accepted,
+            original_amount=self.total_claimed,
             adjudicated_amount=self.total_adjudicated,
             co_payment_amount=self.co_payment_amount,
-            processing_type='AUTO',
-            decline_reason=self.decline_reason
-        )
-
-        # Create messages
-        for message_data in self.messages:
-            AdjudicationMessage.objects.create(
-                adjudication_result=adjudication_result,
-                message_code=message_data['code'],
-                custom_description=message_data['description']
-            )
+            processing_type='AUTOMATIC',
+            processed_at=timezone.now(),
+            decline_reason=self.decline_reason,
+            trace=self.trace.as_dict()
+        ))
+        self.unit_of_work.add_messages(adjudication_result, self.messages)
 
         # Update claim
         self.claim.accepted_amount = self.total_accepted
@@ -513,17 +592,23 @@ class ClaimAdjudicationEngine:
         if result == 'APPROVED':
             self.claim.status = 'A'
             # Create member transaction to reserve funds
-            self._create_member_transaction()
+            if not self.defer_financials:
+                self.unit_of_work.on_flush(self._create_member_transaction)
         elif result == 'DECLINED':
             self.claim.status = 'D'
         else:  # Pending review
             self.claim.status = 'U'
+            self.unit_of_work.on_flush(
+                lambda: enqueue_claim_for_review(self.claim, clinical=result == 'PENDING_CLINICAL')
+            )
 
-        self.claim.save()
+        self.unit_of_work.save_claim(self.claim, ['status', 'accepted_amount', 'adjudicated_amount'])
 
         # Update service lines
         self._update_service_line_amounts()
 
+        self.unit_of_work.flush()
+
         logger.info(f"Adjudication complete for claim {self.claim.transaction_number}: {result}")
 
         return adjudication_result
@@ -532,43 +617,26 @@ class ClaimAdjudicationEngine:
         """Create member transaction to reserve funds"""
 
         try:
-            account = self.member.accounts.filter(
-                currency=self.member.currency
-            ).first()
-
-            if account and self.total_adjudicated > 0:
-                MemberTransaction.objects.create(
-                    account=account,
-                    transaction_type='R',  # Reserve
-                    amount_debited=self.total_adjudicated,
-                    balance=account.balance,
-                    available_balance=account.available_balance - self.total_adjudicated,
-                    description=f'Reserve for claim: {self.claim.transaction_number}',
-                    reference=self.claim.transaction_number,
-                    claim=self.claim,
-                    status='C'
-                )
-
-                # Update account balances
-                account.available_balance -= self.total_adjudicated
-                account.reserved_balance += self.total_adjudicated
-                account.save()
+            reserve_claim_funds(self.claim, self.context.member_account)
 
         except Exception as e:
             logger.error(f"Failed to create member transaction: {str(e)}")
 
     def _update_service_line_amounts(self) -> None:
-        """Update service line amounts proportionally"""
+        """Update service line amounts: accepted within the tariff, adjudicated proportionally"""
 
-        if self.total_claimed == 0:
+        if self.total_payable == 0:
             return
 
-        adjustment_ratio = self.total_adjudicated / self.total_claimed
+        adjustment_ratio = self.total_adjudicated / self.total_payable
 
-        for service_line in self.claim.services.all():
-            service_line.accepted_amount = service_line.claimed_amount
-            service_line.adjudicated_amount = service_line.claimed_amount * adjustment_ratio
-            service_line.save()
+        for service_line in self.context.service_lines:
+            service_line.accepted_amount = service_line.claimed_amount - service_line.shortfall_amount
+            service_line.adjudicated_amount = service_line.accepted_amount * adjustment_ratio
+
+        self.unit_of_work.update_service_lines(
+            self.context.service_lines, ['accepted_amount', 'adjudicated_amount', 'shortfall_amount']
+        )
 
     def _add_message(self, code: str, description: str) -> None:
         """Add adjudication message"""
@@ -579,19 +647,14 @@ class ClaimAdjudicationEngine:
         })
 
     def _get_current_year_utilization(self) -> Decimal:
-        """Get beneficiary utilization for current year"""
+        """Get beneficiary utilization for current year from the utilization ledger"""
 
-        current_year = timezone.now().year
+        return self.context.annual_utilization
 
-        utilization = Claim.objects.filter(
-            beneficiary=self.beneficiary,
-            start_date__year=current_year,
-            status__in=['A', 'P']
-        ).aggregate(
-            total=Sum('adjudicated_amount')
-        )['total'] or Decimal('0.00')
+    def _has_referral(self) -> bool:
+        """Check whether the claim names a referring provider"""
 
-        return utilization
+        return bool(self.claim.referring_provider_number)
 
     def _calculate_age(self, birth_date) -> int:
         """Calculate age from birth date"""
@@ -599,58 +662,37 @@ class ClaimAdjudicationEngine:
         today = timezone.now().date()
         return today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
 
-    def _count_recent_service_usage(self, rule: AdjudicationRule) -> int:
-        """Count recent service usage for frequency checks"""
+    def _count_recent_service_usage(self, rule: CompiledRule, days: int) -> int:
+        """Count recent visits to the rule's services on this claim for frequency checks"""
 
-        from datetime import timedelta
+        services = self.context.service_ids
+        if rule.service_ids:
+            services = services & rule.service_ids
 
-        if rule.max_visits_per_month:
-            start_date = timezone.now().date() - timedelta(days=30)
-        else:
-            start_date = timezone.now().date() - timedelta(days=365)
-
-        claim_services = self.claim.services.values_list('service_id', flat=True)
-
-        usage_count = Claim.objects.filter(
-            beneficiary=self.beneficiary,
-            start_date__gte=start_date,
-            status__in=['A', 'P'],
-            services__service_id__in=claim_services
-        ).distinct().count()
-
-        return usage_count
-
-    def _get_average_claim_amount(self) -> Optional[Decimal]:
-        """Get average claim amount for beneficiary"""
-
-        from datetime import timedelta
-
-        six_months_ago = timezone.now().date() - timedelta(days=180)
-
-        avg_amount = Claim.objects.filter(
-            beneficiary=self.beneficiary,
-            start_date__gte=six_months_ago,
-            status__in=['A', 'P']
-        ).aggregate(
-            avg=models.Avg('adjudicated_amount')
-        )['avg']
-
-        return avg_amount
+        return self.context.count_service_visits(services, days)
 
 
 # Main adjudication function
-def process_claim_adjudication(claim: Claim) -> AdjudicationResult:
+def process_claim_adjudication(claim: Claim, reference: Optional[AdjudicationReferenceData] = None,
+                               defer_financials: bool = False) -> Optional[AdjudicationResult]:
     """
     Main function to process claim adjudication
 
     Args:
         claim: The claim to be adjudicated
+        reference: Provider and package data shared with other claims of a batch
+        defer_financials: Leave reserving the approved amount to the caller
 
     Returns:
-        AdjudicationResult: The adjudication result with decision and amounts
+        AdjudicationResult: The adjudication result with decision and amounts, or
+        None when the claim was no longer new once locked
     """
 
-    engine = ClaimAdjudicationEngine(claim)
+    engine = ClaimAdjudicationEngine(
+        claim,
+        context=load_adjudication_context(claim, reference),
+        defer_financials=defer_financials
+    )
     return engine.process_adjudication()
 
 
@@ -659,61 +701,12 @@ def process_service_request_adjudication(service_request) -> AdjudicationResult:
     """
     Process service request (pre-authorization) adjudication
 
-    Similar to claim adjudication but for pre-authorization requests
+    See services.functions.preauthorization.PreAuthorizationEngine
     """
 
-    from services.models import ServiceRequest
-
-    # Create temporary claim-like object for processing
-    temp_claim = type('obj', (object,), {
-        'beneficiary': service_request.beneficiary,
-        'provider': service_request.service_provider,
-        'services': service_request.items,
-        'transaction_number': service_request.request_number,
-        'start_date': service_request.proposed_service_date,
-        'status': 'N'
-    })
-
-    # Use simplified adjudication for pre-auth
-    engine = ClaimAdjudicationEngine(temp_claim)
-    engine.total_claimed = service_request.estimated_amount
-
-    # Run key checks
-    if not engine._check_beneficiary_eligibility():
-        result = 'DECLINED'
-    elif not engine._validate_service_coverage():
-        result = 'DECLINED'
-    elif not engine._check_provider_compliance():
-        result = 'PENDING_REVIEW'
-    else:
-        result = 'APPROVED'
-
-    # Create result for service request
-    adjudication_result = AdjudicationResult.objects.create(
-        service_request=service_request,
-        result=result,
-        claimed_amount=service_request.estimated_amount,
-        accepted_amount=engine.total_accepted,
-        adjudicated_amount=engine.total_accepted,
-        processing_type='AUTO'
-    )
+    from services.functions.preauthorization import process_service_request_adjudication as process_preauthorization
 
-    # Update service request
-    if result == 'APPROVED':
-        service_request.status = 'A'
-        service_request.approved_amount = engine.total_accepted
-        # Generate authorization code
-        from sequences import Sequence
-        sequence_number = Sequence("authorization_code").get_next_value()
-        service_request.authorization_code = f"AUTH{sequence_number:06d}"
-    elif result == 'DECLINED':
-        service_request.status = 'D'
-    else:
-        service_request.status = 'U'
-
-    service_request.save()
-
-    return adjudication_result
+    return process_preauthorization(service_request)
 
 
 # Batch adjudication for multiple claims
@@ -721,6 +714,13 @@ def process_batch_adjudication(claim_ids: List[int]) -> Dict:
     """
     Process multiple claims in batch
 
+    Claims are processed in order of member, beneficiary and service date,
+    sharing provider, coverage and tariff data across the batch. That saves
+    only a few queries per claim, most of which are the claim's own ledger
+    postings; for large batches use
+    services.functions.batch_adjudication.start_batch_adjudication, which
+    spreads the work over Celery workers.
+
     Args:
         claim_ids: List of claim IDs to process
 
@@ -728,50 +728,10 @@ def process_batch_adjudication(claim_ids: List[int]) -> Dict:
         Dict: Summary of batch processing results
     """
 
-    results = {
-        'total_processed': 0,
-        'approved': 0,
-        'declined': 0,
-        'pending_review': 0,
-        'pending_clinical': 0,
-        'errors': 0,
-        'details': []
-    }
+    from services.functions.batch_adjudication import adjudicate_claims
 
-    claims = Claim.objects.filter(id__in=claim_ids, status='N')
-
-    for claim in claims:
-        try:
-            adjudication_result = process_claim_adjudication(claim)
-
-            results['total_processed'] += 1
-
-            if adjudication_result.result == 'APPROVED':
-                results['approved'] += 1
-            elif adjudication_result.result == 'DECLINED':
-                results['declined'] += 1
-            elif adjudication_result.result == 'PENDING_REVIEW':
-                results['pending_review'] += 1
-            elif adjudication_result.result == 'PENDING_CLINICAL':
-                results['pending_clinical'] += 1
-
-            results['details'].append({
-                'claim_id': claim.id,
-                'transaction_number': claim.transaction_number,
-                'result': adjudication_result.result,
-                'claimed_amount': float(adjudication_result.claimed_amount),
-                'adjudicated_amount': float(adjudication_result.adjudicated_amount)
-            })
-
-        except Exception as e:
-            results['errors'] += 1
-            results['details'].append({
-                'claim_id': claim.id,
-                'transaction_number': claim.transaction_number,
-                'result': 'ERROR',
-                'error': str(e)
-            })
-
-            logger.error(f"Batch adjudication error for claim {claim.id}: {str(e)}")
+    results = adjudicate_claims(claim_ids, AdjudicationReferenceData(), include_details=True, prescreen=True)
 
     logger.info(f"Batch adjudication completed: {results}")
+
+    return results
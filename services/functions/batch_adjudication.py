@@ -0,0 +1,226 @@
+import logging
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from services.functions.adjudication_context import AdjudicationReferenceData
+from services.models import AdjudicationBatch, Claim
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 200
+
+# Progress is written to the batch every this many claims
+PROGRESS_INTERVAL = 25
+
+RESULT_COUNTERS = {
+    'APPROVED': 'approved',
+    'DECLINED': 'declined',
+    'PENDING_REVIEW': 'pending_review',
+    'PENDING_CLINICAL': 'pending_clinical',
+}
+
+
+def get_chunk_size() -> int:
+    return getattr(settings, 'FISCO_HUB_SUITE_SETTINGS', {}).get('ADJUDICATION_BATCH_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+
+def chunk_by_group(rows: Iterable[Tuple], chunk_size: int) -> List[List]:
+    """
+    Split (claim id, group id) rows into chunks of about chunk_size claims
+
+    Rows must be ordered by group. A group's claims always land in the same
+    chunk, in their original order, so checks against state the group shares
+    see each earlier claim's outcome. A group with more than chunk_size
+    claims gets a chunk of its own.
+    """
+
+    chunks, current = [], []
+    for _, group in groupby(rows, key=lambda row: row[1]):
+        claim_ids = [claim_id for claim_id, _ in group]
+        if current and len(current) + len(claim_ids) > chunk_size:
+            chunks.append(current)
+            current = []
+        current.extend(claim_ids)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _pending_claims(claim_ids: Iterable):
+    # A member's beneficiaries share the member account, so a member's claims are kept together
+    return Claim.objects.filter(id__in=list(claim_ids), status='N').order_by(
+        'beneficiary__member_id', 'beneficiary_id', 'start_date', 'created_at'
+    )
+
+
+def _record_progress(batch_id, counts: Dict) -> None:
+    counts = {field: value for field, value in counts.items() if value}
+    if batch_id and counts:
+        AdjudicationBatch.objects.filter(pk=batch_id).update(
+            **{field: F(field) + value for field, value in counts.items()}
+        )
+
+
+def _empty_counts() -> Dict:
+    return {'processed': 0, 'approved': 0, 'declined': 0, 'pending_review': 0, 'pending_clinical': 0, 'errors': 0}
+
+
+def _prescreen(claim_ids: List, include_details: bool) -> Tuple[List, Dict, List]:
+    from services.functions.prescreen import prescreen_claims, record_prescreen_declines
+
+    screened = prescreen_claims(claim_ids)
+    declined = record_prescreen_declines(screened.declined)
+
+    counts = _empty_counts()
+    counts['processed'] = counts['declined'] = declined
+
+    details = []
+    if include_details:
+        details = [
+            {'claim_id': claim_id, 'result': 'DECLINED', 'prescreen_code': code, 'decline_reason': description}
+            for claim_id, (code, description) in screened.declined.items()
+        ]
+
+    return screened.survivors, counts, details
+
+
+def adjudicate_claims(claim_ids: Iterable, reference: Optional[AdjudicationReferenceData] = None,
+                      batch_id=None, include_details: bool = False, prescreen: bool = False) -> Dict:
+    """
+    Adjudicate new claims one by one, in member, beneficiary and service date order
+
+    Each claim still runs in its own transaction. Providers (with their
+    compliance status), the coverage matrix and the tariff index are shared
+    through the reference data, and when a batch is given its
+    progress counters are updated as claims complete. With prescreen, claims
+    failing the vectorized pre-screen are declined in bulk first.
+    """
+
+    from services.functions.auto_adjudication import process_claim_adjudication
+
+    reference = reference or AdjudicationReferenceData()
+    totals = _empty_counts()
+    pending = _empty_counts()
+    details = []
+
+    if prescreen:
+        claim_ids, screened, details = _prescreen(list(claim_ids), include_details)
+        _record_progress(batch_id, screened)
+        for field, value in screened.items():
+            totals[field] += value
+
+    for claim in _pending_claims(claim_ids):
+        try:
+            adjudication_result = process_claim_adjudication(claim, reference)
+
+            pending['processed'] += 1
+            # None when the claim pipeline adjudicated it since the chunk was queued
+            if adjudication_result is not None and adjudication_result.result in RESULT_COUNTERS:
+                pending[RESULT_COUNTERS[adjudication_result.result]] += 1
+
+            if include_details and adjudication_result is not None:
+                details.append({
+                    'claim_id': claim.id,
+                    'transaction_number': claim.transaction_number,
+                    'result': adjudication_result.result,
+                    'claimed_amount': float(adjudication_result.original_amount),
+                    'adjudicated_amount': float(adjudication_result.adjudicated_amount)
+                })
+
+        except Exception as e:
+            pending['errors'] += 1
+
+            if include_details:
+                details.append({
+                    'claim_id': claim.id,
+                    'transaction_number': claim.transaction_number,
+                    'result': 'ERROR',
+                    'error': str(e)
+                })
+
+            logger.error(f"Batch adjudication error for claim {claim.id}: {str(e)}")
+
+        if pending['processed'] + pending['errors'] >= PROGRESS_INTERVAL:
+            _record_progress(batch_id, pending)
+            for field, value in pending.items():
+                totals[field] += value
+            pending = _empty_counts()
+
+    _record_progress(batch_id, pending)
+    for field, value in pending.items():
+        totals[field] += value
+
+    return {
+        'total_processed': totals['processed'],
+        'approved': totals['approved'],
+        'declined': totals['declined'],
+        'pending_review': totals['pending_review'],
+        'pending_clinical': totals['pending_clinical'],
+        'errors': totals['errors'],
+        'details': details
+    }
+
+
+def start_batch_adjudication(claim_ids: Iterable, chunk_size: Optional[int] = None, user=None) -> AdjudicationBatch:
+    """
+    Queue new claims for adjudication on the Celery workers
+
+    Claims failing the pre-screen are declined in bulk up front. The rest
+    are split into chunks by member, so claims drawing on the same member
+    account (annual limits and balance) are adjudicated in order by one
+    worker, and each chunk is queued as one task once the batch has been
+    committed. Poll the returned batch for progress.
+    """
+
+    from services.tasks import adjudicate_claim_chunk
+
+    survivors, screened, _ = _prescreen(list(claim_ids), include_details=False)
+    rows = list(_pending_claims(survivors).values_list('id', 'beneficiary__member_id'))
+    chunks = chunk_by_group(rows, chunk_size or get_chunk_size())
+
+    with transaction.atomic():
+        batch = AdjudicationBatch.objects.create(
+            created_by=user,
+            total_claims=len(rows) + screened['processed'],
+            processed=screened['processed'],
+            declined=screened['declined'],
+            chunk_count=len(chunks),
+            status='Q' if chunks else 'C',
+            completed_at=None if chunks else timezone.now()
+        )
+
+        def enqueue():
+            for chunk in chunks:
+                adjudicate_claim_chunk.delay(str(batch.id), [str(claim_id) for claim_id in chunk])
+
+        transaction.on_commit(enqueue)
+
+    logger.info(
+        f"Queued adjudication batch {batch.id}: {screened['declined']} claims declined by pre-screen, "
+        f"{len(rows)} claims in {len(chunks)} chunks"
+    )
+
+    return batch
+
+
+def run_batch_chunk(batch_id, claim_ids: List) -> Dict:
+    """Adjudicate one chunk of a batch and mark the batch complete after its last chunk"""
+
+    AdjudicationBatch.objects.filter(pk=batch_id, status='Q').update(status='R', started_at=timezone.now())
+
+    try:
+        results = adjudicate_claims(claim_ids, AdjudicationReferenceData(), batch_id=batch_id)
+    finally:
+        AdjudicationBatch.objects.filter(pk=batch_id).update(chunks_completed=F('chunks_completed') + 1)
+        AdjudicationBatch.objects.filter(
+            pk=batch_id,
+            status__in=['Q', 'R'],
+            chunks_completed__gte=F('chunk_count')
+        ).update(status='C', completed_at=timezone.now())
+
+    return results
@@ -0,0 +1,475 @@
+import io
+import logging
+import platform
+import random
+import subprocess
+import time
+from datetime import timedelta
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional
+
+import django
+import numpy as np
+from django.db import connection, transaction
+from django.utils import timezone
+from sequences import Sequence
+
+from accounting.models import MemberAccount
+from authentication.models import User
+from configurations.models import (
+    Currency, Member, Package, PackageLimit, Service, ServiceProvider, ServiceProviderType, ServiceTierPrice, Tier
+)
+from membership.models import Beneficiary
+from services.functions.coverage import bump_coverage_version
+from services.functions.rule_cache import bump_rules_version
+from services.functions.tariff import bump_tariff_version
+from services.models import AdjudicationResult, AdjudicationRule, Claim, ClaimServiceLine
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_INVOICE_PREFIX = 'BENCH-'
+
+SCALES = {
+    'small': {
+        'members': 50, 'beneficiaries_per_member': 3, 'providers': 10, 'services': 40,
+        'rules': 20, 'history_claims': 5, 'claims': 200,
+    },
+    'medium': {
+        'members': 500, 'beneficiaries_per_member': 3, 'providers': 50, 'services': 200,
+        'rules': 60, 'history_claims': 10, 'claims': 1000,
+    },
+    'large': {
+        'members': 5000, 'beneficiaries_per_member': 4, 'providers': 200, 'services': 1000,
+        'rules': 200, 'history_claims': 20, 'claims': 5000,
+    },
+}
+
+SCENARIOS = ('process_claim_adjudication', 'process_batch_adjudication', 'manual_review', 'bulk_manual_review')
+
+PROVIDER_TYPES = ('General Practice', 'Dental', 'Optical', 'Pharmacy', 'Specialist', 'Radiology')
+
+
+class SyntheticCorpus:
+    """
+    Reproducible synthetic claims data for benchmarking
+
+    Creates currencies, tiers, provider types, providers, services with
+    tier tariffs, a package with category limits, adjudication rules,
+    members with accounts and beneficiaries, a claim history (posted to
+    the utilization ledger and fraud counters) and sets of new claims for
+    each benchmark scenario. Rows are bulk-created so building the corpus
+    does not fire the claim signals. The same seed always gives the same
+    amounts, dates and mix of services, providers and rules.
+    """
+
+    def __init__(self, seed: int = 1, scale: str = 'small', **overrides):
+        self.seed = seed
+        self.scale = dict(SCALES[scale], **{key: value for key, value in overrides.items() if value})
+        self.rng = random.Random(seed)
+        # Names and numbers carry a run number, so corpora of several runs can share a database
+        self.run_number = Sequence('benchmark_corpus').get_next_value() % 1000
+        self.tag = f"{seed}-{self.run_number:03d}"
+        self.today = timezone.now().date()
+        self.claim_sets: Dict[str, List] = {}
+        self.counts: Dict[str, int] = {}
+        self.user: Optional[User] = None
+
+    def _amount(self, low: int, high: int) -> Decimal:
+        return Decimal(self.rng.randint(low * 100, high * 100)) / 100
+
+    def _build_reference(self) -> None:
+        self.currency, _ = Currency.objects.get_or_create(
+            code='USD', defaults={'name': 'US Dollar', 'symbol': '$', 'is_base_currency': True}
+        )
+        # Tier levels are unique, so corpora share the tiers of an earlier run or the deployment
+        self.tiers = [
+            Tier.objects.get_or_create(level=level, defaults={'name': f"Benchmark {self.tag} Tier {level}"})[0]
+            for level in (1, 2, 3)
+        ]
+        self.provider_types = ServiceProviderType.objects.bulk_create([
+            ServiceProviderType(name=f"{name} ({self.tag})") for name in PROVIDER_TYPES
+        ])
+
+        self.providers = ServiceProvider.objects.bulk_create([
+            ServiceProvider(
+                account_no=f"BM{self.tag}-{index:05d}",
+                name=f"Benchmark Provider {self.tag} {index}",
+                identification_no=f"BM{index:05d}",
+                address_line_1=f"{index} Benchmark Road",
+                mobile='+263770000000',
+                email=f"provider{index}@benchmark.invalid",
+                tier=self.rng.choice(self.tiers),
+                type=self.rng.choice(self.provider_types),
+            )
+            for index in range(self.scale['providers'])
+        ])
+
+        self.services = Service.objects.bulk_create([
+            Service(
+                code=f"BM{self.tag}-{index:05d}",
+                description=f"Benchmark service {index}",
+                service_provider_type=self.rng.choice(self.provider_types),
+                base_price=self._amount(10, 500),
+            )
+            for index in range(self.scale['services'])
+        ])
+
+        # A lapsed and a current tariff per service and tier; some current tariffs sit below the base price
+        ServiceTierPrice.objects.bulk_create([
+            ServiceTierPrice(
+                service=service,
+                tier=tier,
+                recommended_price=service.base_price,
+                max_payable_amount=(service.base_price * Decimal(self.rng.choice(factors))).quantize(Decimal('0.01')),
+                effective_from=self.today - timedelta(days=days_from),
+                effective_to=self.today - timedelta(days=days_to) if days_to is not None else None,
+            )
+            for service in self.services
+            for tier in self.tiers
+            for days_from, days_to, factors in ((800, 401, ('0.8',)), (400, None, ('0.9', '1.1', '1.2', '1.5')))
+        ], batch_size=1000)
+
+        self.package = Package.objects.create(
+            name=f"Benchmark {self.tag}",
+            global_annual_limit=Decimal('50000.00'),
+            global_family_limit=Decimal('150000.00'),
+        )
+        PackageLimit.objects.bulk_create([
+            PackageLimit(
+                package=self.package,
+                service_provider_type=provider_type,
+                annual_limit=Decimal(self.rng.choice([0, 5000, 10000, 20000])),
+                per_visit_limit=Decimal(self.rng.choice([0, 1000, 2500])),
+                co_payment_percentage=Decimal(self.rng.choice([0, 0, 5, 10])),
+            )
+            for provider_type in self.provider_types
+        ])
+
+    def _build_rules(self) -> None:
+        actions = ['REDUCE_AMOUNT', 'REDUCE_AMOUNT', 'AUTO_APPROVE', 'MANUAL_REVIEW', 'CLINICAL_REVIEW']
+        rules = []
+        for index in range(self.scale['rules']):
+            action = self.rng.choice(actions)
+            rules.append(AdjudicationRule(
+                name=f"Benchmark {self.tag} rule {index}",
+                description=f"Benchmark rule {index}",
+                rule_type=self.rng.choice(['C', 'B']),
+                action=action,
+                # Review rules only catch the expensive claims
+                min_amount=Decimal(self.rng.choice([1000, 1500, 3000] if action.endswith('REVIEW') else [0, 0, 200])),
+                max_visits_per_month=self.rng.choice([0, 0, 0, 4]),
+                reduction_percentage=Decimal(self.rng.choice([5, 10])),
+                priority=self.rng.randint(1, 200),
+                effective_from=self.today - timedelta(days=400),
+            ))
+        rules = AdjudicationRule.objects.bulk_create(rules)
+
+        through = AdjudicationRule.services.through
+        category_through = AdjudicationRule.service_provider_type.through
+        service_links, category_links = [], []
+        for rule in rules:
+            restriction = self.rng.random()
+            if restriction < 0.6:
+                for service in self.rng.sample(self.services, min(3, len(self.services))):
+                    service_links.append(through(adjudicationrule_id=rule.id, service_id=service.id))
+            elif restriction < 0.85:
+                category_links.append(category_through(
+                    adjudicationrule_id=rule.id, serviceprovidertype_id=self.rng.choice(self.provider_types).id
+                ))
+        through.objects.bulk_create(service_links)
+        category_through.objects.bulk_create(category_links)
+
+    def _build_members(self) -> None:
+        members = Member.objects.bulk_create([
+            Member(
+                name=f"Benchmark Member {self.tag} {index}",
+                type='IN',
+                membership_number=f"9{self.run_number:03d}{index:06d}",
+                currency=self.currency,
+                address_line_1=f"{index} Member Street",
+                mobile='+263771000000',
+                email=f"member{index}@benchmark.invalid",
+                signing_rule='S',
+                sponsor='S',
+                default_package=self.package,
+            )
+            for index in range(self.scale['members'])
+        ])
+
+        MemberAccount.objects.bulk_create([
+            MemberAccount(
+                member=member,
+                currency=self.currency,
+                balance=Decimal('100000.00'),
+                available_balance=Decimal('100000.00'),
+            )
+            for member in members
+        ])
+
+        beneficiaries = []
+        for member_index, member in enumerate(members):
+            for dependent in range(self.scale['beneficiaries_per_member']):
+                beneficiaries.append(Beneficiary(
+                    first_name=f"Beneficiary{dependent}",
+                    last_name=f"Member{member_index}",
+                    national_id_number=f"BM-{self.tag}-{member_index:06d}-{dependent}",
+                    date_of_birth=self.today - timedelta(days=self.rng.randint(20 * 365, 60 * 365)),
+                    gender=self.rng.choice(['M', 'F']),
+                    member=member,
+                    membership_number=member.membership_number,
+                    dependent_code=f"{dependent:03d}",
+                    type='P' if dependent == 0 else 'D',
+                    benefit_start_date=self.today - timedelta(days=720),
+                ))
+        self.beneficiaries = Beneficiary.objects.bulk_create(beneficiaries, batch_size=1000)
+
+    def _claims(self, count: int, status: str, min_days_ago: int, max_days_ago: int) -> List[Claim]:
+        """Bulk-create claims with one to three service lines each"""
+
+        claims, lines = [], []
+        for _ in range(count):
+            provider = self.rng.choice(self.providers)
+            service_date = self.today - timedelta(days=self.rng.randint(min_days_ago, max_days_ago))
+            claim_lines = []
+            for service in self.rng.sample(self.services, self.rng.randint(1, min(3, len(self.services)))):
+                quantity = Decimal(self.rng.randint(1, 2))
+                unit_price = service.base_price
+                claim_lines.append((service, quantity, unit_price, quantity * unit_price))
+
+            claimed = sum(amount for _, _, _, amount in claim_lines)
+            index = self.counts['claims'] = self.counts.get('claims', 0) + 1
+            claim = Claim(
+                transaction_number=f"BM.{self.tag}.{index:07d}",
+                invoice_number=f"{BENCHMARK_INVOICE_PREFIX}{self.tag}-{index}",
+                claimed_amount=claimed,
+                accepted_amount=claimed if status != 'N' else Decimal('0.00'),
+                adjudicated_amount=claimed if status in ('A', 'P') else Decimal('0.00'),
+                user=self.user,
+                whom_to_pay='P',
+                beneficiary=self.rng.choice(self.beneficiaries),
+                provider=provider,
+                status=status,
+                start_date=service_date,
+                end_date=service_date,
+            )
+            claims.append(claim)
+            lines.extend(
+                ClaimServiceLine(
+                    claim=claim, service=service, service_date=service_date,
+                    quantity=quantity, unit_price=unit_price, claimed_amount=amount,
+                    accepted_amount=amount if status != 'N' else Decimal('0.00'),
+                    adjudicated_amount=amount if status in ('A', 'P') else Decimal('0.00'),
+                )
+                for service, quantity, unit_price, amount in claim_lines
+            )
+
+        Claim.objects.bulk_create(claims, batch_size=1000)
+        ClaimServiceLine.objects.bulk_create(lines, batch_size=1000)
+        return claims
+
+    def _build_claims(self) -> None:
+        from services.functions.fraud_signals import (
+            backfill_content_fingerprints, rebuild_amount_statistics, rebuild_fraud_signals
+        )
+        from services.functions.utilization import rebuild_utilization
+
+        history = self._claims(len(self.beneficiaries) * self.scale['history_claims'], 'P', 31, 330)
+        rebuild_utilization([beneficiary.id for beneficiary in self.beneficiaries])
+        rebuild_fraud_signals([provider.id for provider in self.providers])
+        rebuild_amount_statistics()
+        backfill_content_fingerprints([provider.id for provider in self.providers])
+        self.counts['history_claims'] = len(history)
+
+        for scenario in ('process_claim_adjudication', 'process_batch_adjudication'):
+            self.claim_sets[scenario] = [claim.id for claim in self._claims(self.scale['claims'], 'N', 0, 30)]
+
+        # Claims already referred for review, each with its automatic result
+        for scenario in ('manual_review', 'bulk_manual_review'):
+            review = self._claims(self.scale['claims'], 'U', 0, 30)
+            AdjudicationResult.objects.bulk_create([
+                AdjudicationResult(
+                    claim=claim,
+                    result='PENDING_REVIEW',
+                    original_amount=claim.claimed_amount,
+                    adjudicated_amount=claim.claimed_amount,
+                    processing_type='AUTOMATIC',
+                    processed_at=timezone.now(),
+                )
+                for claim in review
+            ], batch_size=1000)
+            self.claim_sets[scenario] = [claim.id for claim in review]
+
+    def build(self) -> 'SyntheticCorpus':
+        from django.core.management import call_command
+
+        started = time.perf_counter()
+
+        call_command('populate_adjudication_codes', stdout=io.StringIO())
+
+        self.user = User.objects.create(
+            username=f"benchmark-{self.tag}",
+            email=f"benchmark-{self.tag}@benchmark.invalid",
+            first_name='Benchmark',
+            last_name='Adjudicator',
+            is_staff=True,
+            is_superuser=True,
+        )
+
+        with transaction.atomic():
+            self._build_reference()
+            self._build_rules()
+            self._build_members()
+            self._build_claims()
+
+        # Rules, package limits and tariffs were bulk-created, so their signals did not fire
+        bump_rules_version()
+        bump_coverage_version()
+        bump_tariff_version()
+
+        self.counts.update({
+            'members': self.scale['members'],
+            'beneficiaries': len(self.beneficiaries),
+            'providers': len(self.providers),
+            'services': len(self.services),
+            'rules': self.scale['rules'],
+        })
+        self.build_seconds = round(time.perf_counter() - started, 3)
+
+        logger.info(f"Built benchmark corpus {self.tag} in {self.build_seconds}s: {self.counts}")
+
+        return self
+
+
+class QueryCounter:
+    """Execute wrapper counting the queries run on the default connection"""
+
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+def summarize_timings(latencies_ms: List[float], queries: int, claims: int, elapsed: float) -> Dict:
+    """Throughput, latency percentiles and queries per claim of one scenario"""
+
+    latencies = np.array(latencies_ms or [0.0])
+    return {
+        'claims': claims,
+        'seconds': round(elapsed, 3),
+        'claims_per_second': round(claims / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(float(np.percentile(latencies, 50)), 3),
+        'p99_ms': round(float(np.percentile(latencies, 99)), 3),
+        'max_ms': round(float(latencies.max()), 3),
+        'queries_per_claim': round(queries / claims, 2) if claims else 0.0,
+    }
+
+
+def _run(units: Iterable[List], work: Callable[[List], None]) -> Dict:
+    """Time each unit of work; every claim of a unit is given the unit's latency divided by its size"""
+
+    counter = QueryCounter()
+    latencies, claims = [], 0
+
+    started = time.perf_counter()
+    with connection.execute_wrapper(counter):
+        for unit in units:
+            unit_started = time.perf_counter()
+            work(unit)
+            unit_ms = (time.perf_counter() - unit_started) * 1000
+            latencies.extend([unit_ms / len(unit)] * len(unit))
+            claims += len(unit)
+    elapsed = time.perf_counter() - started
+
+    return summarize_timings(latencies, counter.queries, claims, elapsed)
+
+
+def benchmark_claim_adjudication(claim_ids: List) -> Dict:
+    from services.functions.auto_adjudication import process_claim_adjudication
+
+    return _run(
+        ([claim_id] for claim_id in claim_ids),
+        lambda unit: process_claim_adjudication(Claim.objects.get(pk=unit[0]))
+    )
+
+
+def benchmark_batch_adjudication(claim_ids: List, batch_size: int) -> Dict:
+    from services.functions.auto_adjudication import process_batch_adjudication
+
+    batches = [claim_ids[start:start + batch_size] for start in range(0, len(claim_ids), batch_size)]
+    return dict(_run(batches, process_batch_adjudication), batch_size=batch_size)
+
+
+def benchmark_manual_review(claim_ids: List, adjudicator: User) -> Dict:
+    from services.functions.manual_adjudication import ManualAdjudicationEngine
+
+    review_data = {'decision': 'approve', 'override_reason': 'Benchmark review'}
+
+    return _run(
+        ([claim_id] for claim_id in claim_ids),
+        lambda unit: ManualAdjudicationEngine(Claim.objects.get(pk=unit[0]), adjudicator).review_claim(review_data)
+    )
+
+
+def benchmark_bulk_manual_review(claim_ids: List, adjudicator: User) -> Dict:
+    from services.functions.manual_adjudication import process_bulk_manual_review
+
+    review_data = {'decision': 'approve', 'override_reason': 'Benchmark review'}
+
+    return _run([claim_ids], lambda unit: process_bulk_manual_review(unit, review_data, adjudicator))
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(seed: int = 1, scale: str = 'small', scenarios: Iterable[str] = SCENARIOS,
+                  batch_size: int = 50, **overrides) -> Dict:
+    """
+    Build a synthetic corpus and time the claims path on it
+
+    Writes to the default database, which should be a scratch SQLite or
+    Postgres database. Returns a JSON-serializable report with the run's
+    environment, corpus size and per-scenario throughput, p50/p99 latency
+    and queries per claim.
+    """
+
+    corpus = SyntheticCorpus(seed=seed, scale=scale, **overrides).build()
+
+    results = {}
+    for scenario in scenarios:
+        claim_ids = corpus.claim_sets[scenario]
+        logger.info(f"Benchmarking {scenario} on {len(claim_ids)} claims")
+
+        if scenario == 'process_claim_adjudication':
+            results[scenario] = benchmark_claim_adjudication(claim_ids)
+        elif scenario == 'process_batch_adjudication':
+            results[scenario] = benchmark_batch_adjudication(claim_ids, batch_size)
+        elif scenario == 'manual_review':
+            results[scenario] = benchmark_manual_review(claim_ids, corpus.user)
+        elif scenario == 'bulk_manual_review':
+            results[scenario] = benchmark_bulk_manual_review(claim_ids, corpus.user)
+
+    return {
+        'run': {
+            'started_at': timezone.now().isoformat(),
+            'commit': _git_commit(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+        },
+        'corpus': {
+            'seed': seed,
+            'scale': scale,
+            'tag': corpus.tag,
+            'build_seconds': corpus.build_seconds,
+            **corpus.counts,
+        },
+        'scenarios': results,
+    }
@@ -0,0 +1,128 @@
+import logging
+from typing import Optional
+
+from django.db import transaction
+
+from accounting.models import MemberAccount, MemberTransaction
+from services.models import AdjudicationResult, Claim
+
+logger = logging.getLogger(__name__)
+
+
+def queue_claim_adjudication(claim: Claim) -> None:
+    """
+    Queue a new claim for the adjudication pipeline once it is committed
+
+    The pipeline runs on the Celery workers as a chain of
+    adjudicate -> notify, so claim submission does not wait for the rules
+    engine or the SMS/email gateways. The approved amount is reserved in
+    the adjudication transaction, with the member account locked, so claims
+    of the member's other beneficiaries see it.
+    """
+
+    claim_id = str(claim.pk)
+    transaction.on_commit(lambda: start_claim_pipeline(claim_id))
+
+
+def start_claim_pipeline(claim_id: str):
+    from celery import chain
+    from services.tasks import adjudicate_claim_task, notify_claim_result_task
+
+    return chain(
+        adjudicate_claim_task.s(claim_id),
+        notify_claim_result_task.s(),
+    ).delay()
+
+
+def reserve_claim_funds(claim: Claim, account: Optional[MemberAccount] = None) -> Optional[MemberTransaction]:
+    """
+    Reserve an approved claim's adjudicated amount on the member account
+
+    Idempotent: a claim that already has a reserve transaction is left
+    alone, so a retried pipeline step cannot reserve twice. The account row
+    is locked first; the reserve transaction's post_save signal
+    (accounting.signals.update_account_balances) moves its balances.
+    """
+
+    if claim.status != 'A' or claim.adjudicated_amount <= 0:
+        return None
+
+    with transaction.atomic():
+        if account is None:
+            member = claim.beneficiary.member
+            account = MemberAccount.objects.filter(member_id=member.id, currency_id=member.currency_id).first()
+            if account is None:
+                logger.warning(f"No member account to reserve funds for claim {claim.transaction_number}")
+                return None
+
+        account = MemberAccount.objects.select_for_update().get(pk=account.pk)
+        if MemberTransaction.objects.filter(claim_id=claim.pk, transaction_type='R').exists():
+            return None
+
+        amount = claim.adjudicated_amount
+
+        reserve = MemberTransaction.objects.create(
+            account=account,
+            transaction_type='R',  # Reserve
+            amount_debited=amount,
+            balance=account.balance,
+            available_balance=account.available_balance - amount,
+            description=f'Reserve for claim: {claim.transaction_number}',
+            reference=claim.transaction_number,
+            claim=claim,
+            status='C'
+        )
+
+    return reserve
+
+
+def notify_claim_result(claim: Claim, adjudication_result: AdjudicationResult) -> None:
+    """Send the member the notification for an adjudication outcome"""
+
+    from configurations.functions import (
+        send_claim_approval_notification, send_claim_decline_notification, send_claim_review_notification
+    )
+
+    if adjudication_result.result == 'APPROVED':
+        send_claim_approval_notification(claim)
+    elif adjudication_result.result == 'DECLINED':
+        send_claim_decline_notification(claim, adjudication_result.decline_reason)
+    elif adjudication_result.result in ['PENDING_REVIEW', 'PENDING_CLINICAL']:
+        send_claim_review_notification(claim)
+
+
+def get_claim_adjudication_status(claim: Claim) -> dict:
+    """Current position of a claim in the adjudication pipeline, for polling"""
+
+    adjudication_result = claim.adjudication_results.filter(is_active=True).order_by('-created_at').first()
+
+    if adjudication_result is None:
+        stage = 'QUEUED' if claim.status == 'N' else 'NO_RESULT'
+    elif claim.status == 'A' and claim.adjudicated_amount > 0 and not MemberTransaction.objects.filter(
+        claim_id=claim.pk, transaction_type='R'
+    ).exists():
+        # Reserved in the adjudication transaction, so only missing when the member has no account
+        stage = 'NO_RESERVE'
+    else:
+        stage = 'COMPLETED'
+
+    status = {
+        'claim_id': str(claim.pk),
+        'transaction_number': claim.transaction_number,
+        'stage': stage,
+        'claim_status': claim.status,
+        'claim_status_display': claim.get_status_display(),
+        'result': None,
+    }
+
+    if adjudication_result is not None:
+        status['result'] = {
+            'result': adjudication_result.result,
+            'result_display': adjudication_result.get_result_display(),
+            'adjudicated_amount': float(adjudication_result.adjudicated_amount),
+            'co_payment_amount': float(adjudication_result.co_payment_amount),
+            'decline_reason': adjudication_result.decline_reason,
+            'processed_at': adjudication_result.created_at.isoformat(),
+        }
+
+    return status
@@ -0,0 +1,151 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+from services.functions.rule_cache import CacheVersion, ProcessCache
+from services.models import AdjudicationMessage, AdjudicationMessageCode, AdjudicationResult
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_CODES_VERSION_CACHE_KEY = 'adjudication_message_codes_version'
+
+
+def compact_messages_enabled() -> bool:
+    return getattr(settings, 'FISCO_HUB_SUITE_SETTINGS', {}).get('ADJUDICATION_COMPACT_MESSAGES', False)
+
+
+def encode_messages(messages: Iterable[Tuple]) -> List[List]:
+    """
+    Encode (code, description, title) messages as a compact array
+
+    Each message becomes [code], [code, description] or [code, description,
+    title], in order, so the array position is the sequence number.
+    """
+
+    encoded = []
+    for code, description, title in messages:
+        entry = [code, description, title]
+        while len(entry) > 1 and entry[-1] is None:
+            entry.pop()
+        encoded.append(entry)
+    return encoded
+
+
+class ResultMessage:
+    """One adjudication message, whether stored as a row or in a compact array"""
+
+    __slots__ = ('code', 'title', 'description', 'message_type', 'sequence_number',
+                 'is_visible_to_provider', 'is_visible_to_member')
+
+    def __init__(self, code: str, message_code: Optional[AdjudicationMessageCode], description: Optional[str],
+                 title: Optional[str], sequence_number: int):
+        self.code = code
+        self.title = title or (message_code.title if message_code else code)
+        self.description = description or (message_code.description if message_code else '')
+        self.message_type = message_code.message_type if message_code else None
+        self.sequence_number = sequence_number
+        self.is_visible_to_provider = message_code.is_visible_to_provider if message_code else True
+        self.is_visible_to_member = message_code.is_visible_to_member if message_code else False
+
+    def __repr__(self):
+        return f"ResultMessage({self.code!r}, {self.sequence_number})"
+
+
+def decode_messages(compact: Iterable[List], message_codes: Dict) -> List[ResultMessage]:
+    """Decode a compact message array, taking code defaults from message_codes (keyed by code)"""
+    decoded = []
+    for sequence, entry in enumerate(compact, start=1):
+        code, description, title = (list(entry) + [None, None])[:3]
+        decoded.append(ResultMessage(code, message_codes.get(code), description, title, sequence))
+    return decoded
+
+
+def _load_message_codes(version: Optional[str]) -> Dict:
+    return AdjudicationMessageCode.objects.in_bulk(field_name='code')
+
+
+message_codes_version = CacheVersion(MESSAGE_CODES_VERSION_CACHE_KEY, 'Adjudication message codes')
+
+# Process-level cache of the message codes, keyed by code
+_message_codes = ProcessCache(message_codes_version, _load_message_codes)
+
+
+def get_message_codes_version() -> Optional[str]:
+    """Get the shared message code version stamp"""
+    return message_codes_version.get()
+
+
+def bump_message_codes_version() -> None:
+    """Mark the message codes stale in every worker"""
+    message_codes_version.bump()
+
+
+def get_message_codes() -> Dict:
+    """Get every message code keyed by code, reloading only when the version changed"""
+    return _message_codes.get()
+
+
+def get_result_messages(result: AdjudicationResult) -> List[ResultMessage]:
+    """
+    A result's messages in order
+
+    Compact arrays are decoded against the cached message codes with no
+    query; results written before compact messages read their rows.
+    """
+
+    if result.compact_messages is not None:
+        return decode_messages(result.compact_messages, get_message_codes())
+
+    return [
+        ResultMessage(message.message_code.code, message.message_code, message.custom_description,
+                      message.custom_title, message.sequence_number)
+        for message in result.messages.select_related('message_code').order_by('sequence_number')
+    ]
+
+
+def pack_result_messages(chunk_size: int = 1000, limit: Optional[int] = None) -> Dict:
+    """
+    Move message rows into their results' compact arrays
+
+    Results still without a compact array and with message rows are
+    converted a chunk at a time: the arrays are written with one bulk
+    update and the rows deleted in the same transaction. Returns the
+    number of results and messages packed.
+    """
+
+    totals = {'results': 0, 'messages': 0}
+
+    while limit is None or totals['results'] < limit:
+        size = chunk_size if limit is None else min(chunk_size, limit - totals['results'])
+
+        with transaction.atomic():
+            result_ids = list(
+                AdjudicationResult.objects.filter(
+                    compact_messages__isnull=True, messages__isnull=False
+                ).values_list('id', flat=True).distinct()[:size]
+            )
+            if not result_ids:
+                break
+
+            messages = {}
+            for result_id, code, description, title in AdjudicationMessage.objects.filter(
+                adjudication_result_id__in=result_ids
+            ).order_by('adjudication_result_id', 'sequence_number', 'created_at').values_list(
+                'adjudication_result_id', 'message_code__code', 'custom_description', 'custom_title'
+            ):
+                messages.setdefault(result_id, []).append((code, description, title))
+
+            results = [
+                AdjudicationResult(id=result_id, compact_messages=encode_messages(messages.get(result_id, [])))
+                for result_id in result_ids
+            ]
+            AdjudicationResult.objects.bulk_update(results, ['compact_messages'], batch_size=1000)
+            deleted, _ = AdjudicationMessage.objects.filter(adjudication_result_id__in=result_ids).delete()
+
+        totals['results'] += len(result_ids)
+        totals['messages'] += deleted
+
+    logger.info(f"Packed {totals['messages']} adjudication messages into {totals['results']} results")
+    return totals
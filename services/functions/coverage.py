@@ -0,0 +1,101 @@
+import logging
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+
+from configurations.models import PackageLimit
+from services.functions.rule_cache import CacheVersion, ProcessCache
+
+logger = logging.getLogger(__name__)
+
+COVERAGE_VERSION_CACHE_KEY = 'package_coverage_version'
+
+
+class CoverageLimit:
+    """
+    In-memory copy of one PackageLimit
+
+    Holds the limit's amounts and the service provider type name, so
+    coverage checks read no rows and follow no relations.
+    """
+
+    __slots__ = (
+        'package_id', 'service_provider_type_id', 'name',
+        'annual_limit', 'per_visit_limit', 'max_visits_per_year',
+        'co_payment_percentage', 'co_payment_amount', 'waiting_period_days',
+    )
+
+    def __init__(self, limit: PackageLimit):
+        self.package_id = limit.package_id
+        self.service_provider_type_id = limit.service_provider_type_id
+        self.name = limit.service_provider_type.name
+        self.annual_limit = limit.annual_limit
+        self.per_visit_limit = limit.per_visit_limit
+        self.max_visits_per_year = limit.max_visits_per_year
+        self.co_payment_percentage = limit.co_payment_percentage
+        self.co_payment_amount = limit.co_payment_amount
+        self.waiting_period_days = limit.waiting_period_days
+
+    def cap_visit(self, amount: Decimal) -> Decimal:
+        """Amount payable for one visit after the per-visit limit (0 means no limit)"""
+        if self.per_visit_limit > 0:
+            return min(amount, self.per_visit_limit)
+        return amount
+
+    def co_payment(self, amount: Decimal) -> Decimal:
+        """Beneficiary's share of a visit's accepted amount, never more than the amount itself"""
+        if self.co_payment_percentage:
+            return (amount * self.co_payment_percentage / 100).quantize(Decimal('0.01'))
+        if self.co_payment_amount:
+            return min(amount, self.co_payment_amount)
+        return Decimal('0.00')
+
+
+class CoverageMatrix:
+    """Package limits of every package, keyed by (package_id, service_provider_type_id)"""
+
+    def __init__(self, version: Optional[str], limits: Iterable[CoverageLimit]):
+        self.version = version
+        self.packages: Dict = {}
+        for limit in limits:
+            self.packages.setdefault(limit.package_id, {})[limit.service_provider_type_id] = limit
+
+    def __len__(self) -> int:
+        return sum(len(limits) for limits in self.packages.values())
+
+    def get(self, package_id, service_provider_type_id) -> Optional[CoverageLimit]:
+        return self.packages.get(package_id, {}).get(service_provider_type_id)
+
+    def for_package(self, package_id) -> Dict:
+        """Limits of one package keyed by service provider type (empty when it has none)"""
+        return self.packages.get(package_id, {})
+
+
+def build_coverage_matrix(limits: Iterable[PackageLimit], version: Optional[str] = None) -> CoverageMatrix:
+    return CoverageMatrix(version, (CoverageLimit(limit) for limit in limits))
+
+
+def _load_coverage_matrix(version: Optional[str]) -> CoverageMatrix:
+    matrix = build_coverage_matrix(PackageLimit.objects.select_related('service_provider_type'), version)
+    logger.info(f"Built coverage matrix of {len(matrix)} package limits (version {version})")
+    return matrix
+
+
+coverage_version = CacheVersion(COVERAGE_VERSION_CACHE_KEY, 'Package coverage')
+
+# Process-level cache of the coverage matrix
+_coverage_matrix = ProcessCache(coverage_version, _load_coverage_matrix)
+
+
+def get_coverage_version() -> Optional[str]:
+    """Get the shared coverage version stamp"""
+    return coverage_version.get()
+
+
+def bump_coverage_version() -> None:
+    """Mark the coverage matrix stale in every worker"""
+    coverage_version.bump()
+
+
+def get_coverage_matrix() -> CoverageMatrix:
+    """Get the coverage matrix, rebuilding it only when the version changed"""
+    return _coverage_matrix.get()
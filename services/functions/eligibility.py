@@ -0,0 +1,230 @@
+import logging
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from accounting.models import MemberAccount
+from membership.models import Beneficiary
+from services.functions.coverage import get_coverage_matrix
+from services.functions.rule_cache import CacheVersion
+from services.functions.utilization import get_annual_utilization, get_category_utilization
+
+logger = logging.getLogger(__name__)
+
+ELIGIBILITY_VERSION_CACHE_KEY = 'eligibility_version'
+DEFAULT_ELIGIBILITY_CACHE_TTL = 300
+
+
+def get_eligibility_cache_ttl() -> int:
+    return getattr(settings, 'FISCO_HUB_SUITE_SETTINGS', {}).get('ELIGIBILITY_CACHE_TTL', DEFAULT_ELIGIBILITY_CACHE_TTL)
+
+
+def _beneficiary_key(membership_number: str, dependent_code: str) -> str:
+    return f"eligibility_beneficiary:{membership_number}:{dependent_code}"
+
+
+def _snapshot_key(version: Optional[str], beneficiary_id) -> str:
+    return f"eligibility:{version}:{beneficiary_id}"
+
+
+# Bumping it retires every cached snapshot at once (package changes)
+eligibility_version = CacheVersion(ELIGIBILITY_VERSION_CACHE_KEY, 'Eligibility snapshot')
+
+
+def get_eligibility_version() -> Optional[str]:
+    """Get the shared eligibility version stamp"""
+    return eligibility_version.get()
+
+
+def bump_eligibility_version() -> None:
+    eligibility_version.bump()
+
+
+def build_eligibility_snapshot(beneficiary: Beneficiary, benefit_year: Optional[int] = None) -> Dict:
+    """
+    Build a beneficiary's eligibility snapshot
+
+    Utilization comes from the beneficiary ledgers, so the claims tables are
+    never read. Dates and decimals are kept as is; the snapshot is evaluated
+    against the inquiry date by evaluate_eligibility.
+    """
+
+    benefit_year = benefit_year or timezone.now().year
+    member = beneficiary.member
+    package = member.default_package
+
+    annual_utilized = get_annual_utilization(beneficiary.id, benefit_year)
+    category_utilized = get_category_utilization(beneficiary.id, benefit_year)
+
+    categories = []
+    if package:
+        for limit in get_coverage_matrix().for_package(package.id).values():
+            utilized = category_utilized.get(limit.service_provider_type_id, Decimal('0.00'))
+            categories.append({
+                'service_provider_type_id': str(limit.service_provider_type_id),
+                'name': limit.name,
+                'annual_limit': limit.annual_limit,
+                'utilized': utilized,
+                'remaining': limit.annual_limit - utilized if limit.annual_limit > 0 else None,
+                'per_visit_limit': limit.per_visit_limit,
+                'max_visits_per_year': limit.max_visits_per_year,
+                'co_payment_percentage': limit.co_payment_percentage,
+                'co_payment_amount': limit.co_payment_amount,
+                'waiting_period_days': limit.waiting_period_days,
+                'waiting_period_ends': (
+                    beneficiary.benefit_start_date + timedelta(days=limit.waiting_period_days)
+                    if limit.waiting_period_days > 0 and beneficiary.benefit_start_date else None
+                ),
+            })
+
+    account = MemberAccount.objects.filter(
+        member_id=member.id,
+        currency_id=member.currency_id
+    ).select_related('currency').first()
+
+    annual_limit = beneficiary.annual_limit if package else Decimal('0.00')
+
+    return {
+        'beneficiary_id': str(beneficiary.id),
+        'membership_number': beneficiary.membership_number,
+        'dependent_code': beneficiary.dependent_code,
+        'name': beneficiary.get_full_name,
+        'type': beneficiary.get_type_display(),
+        'status': beneficiary.status,
+        'status_display': beneficiary.get_status_display(),
+        'benefit_start_date': beneficiary.benefit_start_date,
+        'member': {
+            'name': member.name,
+            'membership_number': member.membership_number,
+            'status': member.status,
+        },
+        'package': {
+            'id': str(package.id),
+            'name': package.name,
+        } if package else None,
+        'benefit_year': benefit_year,
+        'annual_limit': annual_limit,
+        'annual_utilized': annual_utilized,
+        'annual_remaining': annual_limit - annual_utilized,
+        'categories': categories,
+        'account': {
+            'currency': account.currency.code,
+            'status': account.status,
+            'available_balance': account.available_balance,
+            'reserved_balance': account.reserved_balance,
+        } if account else None,
+    }
+
+
+def evaluate_eligibility(snapshot: Dict, on_date: date) -> Dict:
+    """
+    Evaluate a snapshot on the inquiry date
+
+    Applies the claim engine's eligibility checks in the same order (status,
+    benefit start date, annual limit) and marks the categories still in
+    their waiting period. Returns a new dict; the snapshot is not changed.
+    """
+
+    reason = None
+    if snapshot['status'] == 'I':
+        reason = 'Beneficiary account is inactive'
+    elif snapshot['status'] == 'S':
+        reason = 'Beneficiary is suspended'
+    elif snapshot['status'] == 'T':
+        reason = 'Beneficiary account terminated'
+    elif snapshot['benefit_start_date'] and snapshot['benefit_start_date'] > on_date:
+        reason = f"Benefits start on {snapshot['benefit_start_date']}"
+    elif snapshot['annual_remaining'] <= 0:
+        reason = 'Annual limit exceeded'
+
+    categories = [
+        dict(category, in_waiting_period=bool(
+            category['waiting_period_ends'] and category['waiting_period_ends'] > on_date
+        ))
+        for category in snapshot['categories']
+    ]
+
+    return dict(
+        snapshot,
+        categories=categories,
+        eligible=reason is None,
+        reason=reason,
+        inquiry_date=on_date,
+    )
+
+
+def _load_beneficiary(**filters) -> Optional[Beneficiary]:
+    return Beneficiary.objects.select_related(
+        'member__default_package', 'member__currency'
+    ).filter(**filters).first()
+
+
+def get_eligibility(membership_number: str, dependent_code: str) -> Optional[Dict]:
+    """
+    Answer an eligibility inquiry from the cached snapshot
+
+    A warm inquiry is three cache reads and no queries: the version stamp,
+    the beneficiary id for the membership and dependent code, and the
+    snapshot. The id is cached for the snapshot TTL too, and is looked up
+    again when the snapshot no longer carries the requested numbers.
+    Returns None when no beneficiary matches.
+    """
+
+    today = timezone.now().date()
+    beneficiary_key = _beneficiary_key(membership_number, dependent_code)
+    version = get_eligibility_version()
+
+    beneficiary = None
+    beneficiary_id = cache.get(beneficiary_key)
+    if beneficiary_id is None:
+        beneficiary = _load_beneficiary(membership_number=membership_number, dependent_code=dependent_code)
+        if beneficiary is None:
+            return None
+        beneficiary_id = str(beneficiary.id)
+        cache.set(beneficiary_key, beneficiary_id, get_eligibility_cache_ttl())
+
+    snapshot = cache.get(_snapshot_key(version, beneficiary_id))
+    if snapshot is None or snapshot['benefit_year'] != today.year or (
+        snapshot['membership_number'], snapshot['dependent_code']
+    ) != (membership_number, dependent_code):
+        beneficiary = beneficiary or _load_beneficiary(pk=beneficiary_id)
+        if beneficiary is None or (
+            beneficiary.membership_number, beneficiary.dependent_code
+        ) != (membership_number, dependent_code):
+            # Deleted or renumbered since its id was cached
+            cache.delete(beneficiary_key)
+            return get_eligibility(membership_number, dependent_code)
+
+        snapshot = build_eligibility_snapshot(beneficiary, today.year)
+        cache.set(_snapshot_key(version, beneficiary_id), snapshot, get_eligibility_cache_ttl())
+
+    return evaluate_eligibility(snapshot, today)
+
+
+def _delete_snapshots(beneficiary_ids: Iterable) -> None:
+    version = get_eligibility_version()
+    cache.delete_many([_snapshot_key(version, beneficiary_id) for beneficiary_id in beneficiary_ids])
+
+
+def invalidate_eligibility(beneficiary_ids: Iterable) -> None:
+    """Drop the cached snapshots of some beneficiaries once the current transaction commits"""
+
+    keys = {str(beneficiary_id) for beneficiary_id in beneficiary_ids if beneficiary_id}
+    if keys:
+        transaction.on_commit(lambda: _delete_snapshots(keys))
+
+
+def invalidate_member_eligibility(member_id) -> None:
+    """Drop the cached snapshots of all of a member's beneficiaries"""
+    invalidate_eligibility(Beneficiary.objects.filter(member_id=member_id).values_list('id', flat=True))
+
+
+def forget_beneficiary(membership_number: str, dependent_code: str) -> None:
+    """Drop the cached beneficiary id of a deleted or renumbered beneficiary"""
+    key = _beneficiary_key(membership_number, dependent_code)
+    transaction.on_commit(lambda: cache.delete(key))
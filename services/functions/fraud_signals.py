@@ -0,0 +1,594 @@
+import hashlib
+import logging
+import math
+import re
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from services.functions.utilization import UTILIZED_STATUSES
+from services.models import (
+    Claim, ClaimServiceLine, ProviderDailyClaimVolume, BeneficiaryProviderDailyClaims,
+    ClaimInvoiceFingerprint, ClaimAmountStatistics
+)
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the fraud thresholds in FISCO_HUB_SUITE_SETTINGS
+FRAUD_DEFAULTS = {
+    'FRAUD_MAX_SAME_DAY_CLAIMS': 3,
+    'FRAUD_MAX_PROVIDER_DAILY_CLAIMS': 50,
+    'FRAUD_HIGH_AMOUNT_MULTIPLIER': 5,
+    'FRAUD_AMOUNT_Z_SCORE': 3,
+    'FRAUD_AMOUNT_MIN_OBSERVATIONS': 5,
+    'FRAUD_AMOUNT_HALF_LIFE_DAYS': 90,
+}
+
+BENEFICIARY_SCOPE = 'B'
+PROVIDER_SCOPE = 'P'
+SERVICE_SCOPE = 'S'
+
+
+def get_fraud_setting(name: str):
+    """Get a fraud threshold from FISCO_HUB_SUITE_SETTINGS, falling back to the default"""
+    return getattr(settings, 'FISCO_HUB_SUITE_SETTINGS', {}).get(name, FRAUD_DEFAULTS[name])
+
+
+def invoice_fingerprint(beneficiary_id, provider_id, invoice_number: str) -> str:
+    """
+    Fingerprint of a beneficiary's invoice at a provider
+
+    The invoice number is normalised to upper case letters and digits, so
+    "inv-0012" and "INV 0012" resubmitted for the same visit collide.
+    """
+
+    normalised = re.sub(r'[^A-Z0-9]', '', (invoice_number or '').upper())
+    return hashlib.sha256(f"{beneficiary_id}|{provider_id}|{normalised}".encode()).hexdigest()
+
+
+def claim_content_fingerprint(beneficiary_id, provider_id, lines: Iterable[Tuple]) -> str:
+    """
+    Fingerprint of what a claim bills for, independent of its invoice number
+
+    lines are (service_code, quantity, claimed_amount, service_date) tuples.
+    Codes are normalised like invoice numbers, amounts to two decimals and
+    lines are sorted, so the same visit resubmitted under a new invoice
+    number, or with its lines in another order, collides.
+    """
+
+    normalised = sorted(
+        f"{re.sub(r'[^A-Z0-9]', '', (code or '').upper())}:{Decimal(quantity):.2f}:{Decimal(amount):.2f}:{service_date}"
+        for code, quantity, amount, service_date in lines
+    )
+    return hashlib.sha256(f"{beneficiary_id}|{provider_id}|{'|'.join(normalised)}".encode()).hexdigest()
+
+
+def find_content_duplicate(claim_id, fingerprint: str) -> Optional[str]:
+    """
+    Transaction number of another live claim with the same content fingerprint
+
+    One indexed lookup; declined, cancelled and reversed claims don't count.
+    """
+
+    return Claim.objects.filter(
+        content_fingerprint=fingerprint,
+        reversed=False
+    ).exclude(
+        status__in=['D', 'C']
+    ).exclude(
+        pk=claim_id
+    ).values_list('transaction_number', flat=True).first()
+
+
+def backfill_content_fingerprints(provider_ids: Optional[Iterable] = None, chunk_size: int = 1000) -> int:
+    """
+    Set the content fingerprint of claims submitted before it was recorded
+
+    Streams the lines of unfingerprinted claims in claim order and saves
+    the fingerprints in bulk. Returns the number of claims updated.
+    """
+
+    lines = ClaimServiceLine.objects.filter(claim__content_fingerprint__isnull=True)
+    if provider_ids is not None:
+        lines = lines.filter(claim__provider_id__in=list(provider_ids))
+
+    updated, pending = 0, []
+
+    def flush():
+        nonlocal updated
+        Claim.objects.bulk_update(pending, ['content_fingerprint'], batch_size=chunk_size)
+        updated += len(pending)
+        pending.clear()
+
+    current = None
+    for claim_id, beneficiary_id, provider_id, code, quantity, amount, service_date in lines.order_by(
+        'claim_id'
+    ).values_list(
+        'claim_id', 'claim__beneficiary_id', 'claim__provider_id', 'service__code',
+        'quantity', 'claimed_amount', 'service_date'
+    ).iterator(chunk_size=chunk_size):
+        if current is None or current[0] != claim_id:
+            if current is not None:
+                pending.append(Claim(pk=current[0], content_fingerprint=claim_content_fingerprint(*current[1:])))
+                if len(pending) >= chunk_size:
+                    flush()
+            current = (claim_id, beneficiary_id, provider_id, [])
+        current[3].append((code, quantity, amount, service_date))
+
+    if current is not None:
+        pending.append(Claim(pk=current[0], content_fingerprint=claim_content_fingerprint(*current[1:])))
+    flush()
+
+    logger.info(f"Backfilled {updated} claim content fingerprints")
+    return updated
+
+
+class AmountStatistics:
+    """
+    Exponentially decayed count, mean and variance of claimed amounts
+
+    Each observation's weight halves every half-life, so the statistics
+    follow recent behaviour without keeping a window of past claims.
+    Observations can be removed again exactly (e.g. on reversal) because
+    the decayed sums are additive.
+    """
+
+    def __init__(self, observations: int = 0, weight: float = 0.0, amount_sum: float = 0.0,
+                 amount_square_sum: float = 0.0, as_of: Optional[date] = None,
+                 half_life_days: Optional[float] = None):
+        self.observations = observations
+        self.weight = weight
+        self.amount_sum = amount_sum
+        self.amount_square_sum = amount_square_sum
+        self.as_of = as_of
+        self.half_life_days = half_life_days or get_fraud_setting('FRAUD_AMOUNT_HALF_LIFE_DAYS')
+
+    @classmethod
+    def from_record(cls, record: ClaimAmountStatistics) -> 'AmountStatistics':
+        return cls(
+            observations=record.observations,
+            weight=record.weight,
+            amount_sum=record.amount_sum,
+            amount_square_sum=record.amount_square_sum,
+            as_of=record.as_of
+        )
+
+    def _decay(self, days: int) -> float:
+        return 0.5 ** (days / self.half_life_days)
+
+    def add(self, amount, on_date: date, sign: int = 1) -> None:
+        """Add an observation on a date, or remove it again with sign=-1"""
+
+        amount = float(amount)
+
+        if self.as_of is None:
+            self.as_of = on_date
+
+        if on_date > self.as_of:
+            factor = self._decay((on_date - self.as_of).days)
+            self.weight *= factor
+            self.amount_sum *= factor
+            self.amount_square_sum *= factor
+            self.as_of = on_date
+            weight = 1.0
+        else:
+            weight = self._decay((self.as_of - on_date).days)
+
+        self.observations += sign
+        self.weight += sign * weight
+        self.amount_sum += sign * weight * amount
+        self.amount_square_sum += sign * weight * amount * amount
+
+        # Clear rounding residue once every observation has been removed
+        if self.observations <= 0:
+            self.observations, self.weight, self.amount_sum, self.amount_square_sum = 0, 0.0, 0.0, 0.0
+
+    def effective_weight(self, on_date: date) -> float:
+        """Decayed number of observations as seen on a date"""
+        if self.as_of is None:
+            return 0.0
+        if on_date > self.as_of:
+            return self.weight * self._decay((on_date - self.as_of).days)
+        return self.weight
+
+    @property
+    def mean(self) -> Optional[float]:
+        if self.weight <= 0:
+            return None
+        return self.amount_sum / self.weight
+
+    @property
+    def standard_deviation(self) -> Optional[float]:
+        mean = self.mean
+        if mean is None:
+            return None
+        return math.sqrt(max(self.amount_square_sum / self.weight - mean * mean, 0.0))
+
+    def z_score(self, amount) -> Optional[float]:
+        mean, deviation = self.mean, self.standard_deviation
+        if mean is None or not deviation:
+            return None
+        return (float(amount) - mean) / deviation
+
+    def is_outlier(self, amount, on_date: date) -> bool:
+        """
+        Check whether an amount is unusually high for this history
+
+        Needs FRAUD_AMOUNT_MIN_OBSERVATIONS of (decayed) history. When every
+        past amount was the same there is no spread to measure, so the amount
+        is compared with FRAUD_HIGH_AMOUNT_MULTIPLIER times the mean instead.
+        """
+
+        if self.effective_weight(on_date) < get_fraud_setting('FRAUD_AMOUNT_MIN_OBSERVATIONS'):
+            return False
+
+        z_score = self.z_score(amount)
+        if z_score is None:
+            return float(amount) > self.mean * float(get_fraud_setting('FRAUD_HIGH_AMOUNT_MULTIPLIER'))
+
+        return z_score > float(get_fraud_setting('FRAUD_AMOUNT_Z_SCORE'))
+
+
+class FraudSignals:
+    """Counters and amount statistics the fraud checks read for one claim"""
+
+    def __init__(self, duplicate_invoice: bool = False, same_day_claims: int = 0,
+                 provider_daily_claims: int = 0, amount_statistics: Optional[Dict] = None):
+        self.duplicate_invoice = duplicate_invoice
+        self.same_day_claims = same_day_claims
+        self.provider_daily_claims = provider_daily_claims
+        self.amount_statistics = amount_statistics or {}
+
+    def get_amount_statistics(self, scope: str, subject_id) -> AmountStatistics:
+        return self.amount_statistics.get((scope, subject_id)) or AmountStatistics()
+
+
+def load_amount_statistics(beneficiary_id, provider_id, service_ids: Iterable) -> Dict:
+    """Load the beneficiary, provider and service amount statistics for a claim in one query"""
+
+    records = ClaimAmountStatistics.objects.filter(
+        Q(scope=BENEFICIARY_SCOPE, subject_id=beneficiary_id) |
+        Q(scope=PROVIDER_SCOPE, subject_id=provider_id) |
+        Q(scope=SERVICE_SCOPE, subject_id__in=list(service_ids))
+    )
+
+    return {(record.scope, record.subject_id): AmountStatistics.from_record(record) for record in records}
+
+
+def load_fraud_signals(claim, service_ids: Iterable = ()) -> FraudSignals:
+    """
+    Load the fraud counters for a claim
+
+    One indexed lookup per signal, independent of how many claims the
+    beneficiary or provider has on file. Counters only hold approved and
+    paid claims, so the claim being adjudicated is never counted.
+    """
+
+    claim_date = claim.start_date
+
+    duplicate_invoice = ClaimInvoiceFingerprint.objects.filter(
+        fingerprint=invoice_fingerprint(claim.beneficiary_id, claim.provider_id, claim.invoice_number)
+    ).exclude(claim_id=claim.pk).exists()
+
+    same_day_claims = BeneficiaryProviderDailyClaims.objects.filter(
+        beneficiary_id=claim.beneficiary_id,
+        provider_id=claim.provider_id,
+        claim_date=claim_date
+    ).values_list('claim_count', flat=True).first() or 0
+
+    provider_daily_claims = ProviderDailyClaimVolume.objects.filter(
+        provider_id=claim.provider_id,
+        claim_date=claim_date
+    ).values_list('claim_count', flat=True).first() or 0
+
+    return FraudSignals(
+        duplicate_invoice=duplicate_invoice,
+        same_day_claims=same_day_claims,
+        provider_daily_claims=provider_daily_claims,
+        amount_statistics=load_amount_statistics(claim.beneficiary_id, claim.provider_id, service_ids)
+    )
+
+
+def _post_counters(beneficiary_id, provider_id, claim_date, amount: Decimal, claim_count: int) -> None:
+    """Apply a delta to the beneficiary/provider and provider daily counters"""
+
+    row, _ = BeneficiaryProviderDailyClaims.objects.get_or_create(
+        beneficiary_id=beneficiary_id,
+        provider_id=provider_id,
+        claim_date=claim_date
+    )
+    BeneficiaryProviderDailyClaims.objects.filter(pk=row.pk).update(
+        claim_count=F('claim_count') + claim_count,
+        claim_amount=F('claim_amount') + amount
+    )
+
+    row, _ = ProviderDailyClaimVolume.objects.get_or_create(
+        provider_id=provider_id,
+        claim_date=claim_date
+    )
+    ProviderDailyClaimVolume.objects.filter(pk=row.pk).update(
+        claim_count=F('claim_count') + claim_count
+    )
+
+
+def _post_amount_statistics(observations: List[Tuple]) -> None:
+    """
+    Apply (scope, subject, amount, date, sign) observations to the amount statistics
+
+    Runs in a transaction of its own. The rows are created if missing and
+    locked in (scope, subject) order, so two claims listing the same
+    services in a different order cannot deadlock, and are written back
+    in one update.
+    """
+
+    grouped = defaultdict(list)
+    for scope, subject_id, amount, on_date, sign in observations:
+        grouped[(scope, subject_id)].append((amount, on_date, sign))
+    if not grouped:
+        return
+
+    keys = sorted(grouped, key=lambda key: (key[0], str(key[1])))
+    lookup = Q()
+    for scope, subject_id in keys:
+        lookup |= Q(scope=scope, subject_id=subject_id)
+
+    with transaction.atomic():
+        ClaimAmountStatistics.objects.bulk_create(
+            [ClaimAmountStatistics(scope=scope, subject_id=subject_id) for scope, subject_id in keys],
+            ignore_conflicts=True
+        )
+        records = list(ClaimAmountStatistics.objects.select_for_update().filter(lookup).order_by('scope', 'subject_id'))
+
+        now = timezone.now()
+        for record in records:
+            statistics = AmountStatistics.from_record(record)
+            for amount, on_date, sign in grouped[(record.scope, record.subject_id)]:
+                statistics.add(amount, on_date, sign)
+
+            record.observations = statistics.observations
+            record.weight = statistics.weight
+            record.amount_sum = statistics.amount_sum
+            record.amount_square_sum = statistics.amount_square_sum
+            record.as_of = statistics.as_of
+            record.updated_at = now
+
+        ClaimAmountStatistics.objects.bulk_update(records, [
+            'observations', 'weight', 'amount_sum', 'amount_square_sum', 'as_of', 'updated_at'
+        ])
+
+
+def _post_amount_statistics_on_commit(observations: List[Tuple]) -> None:
+    """
+    Post amount statistics once the claim's transaction commits
+
+    The provider's and popular services' rows are shared by every worker,
+    so they are not held for the rest of an adjudication. The statistics
+    only feed the outlier heuristic; rebuild_amount_statistics recomputes
+    them should a posting be lost.
+    """
+
+    if observations:
+        transaction.on_commit(lambda: _post_amount_statistics(observations))
+
+
+def _claim_observations(beneficiary_id, provider_id, claim_date, lines: List[Tuple], sign: int) -> List[Tuple]:
+    """Observations a claim contributes: its total per beneficiary and provider, each line per service"""
+
+    total = sum((amount for _, amount in lines), Decimal('0.00'))
+    observations = [
+        (BENEFICIARY_SCOPE, beneficiary_id, total, claim_date, sign),
+        (PROVIDER_SCOPE, provider_id, total, claim_date, sign),
+    ]
+    observations.extend(
+        (SERVICE_SCOPE, service_id, amount, claim_date, sign) for service_id, amount in lines
+    )
+    return observations
+
+
+def _claimed_lines(claim_id) -> List[Tuple]:
+    return list(ClaimServiceLine.objects.filter(claim_id=claim_id).values_list('service_id', 'claimed_amount'))
+
+
+def _signal_key(beneficiary_id, provider_id, claim_date, invoice_number, amount, status, reversed_):
+    if status not in UTILIZED_STATUSES or reversed_:
+        return None
+    return beneficiary_id, provider_id, claim_date, invoice_number, amount or Decimal('0.00')
+
+
+def record_claim_fraud_signals(claim: Claim) -> None:
+    """
+    Post the change in a claim's fraud counters and invoice fingerprint
+
+    Like the utilization ledger, compares the claim with the values it was
+    loaded with and runs inside the caller's transaction. Amount statistics
+    are posted after it commits.
+    """
+
+    loaded = getattr(claim, '_loaded_values', None) or {}
+
+    previous = _signal_key(
+        loaded.get('beneficiary_id'), loaded.get('provider_id'), loaded.get('start_date'),
+        loaded.get('invoice_number'), loaded.get('adjudicated_amount'),
+        loaded.get('status'), loaded.get('reversed')
+    )
+    current = _signal_key(
+        claim.beneficiary_id, claim.provider_id, claim.start_date,
+        claim.invoice_number, claim.adjudicated_amount,
+        claim.status, claim.reversed
+    )
+
+    if previous == current:
+        return
+
+    # Amount statistics only move when the claim enters or leaves utilization, or is re-dated
+    observations = []
+    if (previous and previous[:3]) != (current and current[:3]):
+        lines = _claimed_lines(claim.pk)
+        if previous:
+            observations.extend(_claim_observations(*previous[:3], lines, -1))
+        if current:
+            observations.extend(_claim_observations(*current[:3], lines, 1))
+
+    _post_amount_statistics_on_commit(observations)
+
+    with transaction.atomic():
+        if previous:
+            beneficiary_id, provider_id, claim_date, _, amount = previous
+            _post_counters(beneficiary_id, provider_id, claim_date, -amount, -1)
+
+        if current:
+            beneficiary_id, provider_id, claim_date, invoice_number, amount = current
+            _post_counters(beneficiary_id, provider_id, claim_date, amount, 1)
+            ClaimInvoiceFingerprint.objects.update_or_create(
+                claim_id=claim.pk,
+                defaults={'fingerprint': invoice_fingerprint(beneficiary_id, provider_id, invoice_number)}
+            )
+        else:
+            ClaimInvoiceFingerprint.objects.filter(claim_id=claim.pk).delete()
+
+
+def remove_claim_fraud_signals(claim: Claim) -> None:
+    """Remove a deleted claim from the fraud counters (its fingerprint cascades)"""
+
+    loaded = getattr(claim, '_loaded_values', None) or {}
+    previous = _signal_key(
+        loaded.get('beneficiary_id'), loaded.get('provider_id'), loaded.get('start_date'),
+        loaded.get('invoice_number'), loaded.get('adjudicated_amount'),
+        loaded.get('status'), loaded.get('reversed')
+    )
+
+    if previous:
+        beneficiary_id, provider_id, claim_date, _, amount = previous
+        _post_counters(beneficiary_id, provider_id, claim_date, -amount, -1)
+        _post_amount_statistics_on_commit(
+            _claim_observations(beneficiary_id, provider_id, claim_date, _claimed_lines(claim.pk), -1)
+        )
+
+
+def rebuild_fraud_signals(provider_ids: Optional[Iterable] = None) -> Dict:
+    """
+    Rebuild the fraud counters and invoice fingerprints from claim history
+
+    Replaces the rows in scope (all providers by default) with values
+    recomputed from approved and paid claims.
+    """
+
+    claims = Claim.objects.filter(status__in=UTILIZED_STATUSES, reversed=False)
+    volume_rows = ProviderDailyClaimVolume.objects.all()
+    daily_rows = BeneficiaryProviderDailyClaims.objects.all()
+    fingerprint_rows = ClaimInvoiceFingerprint.objects.all()
+
+    if provider_ids is not None:
+        provider_ids = list(provider_ids)
+        claims = claims.filter(provider_id__in=provider_ids)
+        volume_rows = volume_rows.filter(provider_id__in=provider_ids)
+        daily_rows = daily_rows.filter(provider_id__in=provider_ids)
+        fingerprint_rows = fingerprint_rows.filter(claim__provider_id__in=provider_ids)
+
+    volume = [
+        ProviderDailyClaimVolume(
+            provider_id=row['provider_id'],
+            claim_date=row['start_date'],
+            claim_count=row['count']
+        )
+        for row in claims.values('provider_id', 'start_date').annotate(count=Count('id')).order_by()
+    ]
+
+    daily = [
+        BeneficiaryProviderDailyClaims(
+            beneficiary_id=row['beneficiary_id'],
+            provider_id=row['provider_id'],
+            claim_date=row['start_date'],
+            claim_count=row['count'],
+            claim_amount=row['amount'] or Decimal('0.00')
+        )
+        for row in claims.values('beneficiary_id', 'provider_id', 'start_date').annotate(
+            count=Count('id'),
+            amount=Sum('adjudicated_amount')
+        ).order_by()
+    ]
+
+    fingerprints = [
+        ClaimInvoiceFingerprint(
+            claim_id=claim_id,
+            fingerprint=invoice_fingerprint(beneficiary_id, provider_id, invoice_number)
+        )
+        for claim_id, beneficiary_id, provider_id, invoice_number in claims.values_list(
+            'id', 'beneficiary_id', 'provider_id', 'invoice_number'
+        ).iterator()
+    ]
+
+    with transaction.atomic():
+        volume_rows.delete()
+        daily_rows.delete()
+        fingerprint_rows.delete()
+        ProviderDailyClaimVolume.objects.bulk_create(volume, batch_size=1000)
+        BeneficiaryProviderDailyClaims.objects.bulk_create(daily, batch_size=1000)
+        ClaimInvoiceFingerprint.objects.bulk_create(fingerprints, batch_size=1000)
+
+    logger.info(
+        f"Rebuilt fraud signals: {len(volume)} provider days, {len(daily)} beneficiary days, "
+        f"{len(fingerprints)} fingerprints"
+    )
+
+    return {'provider_days': len(volume), 'beneficiary_days': len(daily), 'fingerprints': len(fingerprints)}
+
+
+def rebuild_amount_statistics() -> int:
+    """
+    Rebuild every claim amount statistics record from approved and paid claims
+
+    Streams claim lines in service date order and replays them through
+    AmountStatistics, so the result matches incremental posting.
+    """
+
+    claims = Claim.objects.filter(status__in=UTILIZED_STATUSES, reversed=False)
+    statistics = defaultdict(AmountStatistics)
+
+    def post(claim):
+        if claim is None:
+            return
+        _, beneficiary_id, provider_id, claim_date, lines = claim
+        for scope, subject_id, amount, on_date, sign in _claim_observations(
+            beneficiary_id, provider_id, claim_date, lines, 1
+        ):
+            statistics[(scope, subject_id)].add(amount, on_date, sign)
+
+    current = None
+    for claim_id, beneficiary_id, provider_id, claim_date, service_id, amount in ClaimServiceLine.objects.filter(
+        claim__in=claims
+    ).order_by('claim__start_date', 'claim_id').values_list(
+        'claim_id', 'claim__beneficiary_id', 'claim__provider_id', 'claim__start_date', 'service_id', 'claimed_amount'
+    ).iterator():
+        if current is None or current[0] != claim_id:
+            post(current)
+            current = (claim_id, beneficiary_id, provider_id, claim_date, [])
+        current[4].append((service_id, amount))
+    post(current)
+
+    records = [
+        ClaimAmountStatistics(
+            scope=scope,
+            subject_id=subject_id,
+            observations=values.observations,
+            weight=values.weight,
+            amount_sum=values.amount_sum,
+            amount_square_sum=values.amount_square_sum,
+            as_of=values.as_of
+        )
+        for (scope, subject_id), values in statistics.items()
+    ]
+
+    with transaction.atomic():
+        ClaimAmountStatistics.objects.all().delete()
+        ClaimAmountStatistics.objects.bulk_create(records, batch_size=1000)
+
+    logger.info(f"Rebuilt {len(records)} claim amount statistics records")
+
+    return len(records)
@@ -1,15 +1,15 @@
 import logging
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import transaction, models
+from django.db import transaction
 from django.utils import timezone
 
-from services.models import (
-    Claim, AdjudicationResult, AdjudicationMessage,
-    AdjudicationMessageCode, AdjudicationOverride
-)
+from services.functions.review_queue import get_high_value_threshold, take_review
+from services.functions.unit_of_work import AdjudicationUnitOfWork
+from services.models import Claim, AdjudicationResult, AdjudicationOverride
 
 logger = logging.getLogger(__name__)
 
@@ -29,9 +29,10 @@ class ManualAdjudicationEngine:
     - Track all manual interventions
     """
 
-    def __init__(self, claim: Claim, adjudicator: User):
+    def __init__(self, claim: Claim, adjudicator: User, unit_of_work: Optional[AdjudicationUnitOfWork] = None):
         self.claim = claim
         self.adjudicator = adjudicator
+        self.unit_of_work = unit_of_work or AdjudicationUnitOfWork()
         self.original_result = self._get_latest_adjudication_result()
         self.override_messages = []
 
@@ -68,6 +69,9 @@ class ManualAdjudicationEngine:
                 if not self._validate_adjudicator_permissions(review_data['decision']):
                     raise ValueError("Insufficient permissions for this action")
 
+                # Take the claim off the review queue (fails if another adjudicator holds it)
+                take_review(self.claim, self.adjudicator)
+
                 # Process the manual decision
                 if review_data['decision'] == 'approve':
                     return self._manual_approve(review_data)
@@ -92,7 +96,7 @@ class ManualAdjudicationEngine:
             return False
 
         # Check high-value claim permissions
-        if self.original_result and self.original_result.claimed_amount > Decimal('10000'):
+        if self.original_result and self.original_result.original_amount > get_high_value_threshold():
             if not self.adjudicator.has_perm('services.can_adjudicate_high_value'):
                 return False
 
@@ -102,7 +106,7 @@ class ManualAdjudicationEngine:
                 return False
 
         # Check override permissions for reversing auto-decisions
-        if self.original_result and self.original_result.processing_type == 'AUTO':
+        if self.original_result and self.original_result.processing_type == 'AUTOMATIC':
             if not self.adjudicator.has_perm('services.can_override_auto_adjudication'):
                 return False
 
@@ -115,7 +119,7 @@ class ManualAdjudicationEngine:
         if 'override_amount' in review_data and review_data['override_amount']:
             approved_amount = review_data['override_amount']
         elif self.original_result:
-            approved_amount = self.original_result.accepted_amount
+            approved_amount = self.claim.accepted_amount
         else:
             approved_amount = self.claim.claimed_amount
 
@@ -127,12 +131,11 @@ class ManualAdjudicationEngine:
             review_notes=review_data.get('review_notes', '')
         )
 
-        # Create new adjudication result
-        new_result = AdjudicationResult.objects.create(
+        # Queue new adjudication result
+        new_result = self.unit_of_work.add_result(AdjudicationResult(
             claim=self.claim,
             result='APPROVED',
-            claimed_amount=self.claim.claimed_amount,
-            accepted_amount=approved_amount,
+            original_amount=self.claim.claimed_amount,
             adjudicated_amount=approved_amount,
             processing_type='MANUAL',
             processed_by=self.adjudicator,
@@ -140,7 +143,7 @@ class ManualAdjudicationEngine:
             override_record=override,
             review_notes=review_data.get('review_notes', ''),
             requires_clinical_review=review_data.get('require_clinical_review', False)
-        )
+        ))
 
         # Handle payment method specifications
         payment_method = review_data.get('payment_method', 'full')
@@ -153,8 +156,6 @@ class ManualAdjudicationEngine:
                 new_result.adjudicated_amount = approved_amount - withheld_amount
                 new_result.withheld_amount = withheld_amount
 
-        new_result.save()
-
         # Add manual review messages
         self._add_override_messages(new_result, review_data)
 
@@ -164,7 +165,7 @@ class ManualAdjudicationEngine:
         self.claim.adjudicated_amount = new_result.adjudicated_amount
         self.claim.reviewed_by = self.adjudicator
         self.claim.review_date = timezone.now()
-        self.claim.save()
+        self.unit_of_work.save_claim(self.claim, ['status', 'accepted_amount', 'adjudicated_amount'])
 
         # Deactivate previous results
         self._deactivate_previous_results(new_result)
@@ -173,7 +174,9 @@ class ManualAdjudicationEngine:
         self._update_service_line_amounts(new_result)
 
         # Process financial transactions
-        self._process_approval_transactions(new_result)
+        self.unit_of_work.on_flush(lambda: self._post_member_transactions(new_result))
+
+        self.unit_of_work.flush()
 
         logger.info(f"Claim {self.claim.transaction_number} manually approved for ${approved_amount}")
 
@@ -190,12 +193,11 @@ class ManualAdjudicationEngine:
             review_notes=review_data.get('review_notes', '')
         )
 
-        # Create new adjudication result
-        new_result = AdjudicationResult.objects.create(
+        # Queue new adjudication result
+        new_result = self.unit_of_work.add_result(AdjudicationResult(
             claim=self.claim,
             result='DECLINED',
-            claimed_amount=self.claim.claimed_amount,
-            accepted_amount=Decimal('0.00'),
+            original_amount=self.claim.claimed_amount,
             adjudicated_amount=Decimal('0.00'),
             processing_type='MANUAL',
             processed_by=self.adjudicator,
@@ -203,7 +205,7 @@ class ManualAdjudicationEngine:
             override_record=override,
             decline_reason=review_data['override_reason'],
             review_notes=review_data.get('review_notes', '')
-        )
+        ))
 
         # Add decline messages
         self._add_decline_messages(new_result, review_data)
@@ -215,13 +217,15 @@ class ManualAdjudicationEngine:
         self.claim.reviewed_by = self.adjudicator
         self.claim.review_date = timezone.now()
         self.claim.decline_reason = review_data['override_reason']
-        self.claim.save()
+        self.unit_of_work.save_claim(self.claim, ['status', 'accepted_amount', 'adjudicated_amount'])
 
         # Deactivate previous results
         self._deactivate_previous_results(new_result)
 
         # Release any reserved funds
-        self._release_reserved_funds()
+        self.unit_of_work.on_flush(lambda: self._post_member_transactions(new_result))
+
+        self.unit_of_work.flush()
 
         logger.info(f"Claim {self.claim.transaction_number} manually declined: {review_data['override_reason']}")
 
@@ -253,12 +257,11 @@ class ManualAdjudicationEngine:
         # Determine final result status
         result_status = 'APPROVED' if new_amount > 0 else 'DECLINED'
 
-        # Create new adjudication result
-        new_result = AdjudicationResult.objects.create(
+        # Queue new adjudication result
+        new_result = self.unit_of_work.add_result(AdjudicationResult(
             claim=self.claim,
             result=result_status,
-            claimed_amount=self.claim.claimed_amount,
-            accepted_amount=new_amount,
+            original_amount=self.claim.claimed_amount,
             adjudicated_amount=new_amount,
             processing_type='MANUAL',
             processed_by=self.adjudicator,
@@ -266,12 +269,11 @@ class ManualAdjudicationEngine:
             override_record=override,
             review_notes=review_data.get('review_notes', ''),
             is_modified=True
-        )
+        ))
 
         # Handle additional conditions
         if 'additional_conditions' in review_data:
             new_result.additional_conditions = review_data['additional_conditions']
-            new_result.save()
 
         # Add modification messages
         self._add_modification_messages(new_result, review_data)
@@ -282,7 +284,7 @@ class ManualAdjudicationEngine:
         self.claim.adjudicated_amount = new_amount
         self.claim.reviewed_by = self.adjudicator
         self.claim.review_date = timezone.now()
-        self.claim.save()
+        self.unit_of_work.save_claim(self.claim, ['status', 'accepted_amount', 'adjudicated_amount'])
 
         # Deactivate previous results
         self._deactivate_previous_results(new_result)
@@ -290,11 +292,10 @@ class ManualAdjudicationEngine:
         # Update service line amounts
         self._update_service_line_amounts(new_result)
 
-        # Process financial transactions
-        if new_amount > 0:
-            self._process_approval_transactions(new_result)
-        else:
-            self._release_reserved_funds()
+        # Process financial transactions (a modification to zero only releases the reserve)
+        self.unit_of_work.on_flush(lambda: self._post_member_transactions(new_result))
+
+        self.unit_of_work.flush()
 
         logger.info(f"Claim {self.claim.transaction_number} manually modified to ${new_amount}")
 
@@ -315,12 +316,11 @@ class ManualAdjudicationEngine:
         self.claim.status = 'N'  # New status for re-processing
         self.claim.reviewed_by = self.adjudicator
         self.claim.review_date = timezone.now()
-        self.claim.save()
+        self.unit_of_work.save_claim(self.claim, ['status'])
 
         # Deactivate previous results
-        if self.original_result:
-            self.original_result.is_active = False
-            self.original_result.save()
+        self.unit_of_work.supersede_results(self.claim)
+        self.unit_of_work.flush()
 
         # Re-run automatic adjudication
         from .auto_adjudication import process_claim_adjudication
@@ -328,7 +328,7 @@ class ManualAdjudicationEngine:
 
         # Link to override record
         new_result.override_record = override
-        new_result.save()
+        AdjudicationResult.objects.filter(pk=new_result.pk).update(override_record=override)
 
         logger.info(f"Claim {self.claim.transaction_number} returned to auto-adjudication")
 
@@ -354,61 +354,43 @@ class ManualAdjudicationEngine:
         """Add messages for manual override"""
 
         # Add manual approval message
-        AdjudicationMessage.objects.create(
-            adjudication_result=result,
-            message_code=self._get_message_code('APPR002'),  # Manually Approved
-            custom_description=f"Manually approved by {self.adjudicator.get_full_name()}"
+        self.unit_of_work.add_message(
+            result, 'APPR002',  # Manually Approved
+            f"Manually approved by {self.adjudicator.get_full_name()}"
         )
 
         # Add override reason
         if review_data.get('override_reason'):
-            AdjudicationMessage.objects.create(
-                adjudication_result=result,
-                message_code=self._get_message_code('REVW002'),  # Manual Review
-                custom_description=f"Override reason: {review_data['override_reason']}"
+            self.unit_of_work.add_message(
+                result, 'REVW002',  # Manual Review
+                f"Override reason: {review_data['override_reason']}"
             )
 
         # Add any custom message codes
         if 'message_codes' in review_data:
             for code in review_data['message_codes']:
-                message_code_obj = self._get_message_code(code)
-                if message_code_obj:
-                    AdjudicationMessage.objects.create(
-                        adjudication_result=result,
-                        message_code=message_code_obj
-                    )
+                self.unit_of_work.add_message(result, code)
 
     def _add_decline_messages(self, result: AdjudicationResult, review_data: Dict) -> None:
         """Add messages for manual decline"""
 
-        AdjudicationMessage.objects.create(
-            adjudication_result=result,
-            message_code=self._get_message_code('DECL003'),  # Incomplete Information
-            custom_description=f"Manually declined: {review_data['override_reason']}"
+        self.unit_of_work.add_message(
+            result, 'DECL003',  # Incomplete Information
+            f"Manually declined: {review_data['override_reason']}"
         )
 
     def _add_modification_messages(self, result: AdjudicationResult, review_data: Dict) -> None:
         """Add messages for manual modification"""
 
-        AdjudicationMessage.objects.create(
-            adjudication_result=result,
-            message_code=self._get_message_code('REVW002'),  # Manual Review
-            custom_description=f"Amount modified to ${review_data['override_amount']} - {review_data['override_reason']}"
+        self.unit_of_work.add_message(
+            result, 'REVW002',  # Manual Review
+            f"Amount modified to ${review_data['override_amount']} - {review_data['override_reason']}"
         )
 
-    def _get_message_code(self, code: str) -> Optional[AdjudicationMessageCode]:
-        """Get message code object"""
-        try:
-            return AdjudicationMessageCode.objects.get(code=code)
-        except AdjudicationMessageCode.DoesNotExist:
-            return None
-
     def _deactivate_previous_results(self, new_result: AdjudicationResult) -> None:
         """Deactivate previous adjudication results"""
 
-        self.claim.adjudication_results.exclude(
-            id=new_result.id
-        ).update(is_active=False)
+        self.unit_of_work.supersede_results(self.claim)
 
     def _update_service_line_amounts(self, result: AdjudicationResult) -> None:
         """Update service line amounts proportionally"""
@@ -418,176 +400,415 @@ class ManualAdjudicationEngine:
 
         adjustment_ratio = result.adjudicated_amount / self.claim.claimed_amount
 
-        for service_line in self.claim.services.all():
+        service_lines = list(self.claim.services.all())
+        for service_line in service_lines:
             service_line.accepted_amount = service_line.claimed_amount
             service_line.adjudicated_amount = service_line.claimed_amount * adjustment_ratio
-            service_line.save()
 
-    def _process_approval_transactions(self, result: AdjudicationResult) -> None:
-        """Process financial transactions for approved claims"""
+        self.unit_of_work.update_service_lines(service_lines, ['accepted_amount', 'adjudicated_amount'])
+
+    def _post_member_transactions(self, result: AdjudicationResult) -> None:
+        """Release the claim's reserves and reserve the amount if approved"""
 
         try:
-            from accounting.models import MemberAccount, MemberTransaction
+            post_review_transactions([(self.claim, result)], timezone.now())
 
-            account = self.claim.beneficiary.member.accounts.filter(
-                currency=self.claim.beneficiary.member.currency
-            ).first()
+        except Exception as e:
+            logger.error(f"Failed to post member transactions: {str(e)}")
 
-            if not account:
-                logger.error(f"No account found for member {self.claim.beneficiary.member.membership_number}")
-                return
 
-            # Release any existing reservations
-            existing_reserves = account.transactions.filter(
-                claim=self.claim,
-                transaction_type='R',
-                status='C'
-            )
+# Member account postings of manual reviews
+def post_review_transactions(decided: List[Tuple[Claim, AdjudicationResult]], now) -> None:
+    """
+    Release reviewed claims' reserves and reserve the approved amounts
 
-            for reserve in existing_reserves:
-                # Create unreserve transaction
-                MemberTransaction.objects.create(
-                    account=account,
-                    transaction_type='U',  # Unreserve
-                    amount_credited=reserve.amount_debited,
-                    balance=account.balance,
-                    available_balance=account.available_balance + reserve.amount_debited,
-                    description=f'Release reserve for claim override: {self.claim.transaction_number}',
-                    reference=f'OVERRIDE-{self.claim.transaction_number}',
-                    claim=self.claim,
-                    status='C'
-                )
-
-                # Update account balances
-                account.available_balance += reserve.amount_debited
-                account.reserved_balance -= reserve.amount_debited
-
-            # Create new reservation for final amount
-            if result.adjudicated_amount > 0:
-                MemberTransaction.objects.create(
-                    account=account,
-                    transaction_type='R',  # Reserve
-                    amount_debited=result.adjudicated_amount,
-                    balance=account.balance,
-                    available_balance=account.available_balance - result.adjudicated_amount,
-                    description=f'Reserve for manually approved claim: {self.claim.transaction_number}',
-                    reference=f'MANUAL-{self.claim.transaction_number}',
-                    claim=self.claim,
-                    status='C'
-                )
-
-                # Update account balances
-                account.available_balance -= result.adjudicated_amount
-                account.reserved_balance += result.adjudicated_amount
-
-            account.save()
+    Used for single and bulk reviews alike. The member accounts are locked
+    and read in one query, the transactions bulk-inserted with numbers drawn
+    from the member transaction sequence in one call, and the balances
+    written back in one update. Bulk writes skip the model signals, so the
+    members' cached eligibility is dropped here.
+    """
 
-        except Exception as e:
-            logger.error(f"Failed to process approval transactions: {str(e)}")
+    from sequences import Sequence
+    from accounting.models import MemberAccount, MemberTransaction
+    from services.functions.eligibility import invalidate_member_eligibility
 
-    def _release_reserved_funds(self) -> None:
-        """Release any reserved funds for declined claims"""
+    if not decided:
+        return
 
-        try:
-            from accounting.models import MemberAccount, MemberTransaction
+    member_ids = {claim.beneficiary.member_id for claim, _ in decided}
+    accounts = {
+        (account.member_id, account.currency_id): account
+        for account in MemberAccount.objects.select_for_update().filter(member_id__in=member_ids).order_by('pk')
+    }
 
-            account = self.claim.beneficiary.member.accounts.filter(
-                currency=self.claim.beneficiary.member.currency
-            ).first()
+    reserves = {}
+    for reserve in MemberTransaction.objects.filter(
+        claim_id__in=[claim.id for claim, _ in decided], transaction_type='R', status='C'
+    ).only('account_id', 'claim_id', 'amount_debited'):
+        reserves.setdefault((reserve.account_id, reserve.claim_id), []).append(reserve)
+
+    transactions, touched = [], {}
+    for claim, result in decided:
+        member = claim.beneficiary.member
+        account = accounts.get((member.id, member.currency_id))
+        if account is None:
+            logger.error(f"No account found for member {member.membership_number}")
+            continue
+        touched[account.pk] = account
+
+        approved = result.result == 'APPROVED'
+        for reserve in reserves.get((account.pk, claim.id), []):
+            account.available_balance += reserve.amount_debited
+            account.reserved_balance -= reserve.amount_debited
+            transactions.append(MemberTransaction(
+                account=account,
+                transaction_type='U',  # Unreserve
+                amount_credited=reserve.amount_debited,
+                balance=account.balance,
+                available_balance=account.available_balance,
+                description=(
+                    f"Release reserve for {'claim override' if approved else 'declined claim'}: "
+                    f"{claim.transaction_number}"
+                ),
+                reference=f"{'OVERRIDE' if approved else 'DECLINE'}-{claim.transaction_number}",
+                claim=claim,
+                status='C',
+                processed_at=now
+            ))
+
+        if approved and result.adjudicated_amount > 0:
+            account.available_balance -= result.adjudicated_amount
+            account.reserved_balance += result.adjudicated_amount
+            transactions.append(MemberTransaction(
+                account=account,
+                transaction_type='R',  # Reserve
+                amount_debited=result.adjudicated_amount,
+                balance=account.balance,
+                available_balance=account.available_balance,
+                description=f'Reserve for manually approved claim: {claim.transaction_number}',
+                reference=f'MANUAL-{claim.transaction_number}',
+                claim=claim,
+                status='C',
+                processed_at=now
+            ))
+
+    if transactions:
+        date_str = now.strftime("%y%m%d")
+        numbers = Sequence(f"member_transaction_{date_str}").get_next_values(len(transactions))
+        for member_transaction, sequence_number in zip(transactions, numbers):
+            member_transaction.transaction_number = f"MT{date_str}{sequence_number:06d}"
+        MemberTransaction.objects.bulk_create(transactions)
+
+    if touched:
+        for account in touched.values():
+            account.updated_at = now
+        MemberAccount.objects.bulk_update(
+            list(touched.values()), ['available_balance', 'reserved_balance', 'updated_at']
+        )
 
-            if not account:
-                return
+    for member_id in {account.member_id for account in touched.values()}:
+        invalidate_member_eligibility(member_id)
 
-            # Find and release reservations
-            existing_reserves = account.transactions.filter(
-                claim=self.claim,
-                transaction_type='R',
-                status='C'
-            )
 
-            for reserve in existing_reserves:
-                # Create unreserve transaction
-                MemberTransaction.objects.create(
-                    account=account,
-                    transaction_type='U',  # Unreserve
-                    amount_credited=reserve.amount_debited,
-                    balance=account.balance,
-                    available_balance=account.available_balance + reserve.amount_debited,
-                    description=f'Release reserve for declined claim: {self.claim.transaction_number}',
-                    reference=f'DECLINE-{self.claim.transaction_number}',
-                    claim=self.claim,
-                    status='C'
-                )
-
-                # Update account balances
-                account.available_balance += reserve.amount_debited
-                account.reserved_balance -= reserve.amount_debited
-
-            account.save()
+# Bulk manual adjudication functions
+DEFAULT_BULK_REVIEW_CHUNK_SIZE = 500
 
-        except Exception as e:
-            logger.error(f"Failed to release reserved funds: {str(e)}")
 
+def get_bulk_review_chunk_size() -> int:
+    return getattr(settings, 'FISCO_HUB_SUITE_SETTINGS', {}).get(
+        'BULK_REVIEW_CHUNK_SIZE', DEFAULT_BULK_REVIEW_CHUNK_SIZE
+    )
 
-# Bulk manual adjudication functions
-def process_bulk_manual_review(claim_ids: List[int], review_data: Dict, adjudicator: User) -> Dict:
+
+def bulk_review_permission_error(original_result: Optional[AdjudicationResult], permissions: Dict,
+                                 high_value_threshold: Decimal) -> Optional[str]:
     """
-    Process multiple claims for manual review
+    Why an adjudicator may not decide a claim, or None when they may
 
-    Args:
-        claim_ids: List of claim IDs to review
-        review_data: Common review parameters to apply to all claims
-        adjudicator: User performing the review
+    permissions holds the adjudicator's 'high_value' and 'override_auto'
+    permissions, checked once for the whole selection. Mirrors the per-claim
+    checks of ManualAdjudicationEngine.
     """
 
-    results = {
-        'total_processed': 0,
-        'approved': 0,
-        'declined': 0,
-        'modified': 0,
-        'errors': 0,
-        'details': []
-    }
+    if original_result is None:
+        return None
+    if original_result.original_amount > high_value_threshold and not permissions['high_value']:
+        return "Insufficient permissions for this action"
+    if original_result.processing_type == 'AUTOMATIC' and not permissions['override_auto']:
+        return "Insufficient permissions for this action"
+    return None
 
-    claims = Claim.objects.filter(id__in=claim_ids)
 
-    for claim in claims:
-        try:
-            engine = ManualAdjudicationEngine(claim, adjudicator)
-            result = engine.review_claim(review_data)
+class BulkManualReview:
+    """
+    Applies one manual decision to many claims, a chunk at a time
+
+    Permissions are checked once for the selection. For each chunk the
+    claims, their latest active results, service lines, reserves and member
+    accounts are read in a handful of queries, and the overrides, results,
+    messages and member transactions are bulk-inserted in one transaction.
+    A claim the adjudicator may not decide is reported as an error and
+    skipped; a failed write rolls back its whole chunk only. Returning claims
+    to auto-adjudication re-runs the engine, so it still goes claim by claim.
+    """
 
-            results['total_processed'] += 1
+    def __init__(self, review_data: Dict, adjudicator: User, chunk_size: Optional[int] = None):
+        if review_data['decision'] not in ('approve', 'decline', 'modify', 'return_to_auto'):
+            raise ValueError(f"Invalid decision: {review_data['decision']}")
+        if review_data['decision'] == 'modify' and 'override_amount' not in review_data:
+            raise ValueError("Override amount required for modification")
+        if not adjudicator.has_perm('services.can_adjudicate_claims'):
+            raise ValueError("Insufficient permissions for this action")
 
-            if result.result == 'APPROVED':
-                if result.is_modified:
-                    results['modified'] += 1
+        self.review_data = review_data
+        self.adjudicator = adjudicator
+        self.chunk_size = chunk_size or get_bulk_review_chunk_size()
+        self.permissions = {
+            'high_value': adjudicator.has_perm('services.can_adjudicate_high_value'),
+            'override_auto': adjudicator.has_perm('services.can_override_auto_adjudication'),
+        }
+        self.high_value_threshold = get_high_value_threshold()
+
+    def run(self, claim_ids: List) -> Dict:
+        results = {
+            'total_processed': 0,
+            'approved': 0,
+            'declined': 0,
+            'modified': 0,
+            'errors': 0,
+            'details': []
+        }
+
+        claim_ids = list(claim_ids)
+        for start in range(0, len(claim_ids), self.chunk_size):
+            chunk = claim_ids[start:start + self.chunk_size]
+            try:
+                if self.review_data['decision'] == 'return_to_auto':
+                    details = self._return_chunk_to_auto(chunk)
                 else:
-                    results['approved'] += 1
-            elif result.result == 'DECLINED':
-                results['declined'] += 1
+                    details = self._review_chunk(chunk)
+            except Exception as e:
+                details = [
+                    {'claim_id': claim_id, 'transaction_number': transaction_number, 'result': 'ERROR', 'error': str(e)}
+                    for claim_id, transaction_number in Claim.objects.filter(
+                        id__in=chunk
+                    ).values_list('id', 'transaction_number')
+                ]
+                logger.error(f"Bulk manual review error for a chunk of {len(chunk)} claims: {str(e)}")
+
+            for detail in details:
+                if detail['result'] == 'ERROR':
+                    results['errors'] += 1
+                    continue
+
+                results['total_processed'] += 1
+                if detail['result'] == 'APPROVED':
+                    results['modified' if self.review_data['decision'] == 'modify' else 'approved'] += 1
+                elif detail['result'] == 'DECLINED':
+                    results['declined'] += 1
+            results['details'].extend(details)
+
+        logger.info(
+            f"Bulk manual review completed by {self.adjudicator.username}: {results['total_processed']} processed, "
+            f"{results['errors']} errors"
+        )
+
+        return results
+
+    def _error(self, claim: Claim, error: str) -> Dict:
+        logger.error(f"Bulk manual review error for claim {claim.id}: {error}")
+        return {'claim_id': claim.id, 'transaction_number': claim.transaction_number, 'result': 'ERROR', 'error': error}
 
-            results['details'].append({
+    def _return_chunk_to_auto(self, claim_ids: List) -> List[Dict]:
+        details = []
+        for claim in Claim.objects.filter(id__in=claim_ids):
+            try:
+                result = ManualAdjudicationEngine(claim, self.adjudicator).review_claim(self.review_data)
+            except Exception as e:
+                details.append(self._error(claim, str(e)))
+                continue
+
+            details.append({
                 'claim_id': claim.id,
                 'transaction_number': claim.transaction_number,
                 'result': result.result,
                 'amount': float(result.adjudicated_amount),
-                'override_reason': review_data.get('override_reason', '')
+                'override_reason': self.review_data.get('override_reason', ''),
             })
+        return details
 
-        except Exception as e:
-            results['errors'] += 1
-            results['details'].append({
-                'claim_id': claim.id,
-                'transaction_number': claim.transaction_number,
-                'result': 'ERROR',
-                'error': str(e)
-            })
+    def _review_chunk(self, claim_ids: List) -> List[Dict]:
+        from services.functions.review_queue import take_reviews
+
+        details = []
+        now = timezone.now()
+        unit_of_work = AdjudicationUnitOfWork()
+
+        with transaction.atomic():
+            claims = list(
+                Claim.objects.filter(id__in=claim_ids).select_related(
+                    'beneficiary__member'
+                ).prefetch_related('services')
+            )
+
+            latest_results = {}
+            for result in AdjudicationResult.objects.filter(
+                claim_id__in=claim_ids, is_active=True
+            ).order_by('claim_id', '-created_at'):
+                latest_results.setdefault(result.claim_id, result)
+
+            errors = {}
+            for claim in claims:
+                error = bulk_review_permission_error(
+                    latest_results.get(claim.id), self.permissions, self.high_value_threshold
+                ) or self._amount_error(claim)
+                if error:
+                    errors[claim.id] = error
+
+            # Claims the adjudicator may not decide stay on the review queue
+            held_by_others = take_reviews([claim.id for claim in claims if claim.id not in errors], self.adjudicator)
+
+            overrides, decided = [], []
+            for claim in claims:
+                error = errors.get(claim.id)
+                if error is None and claim.id in held_by_others:
+                    error = f"Claim {claim.transaction_number} is being reviewed by another adjudicator"
+                if error:
+                    details.append(self._error(claim, error))
+                    continue
+
+                override, result = self._decide(claim, latest_results.get(claim.id), unit_of_work, now)
+                overrides.append(override)
+                decided.append((claim, result))
+
+                details.append({
+                    'claim_id': claim.id,
+                    'transaction_number': claim.transaction_number,
+                    'result': result.result,
+                    'amount': float(result.adjudicated_amount),
+                    'override_reason': self.review_data.get('override_reason', ''),
+                })
+
+            AdjudicationOverride.objects.bulk_create(overrides)
+            unit_of_work.flush()
+            post_review_transactions(decided, now)
+
+        return details
+
+    def _amount_error(self, claim: Claim) -> Optional[str]:
+        if self.review_data['decision'] != 'modify':
+            return None
+        if self.review_data['override_amount'] > claim.claimed_amount:
+            return "Override amount cannot exceed claimed amount"
+        if self.review_data['override_amount'] < 0:
+            return "Override amount cannot be negative"
+        return None
+
+    def _decide(self, claim: Claim, original_result: Optional[AdjudicationResult],
+                unit_of_work: AdjudicationUnitOfWork, now) -> Tuple[AdjudicationOverride, AdjudicationResult]:
+        """Build the override and queue the new result, messages and claim changes for one claim"""
+
+        review_data = self.review_data
+        decision = review_data['decision']
+
+        if decision == 'approve':
+            if review_data.get('override_amount'):
+                amount = review_data['override_amount']
+            elif original_result:
+                amount = claim.accepted_amount
+            else:
+                amount = claim.claimed_amount
+            new_decision, result_status = 'APPROVED', 'APPROVED'
+        elif decision == 'decline':
+            amount = Decimal('0.00')
+            new_decision, result_status = 'DECLINED', 'DECLINED'
+        else:
+            amount = review_data['override_amount']
+            new_decision, result_status = 'MODIFIED', 'APPROVED' if amount > 0 else 'DECLINED'
+
+        override = AdjudicationOverride(
+            claim=claim,
+            adjudicator=self.adjudicator,
+            original_result=original_result.result if original_result else None,
+            original_amount=original_result.adjudicated_amount if original_result else Decimal('0.00'),
+            new_decision=new_decision,
+            new_amount=amount,
+            override_reason=review_data['override_reason'],
+            review_notes=review_data.get('review_notes', ''),
+            override_timestamp=now
+        )
+
+        result = unit_of_work.add_result(AdjudicationResult(
+            claim=claim,
+            result=result_status,
+            original_amount=claim.claimed_amount,
+            adjudicated_amount=amount,
+            processing_type='MANUAL',
+            processed_by=self.adjudicator,
+            processed_at=now,
+            override_record=override,
+            review_notes=review_data.get('review_notes', ''),
+            decline_reason=review_data['override_reason'] if decision == 'decline' else None,
+            requires_clinical_review=decision == 'approve' and review_data.get('require_clinical_review', False),
+            is_modified=decision == 'modify',
+        ))
+
+        if decision == 'approve':
+            payment_method = review_data.get('payment_method', 'full')
+            if payment_method == 'partial':
+                result.partial_payment = True
+            elif payment_method == 'withheld':
+                withholding_pct = review_data.get('withholding_percentage', 0)
+                if withholding_pct > 0:
+                    result.withheld_amount = (amount * withholding_pct) / 100
+                    result.adjudicated_amount = amount - result.withheld_amount
+
+            unit_of_work.add_message(result, 'APPR002', f"Manually approved by {self.adjudicator.get_full_name()}")
+            if review_data.get('override_reason'):
+                unit_of_work.add_message(result, 'REVW002', f"Override reason: {review_data['override_reason']}")
+            for code in review_data.get('message_codes', []):
+                unit_of_work.add_message(result, code)
+        elif decision == 'decline':
+            unit_of_work.add_message(result, 'DECL003', f"Manually declined: {review_data['override_reason']}")
+        else:
+            if 'additional_conditions' in review_data:
+                result.additional_conditions = review_data['additional_conditions']
+            unit_of_work.add_message(
+                result, 'REVW002',
+                f"Amount modified to ${review_data['override_amount']} - {review_data['override_reason']}"
+            )
 
-            logger.error(f"Bulk manual review error for claim {claim.id}: {str(e)}")
+        claim.status = 'A' if result_status == 'APPROVED' else 'D'
+        claim.accepted_amount = amount
+        claim.adjudicated_amount = result.adjudicated_amount
+        unit_of_work.save_claim(claim, ['status', 'accepted_amount', 'adjudicated_amount'])
+        unit_of_work.supersede_results(claim)
 
-    logger.info(f"Bulk manual review completed by {adjudicator.username}: {results}")
+        if decision != 'decline' and claim.claimed_amount:
+            ratio = result.adjudicated_amount / claim.claimed_amount
+            service_lines = list(claim.services.all())
+            for service_line in service_lines:
+                service_line.accepted_amount = service_line.claimed_amount
+                service_line.adjudicated_amount = service_line.claimed_amount * ratio
+            unit_of_work.update_service_lines(service_lines, ['accepted_amount', 'adjudicated_amount'])
 
-    return results
+        return override, result
+
+
+def process_bulk_manual_review(claim_ids: List[int], review_data: Dict, adjudicator: User,
+                               chunk_size: Optional[int] = None) -> Dict:
+    """
+    Process multiple claims for manual review
+
+    Args:
+        claim_ids: List of claim IDs to review
+        review_data: Common review parameters to apply to all claims
+        adjudicator: User performing the review
+        chunk_size: Claims decided per transaction (default BULK_REVIEW_CHUNK_SIZE)
+    """
+
+    return BulkManualReview(review_data, adjudicator, chunk_size).run(claim_ids)
 
 
 # Quality assurance functions
@@ -595,55 +816,14 @@ def validate_adjudication_quality(adjudicator: User, days: int = 30) -> Dict:
     """
     Validate quality of adjudicator's decisions over specified period
 
+    Reads the daily metrics rollup (see rollup_adjudicator_metrics), so the
+    figures are as of its last scheduled run.
+
     Args:
         adjudicator: The adjudicator to evaluate
         days: Number of days to look back
     """
 
-    from datetime import timedelta
-
-    start_date = timezone.now() - timedelta(days=days)
-
-    # Get adjudicator's recent decisions
-    recent_results = AdjudicationResult.objects.filter(
-        processed_by=adjudicator,
-        processed_at__gte=start_date,
-        processing_type='MANUAL'
-    )
-
-    total_decisions = recent_results.count()
-
-    if total_decisions == 0:
-        return {'message': 'No recent decisions found'}
-
-    # Calculate metrics
-    approved = recent_results.filter(result='APPROVED').count()
-    declined = recent_results.filter(result='DECLINED').count()
-    modified = recent_results.filter(is_modified=True).count()
-
-    # Calculate financial impact
-    total_claimed = recent_results.aggregate(
-        total=models.Sum('claimed_amount')
-    )['total'] or Decimal('0')
-
-    total_adjudicated = recent_results.aggregate(
-        total=models.Sum('adjudicated_amount')
-    )['total'] or Decimal('0')
-
-    # Calculate average processing time (if tracked)
-    # This would require additional timestamp fields
-
-    quality_metrics = {
-        'period_days': days,
-        'total_decisions': total_decisions,
-        'approval_rate': (approved / total_decisions) * 100,
-        'decline_rate': (declined / total_decisions) * 100,
-        'modification_rate': (modified / total_decisions) * 100,
-        'total_claimed_amount': float(total_claimed),
-        'total_adjudicated_amount': float(total_adjudicated),
-        'savings_percentage': float(
-            (total_claimed - total_adjudicated) / total_claimed * 100) if total_claimed > 0 else 0,
-        'average_claim_value': float(total_adjudicated / total_decisions) if total_decisions > 0 else 0
-    }
+    from services.functions.adjudicator_metrics import get_adjudicator_quality
 
-    return quality_metrics
+    return get_adjudicator_quality(adjudicator, days)
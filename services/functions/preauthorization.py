@@ -0,0 +1,255 @@
+import logging
+import threading
+import time
+from collections import deque
+from decimal import Decimal
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from services.functions.adjudication_context import (
+    AdjudicationContext, AdjudicationReferenceData, load_service_request_context
+)
+from services.functions.auto_adjudication import ClaimAdjudicationEngine
+from services.functions.rule_cache import CompiledRule, get_compiled_rules
+from services.functions.unit_of_work import AdjudicationUnitOfWork
+from services.models import AdjudicationResult, ServiceRequest
+
+logger = logging.getLogger(__name__)
+
+AUTHORIZATION_CODE_SEQUENCE = 'authorization_code'
+DEFAULT_AUTHORIZATION_CODE_BLOCK_SIZE = 100
+DEFAULT_REFERENCE_TTL_SECONDS = 60
+
+
+def _get_setting(name: str, default):
+    return getattr(settings, 'FISCO_HUB_SUITE_SETTINGS', {}).get(name, default)
+
+
+def format_authorization_code(value: int) -> str:
+    return f"AUTH{value:06d}"
+
+
+class AuthorizationCodeAllocator:
+    """
+    Hands out authorization codes from blocks reserved on the shared sequence
+
+    A block of values is taken from the authorization code sequence in one
+    call and handed out locally, so issuing a code usually needs no query.
+    Codes stay unique across processes because every block comes from the
+    same sequence ServiceRequest.save draws on. A block reserved inside a
+    transaction is only kept once that transaction commits: if it rolls
+    back, the sequence rolls back with it and the values will be reissued.
+    """
+
+    def __init__(self, sequence_name: str = AUTHORIZATION_CODE_SEQUENCE, block_size: Optional[int] = None):
+        self.sequence_name = sequence_name
+        self.block_size = block_size or _get_setting(
+            'AUTHORIZATION_CODE_BLOCK_SIZE', DEFAULT_AUTHORIZATION_CODE_BLOCK_SIZE
+        )
+        self._values = deque()
+        self._lock = threading.Lock()
+
+    def _reserve_block(self) -> List[int]:
+        from sequences import Sequence
+
+        return list(Sequence(self.sequence_name).get_next_values(self.block_size))
+
+    def _keep(self, values: List[int]) -> None:
+        with self._lock:
+            self._values.extend(values)
+
+    def next_code(self) -> str:
+        with self._lock:
+            if self._values:
+                return format_authorization_code(self._values.popleft())
+
+        value, *rest = self._reserve_block()
+        if connection.in_atomic_block:
+            transaction.on_commit(lambda: self._keep(rest))
+        else:
+            self._keep(rest)
+
+        return format_authorization_code(value)
+
+
+_code_allocator: Optional[AuthorizationCodeAllocator] = None
+_reference: Optional[AdjudicationReferenceData] = None
+_reference_loaded_at = 0.0
+_module_lock = threading.Lock()
+
+
+def get_authorization_code_allocator() -> AuthorizationCodeAllocator:
+    global _code_allocator
+
+    if _code_allocator is None:
+        with _module_lock:
+            if _code_allocator is None:
+                _code_allocator = AuthorizationCodeAllocator()
+    return _code_allocator
+
+
+def get_preauthorization_reference() -> AdjudicationReferenceData:
+    """
+    Provider and package data shared by pre-authorizations in this process
+
+    Reloaded after PREAUTHORIZATION_REFERENCE_TTL seconds, so provider
+    status and document changes reach the front desk within that time.
+    """
+
+    global _reference, _reference_loaded_at
+
+    ttl = _get_setting('PREAUTHORIZATION_REFERENCE_TTL', DEFAULT_REFERENCE_TTL_SECONDS)
+    now = time.monotonic()
+    if _reference is None or now - _reference_loaded_at > ttl:
+        with _module_lock:
+            if _reference is None or now - _reference_loaded_at > ttl:
+                _reference = AdjudicationReferenceData()
+                _reference_loaded_at = now
+    return _reference
+
+
+class PreAuthorizationEngine(ClaimAdjudicationEngine):
+    """
+    Pre-authorization of service requests at the front desk
+
+    Runs the claim engine's eligibility, coverage, provider and service
+    request rule checks on the request's snapshot (items stand in for claim
+    lines), using the shared compiled rule cache. Fraud and account balance
+    checks are left to the claim. Approved requests get an authorization
+    code from the pre-allocated block.
+    """
+
+    def __init__(self, service_request: ServiceRequest, context: Optional[AdjudicationContext] = None,
+                 unit_of_work: Optional[AdjudicationUnitOfWork] = None):
+        super().__init__(
+            service_request,
+            context=context or load_service_request_context(service_request),
+            defer_financials=True,
+            unit_of_work=unit_of_work
+        )
+        self.service_request = service_request
+
+    def process_adjudication(self) -> AdjudicationResult:
+        """Main pre-authorization process"""
+
+        logger.info(f"Starting pre-authorization for service request {self.service_request.request_number}")
+
+        try:
+            with self.trace.capture():
+                self._step(self._calculate_claim_totals)
+
+                if not self.context.service_lines:
+                    self._add_message('SERV001', 'No services found on service request')
+                    return self._create_adjudication_result('DECLINED')
+
+                if not self._step(self._check_beneficiary_eligibility):
+                    return self._create_adjudication_result('DECLINED')
+
+                if not self._step(self._validate_service_coverage):
+                    return self._create_adjudication_result('DECLINED')
+
+                if not self._step(self._check_provider_compliance):
+                    return self._create_adjudication_result('PENDING_REVIEW')
+
+                adjudication_result = self._step(self._apply_business_rules)
+                if adjudication_result:
+                    return adjudication_result
+
+                return self._create_adjudication_result('APPROVED')
+
+        except Exception as e:
+            logger.error(f"Pre-authorization error for service request {self.service_request.request_number}: {str(e)}")
+            self.unit_of_work.clear()
+            self._add_message('REVW001', f"System error during pre-authorization: {str(e)}")
+            return self._create_adjudication_result('PENDING_REVIEW')
+
+    def _candidate_rules(self) -> List[CompiledRule]:
+        return get_compiled_rules().candidate_rules(
+            timezone.now().date(),
+            service_ids=self.context.service_ids,
+            service_provider_type_ids=self.context.service_provider_type_ids,
+            provider_tier_id=self.provider.tier_id,
+            rule_type='SR'
+        )
+
+    def _has_referral(self) -> bool:
+        return bool(self.service_request.referring_provider_id)
+
+    def _create_adjudication_result(self, result: str) -> AdjudicationResult:
+        """Write the pre-authorization result and update the service request"""
+
+        if result == 'APPROVED':
+            self.total_adjudicated = self.net_payable
+        elif result == 'DECLINED':
+            self.total_adjudicated = self.total_accepted = Decimal('0.00')
+
+        service_request = self.service_request
+
+        adjudication_result = self.unit_of_work.add_result(AdjudicationResult(
+            service_request=service_request,
+            result=result,
+            original_amount=self.total_claimed,
+            adjudicated_amount=self.total_adjudicated,
+            co_payment_amount=self.co_payment_amount,
+            processing_type='AUTOMATIC',
+            processed_at=timezone.now(),
+            decline_reason=self.decline_reason,
+            trace=self.trace.as_dict()
+        ))
+        self.unit_of_work.add_messages(adjudication_result, self.messages)
+
+        fields = ['status']
+        if result == 'APPROVED':
+            service_request.status = 'A'
+            service_request.approved_amount = self.total_adjudicated
+            service_request.approval_date = timezone.now()
+            service_request.authorization_code = get_authorization_code_allocator().next_code()
+            # remaining_amount and expiry_date are derived in ServiceRequest.save
+            fields += ['approved_amount', 'approval_date', 'authorization_code', 'remaining_amount', 'expiry_date']
+        elif result == 'DECLINED':
+            service_request.status = 'D'
+            service_request.decline_reason = self.decline_reason or (
+                self.messages[-1]['description'] if self.messages else None
+            )
+            fields += ['decline_reason']
+        else:  # Pending review
+            service_request.status = 'U'
+
+        self.unit_of_work.on_flush(lambda: service_request.save(update_fields=fields + ['updated_at']))
+        self.unit_of_work.flush()
+
+        logger.info(f"Pre-authorization complete for service request {service_request.request_number}: {result}")
+
+        return adjudication_result
+
+
+def process_service_request_adjudication(service_request: ServiceRequest) -> AdjudicationResult:
+    """
+    Pre-authorize a pending service request
+
+    Provider and package data come from the process-level reference data,
+    so a warm request costs the beneficiary snapshot queries and the writes.
+    """
+
+    if service_request.status != 'P':
+        raise ValueError(f"Service request {service_request.request_number} is not pending")
+
+    context = load_service_request_context(service_request, get_preauthorization_reference())
+    return PreAuthorizationEngine(service_request, context=context).process_adjudication()
+
+
+def complete_service_request_authorization(service_request: ServiceRequest, adjudication_result: AdjudicationResult) -> None:
+    """Reserve the authorized amount and notify the member, after the decision is committed"""
+
+    from configurations.functions import (
+        reserve_funds_for_authorization, send_authorization_notification, send_service_request_decline_notification
+    )
+
+    if adjudication_result.result == 'APPROVED':
+        reserve_funds_for_authorization(service_request, adjudication_result.adjudicated_amount)
+        send_authorization_notification(service_request)
+    elif adjudication_result.result == 'DECLINED':
+        send_service_request_decline_notification(service_request, adjudication_result.decline_reason)
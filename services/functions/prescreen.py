@@ -0,0 +1,269 @@
+import logging
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from membership.models import Beneficiary
+from services.models import (
+    AdjudicationMessage, AdjudicationMessageCode, AdjudicationResult, BeneficiaryUtilization,
+    Claim, ClaimServiceLine
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CLAIM_AGE_DAYS = 365
+
+
+def get_max_claim_age_days() -> int:
+    return getattr(settings, 'FISCO_HUB_SUITE_SETTINGS', {}).get('MAX_CLAIM_AGE_DAYS', DEFAULT_MAX_CLAIM_AGE_DAYS)
+
+
+class PrescreenResult:
+    """Outcome of pre-screening a batch: declined claims with their reason, and the survivors"""
+
+    def __init__(self, declined: Dict, survivors: List):
+        self.declined = declined
+        self.survivors = survivors
+
+    def __len__(self):
+        return len(self.declined) + len(self.survivors)
+
+
+def _frame(queryset, columns: List[str]) -> pd.DataFrame:
+    return pd.DataFrame.from_records(list(queryset.values_list(*columns)), columns=columns)
+
+
+def _age(date_of_birth: pd.Series, today: pd.Timestamp) -> pd.Series:
+    """Age in whole years on a date, for a column of birth dates"""
+    had_birthday = (date_of_birth.dt.month < today.month) | (
+        (date_of_birth.dt.month == today.month) & (date_of_birth.dt.day <= today.day)
+    )
+    return today.year - date_of_birth.dt.year - (~had_birthday).astype(int)
+
+
+def evaluate_prescreen(claims: pd.DataFrame, lines: pd.DataFrame, beneficiaries: pd.DataFrame,
+                       today: date, max_claim_age_days: int) -> Tuple[Dict, List]:
+    """
+    Evaluate the pre-screen checks on columnar claim data
+
+    Expects frames with these columns:
+    - claims: id, beneficiary_id
+    - lines: claim_id, service_date, description
+    - beneficiaries: id, status, benefit_start_date, date_of_birth,
+      package_id, annual_limit, utilized
+
+    Returns (declined, survivors), where declined maps claim id to a
+    (message code, description) pair. Checks run in the engine's order and
+    the first failing check decides the message. Annual limit and age checks
+    need a package; without one the claim is left to the full engine.
+    """
+
+    if claims.empty:
+        return {}, []
+
+    today_ts = pd.Timestamp(today)
+
+    lines = lines.copy()
+    lines['service_date'] = pd.to_datetime(lines['service_date'])
+    lines['too_old'] = (today_ts - lines['service_date']).dt.days > max_claim_age_days
+    lines['future'] = lines['service_date'] > today_ts
+
+    frame = claims.merge(
+        beneficiaries.rename(columns={'id': 'beneficiary_id'}), on='beneficiary_id', how='left'
+    )
+    frame['date_of_birth'] = pd.to_datetime(frame['date_of_birth'])
+    frame['benefit_start_date'] = pd.to_datetime(frame['benefit_start_date'])
+    frame['age'] = _age(frame['date_of_birth'], today_ts)
+
+    # Line-level flags rolled up per claim
+    line_flags = lines.merge(frame[['id', 'age']], left_on='claim_id', right_on='id', how='left')
+    service_description = line_flags['description'].fillna('').str.lower()
+    line_flags['pediatric'] = service_description.str.contains('pediatric', regex=False) & (line_flags['age'] >= 18)
+    line_flags['geriatric'] = service_description.str.contains('geriatric', regex=False) & (line_flags['age'] < 65)
+
+    per_claim = line_flags.groupby('claim_id').agg(
+        line_count=('service_date', 'size'),
+        too_old=('too_old', 'any'),
+        future=('future', 'any'),
+        age_restricted=('pediatric', 'any'),
+        geriatric=('geriatric', 'any'),
+    )
+    per_claim['age_restricted'] |= per_claim.pop('geriatric')
+
+    oldest = lines.loc[lines['too_old']].groupby('claim_id')['service_date'].min()
+    latest = lines.loc[lines['future']].groupby('claim_id')['service_date'].max()
+
+    frame = frame.join(per_claim, on='id')
+    frame['line_count'] = frame['line_count'].fillna(0)
+    for column in ('too_old', 'future', 'age_restricted'):
+        frame[column] = frame[column].fillna(False).astype(bool)
+
+    has_package = frame['package_id'].notna()
+    annual_limit = frame['annual_limit'].fillna(0).astype(float)
+    remaining = np.where(annual_limit > 0, annual_limit, 0.0) - frame['utilized'].fillna(0).astype(float)
+
+    conditions = [
+        frame['line_count'] == 0,
+        frame['too_old'],
+        frame['future'],
+        frame['status'] == 'I',
+        frame['status'] == 'S',
+        frame['status'] == 'T',
+        frame['benefit_start_date'].notna() & (frame['benefit_start_date'] > today_ts),
+        has_package & (remaining <= 0),
+        has_package & frame['age_restricted'],
+    ]
+    codes = ['SERV001', 'TIME001', 'TIME002', 'BENF001', 'BENF003', 'BENF004', 'BENF002', 'LIMT002', 'AGER001']
+    frame['code'] = np.select(conditions, codes, default='')
+
+    declined, survivors = {}, []
+    for claim_id, code, benefit_start in zip(frame['id'], frame['code'], frame['benefit_start_date']):
+        if not code:
+            survivors.append(claim_id)
+            continue
+
+        if code == 'SERV001':
+            description = 'No services found on claim'
+        elif code == 'TIME001':
+            description = f'Service date too old: {oldest[claim_id].date()}'
+        elif code == 'TIME002':
+            description = f'Future service date: {latest[claim_id].date()}'
+        elif code == 'BENF001':
+            description = 'Beneficiary account is inactive'
+        elif code == 'BENF003':
+            description = 'Beneficiary is suspended'
+        elif code == 'BENF004':
+            description = 'Beneficiary account terminated'
+        elif code == 'BENF002':
+            description = f'Benefits start on {benefit_start.date()}'
+        elif code == 'LIMT002':
+            description = 'Annual limit exceeded'
+        else:
+            description = 'Age restriction for service'
+
+        declined[claim_id] = (code, description)
+
+    return declined, survivors
+
+
+def prescreen_claims(claim_ids: Iterable, today: Optional[date] = None) -> PrescreenResult:
+    """
+    Pre-screen new claims with array operations before full adjudication
+
+    Loads the batch, its service lines and the referenced beneficiaries as
+    columns (one query each, plus one for utilization) and declines the
+    claims that fail the simple date, eligibility, annual limit and age
+    checks. Only claims the full ClaimAdjudicationEngine would also decline
+    are declined here; everything else survives.
+    """
+
+    today = today or timezone.now().date()
+    claim_ids = list(claim_ids)
+
+    claims = _frame(Claim.objects.filter(id__in=claim_ids, status='N'), ['id', 'beneficiary_id'])
+    if claims.empty:
+        return PrescreenResult({}, [])
+
+    lines = _frame(
+        ClaimServiceLine.objects.filter(claim_id__in=claims['id'].tolist()),
+        ['claim_id', 'service_date', 'service__description']
+    ).rename(columns={'service__description': 'description'})
+
+    beneficiary_ids = claims['beneficiary_id'].unique().tolist()
+    beneficiaries = _frame(
+        Beneficiary.objects.filter(id__in=beneficiary_ids),
+        ['id', 'status', 'benefit_start_date', 'date_of_birth',
+         'member__default_package_id', 'member__default_package__global_annual_limit']
+    ).rename(columns={
+        'member__default_package_id': 'package_id',
+        'member__default_package__global_annual_limit': 'annual_limit',
+    })
+
+    utilized = dict(
+        BeneficiaryUtilization.objects.filter(
+            beneficiary_id__in=beneficiary_ids,
+            benefit_year=today.year
+        ).values_list('beneficiary_id', 'total_amount')
+    )
+    beneficiaries['utilized'] = beneficiaries['id'].map(utilized)
+
+    declined, survivors = evaluate_prescreen(claims, lines, beneficiaries, today, get_max_claim_age_days())
+
+    logger.info(f"Pre-screened {len(claims)} claims: {len(declined)} declined, {len(survivors)} to full adjudication")
+
+    return PrescreenResult(declined, survivors)
+
+
+def record_prescreen_declines(declined: Dict) -> int:
+    """
+    Write the adjudication results for claims declined by the pre-screen
+
+    Results, messages and claim updates are written in bulk. Declining a
+    new claim does not touch the utilization ledger or fraud counters, so
+    the claims are updated with a single queryset update.
+    """
+
+    if not declined:
+        return 0
+
+    from services.functions.compact_messages import compact_messages_enabled, encode_messages
+
+    compact = compact_messages_enabled()
+    message_codes = {
+        code.code: code
+        for code in AdjudicationMessageCode.objects.filter(code__in={code for code, _ in declined.values()})
+    }
+
+    claimed = dict(
+        Claim.objects.filter(id__in=list(declined)).values_list('id', 'claimed_amount')
+    )
+
+    with transaction.atomic():
+        declined_ids = list(
+            Claim.objects.select_for_update().filter(id__in=list(declined), status='N').values_list('id', flat=True)
+        )
+
+        results = [
+            AdjudicationResult(
+                claim_id=claim_id,
+                result='DECLINED',
+                original_amount=claimed.get(claim_id) or Decimal('0.00'),
+                adjudicated_amount=Decimal('0.00'),
+                processing_type='AUTOMATIC',
+                processed_at=timezone.now(),
+                decline_reason=declined[claim_id][1],
+                compact_messages=encode_messages(
+                    [(declined[claim_id][0], declined[claim_id][1], None)]
+                    if declined[claim_id][0] in message_codes else []
+                ) if compact else None
+            )
+            for claim_id in declined_ids
+        ]
+        AdjudicationResult.objects.bulk_create(results, batch_size=1000)
+
+        if not compact:
+            AdjudicationMessage.objects.bulk_create([
+                AdjudicationMessage(
+                    adjudication_result=result,
+                    message_code=message_codes[declined[result.claim_id][0]],
+                    custom_description=declined[result.claim_id][1]
+                )
+                for result in results
+                if declined[result.claim_id][0] in message_codes
+            ], batch_size=1000)
+
+        Claim.objects.filter(id__in=declined_ids).update(
+            status='D',
+            accepted_amount=Decimal('0.00'),
+            adjudicated_amount=Decimal('0.00'),
+            automatic_adjudication=True,
+            updated_at=timezone.now()
+        )
+
+    return len(declined_ids)
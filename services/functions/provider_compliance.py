@@ -0,0 +1,175 @@
+import logging
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+from django.utils import timezone
+
+from configurations.models import (
+    ProviderComplianceStatus, ServiceProvider, ServiceProviderDocument, ServiceProviderTypeRequirement
+)
+
+logger = logging.getLogger(__name__)
+
+
+def evaluate_provider_compliance(requirements: Iterable, documents: Dict, today: date) -> Dict:
+    """
+    Evaluate a provider's documents against its type's requirements
+
+    requirements are ServiceProviderTypeRequirement rows (with document_type),
+    documents maps document type id to the provider's document expiry date
+    (None when the document does not expire). Each missing or expired entry
+    records whether the requirement withholds payment for it. The next expiry
+    date is the earliest expiry among the current required documents: the
+    evaluation holds until that day has passed.
+    """
+
+    missing, expired, expiry_dates = [], [], []
+
+    for requirement in requirements:
+        document_type = requirement.document_type
+        if document_type.id not in documents:
+            missing.append({
+                'id': str(document_type.id),
+                'name': document_type.name,
+                'withhold': requirement.withhold_payment_if_missing,
+            })
+            continue
+
+        expiry_date = documents[document_type.id]
+        if expiry_date and expiry_date < today:
+            expired.append({
+                'id': str(document_type.id),
+                'name': document_type.name,
+                'withhold': requirement.withhold_payment_if_expired,
+            })
+        elif expiry_date:
+            expiry_dates.append(expiry_date)
+
+    return {
+        'status': 'N' if missing or expired else 'C',
+        'missing_documents': missing,
+        'expired_documents': expired,
+        'next_expiry_date': min(expiry_dates) if expiry_dates else None,
+    }
+
+
+def refresh_provider_compliance(provider_ids: Optional[Iterable] = None) -> int:
+    """
+    Recompute and store the compliance status of some providers (all when None)
+
+    Requirements, documents and existing rows are each read in one query,
+    and the statuses are written with one upsert. Returns the number of
+    providers refreshed.
+    """
+
+    providers = ServiceProvider.objects.all()
+    if provider_ids is not None:
+        providers = providers.filter(pk__in=list(provider_ids))
+    providers = list(providers.only('id', 'type_id'))
+    if not providers:
+        return 0
+
+    requirements = defaultdict(list)
+    for requirement in ServiceProviderTypeRequirement.objects.filter(
+        provider_type_id__in={provider.type_id for provider in providers},
+        is_required=True
+    ).select_related('document_type'):
+        requirements[requirement.provider_type_id].append(requirement)
+
+    documents = defaultdict(dict)
+    for provider_id, document_type_id, expiry_date in ServiceProviderDocument.objects.filter(
+        service_provider_id__in=[provider.id for provider in providers]
+    ).values_list('service_provider_id', 'document_type_id', 'expiry_date'):
+        documents[provider_id][document_type_id] = expiry_date
+
+    now = timezone.now()
+    statuses = [
+        ProviderComplianceStatus(
+            service_provider_id=provider.id,
+            checked_at=now,
+            **evaluate_provider_compliance(requirements[provider.type_id], documents[provider.id], now.date())
+        )
+        for provider in providers
+    ]
+
+    ProviderComplianceStatus.objects.bulk_create(
+        statuses,
+        update_conflicts=True,
+        unique_fields=['service_provider'],
+        update_fields=['status', 'missing_documents', 'expired_documents', 'next_expiry_date',
+                       'checked_at', 'updated_at'],
+    )
+
+    logger.info(f"Refreshed compliance status of {len(statuses)} providers")
+    return len(statuses)
+
+
+def refresh_provider_type_compliance(provider_type_id) -> int:
+    """Refresh every provider of a type after its document requirements change"""
+    return refresh_provider_compliance(
+        ServiceProvider.objects.filter(type_id=provider_type_id).values_list('id', flat=True)
+    )
+
+
+def refresh_stale_provider_compliance() -> int:
+    """Refresh providers whose next document expiry has passed, or that have no status yet"""
+
+    today = timezone.now().date()
+    provider_ids = set(
+        ProviderComplianceStatus.objects.filter(
+            next_expiry_date__lt=today
+        ).values_list('service_provider_id', flat=True)
+    )
+    provider_ids.update(
+        ServiceProvider.objects.filter(
+            compliance_status__isnull=True
+        ).values_list('id', flat=True)
+    )
+    return refresh_provider_compliance(provider_ids) if provider_ids else 0
+
+
+def get_provider_compliance(provider: ServiceProvider) -> ProviderComplianceStatus:
+    """
+    Get a provider's compliance status
+
+    Reads the stored row (already joined when the provider was loaded with
+    select_related('compliance_status')) and only recomputes it when it is
+    missing or a document has expired since it was checked.
+    """
+
+    try:
+        status = provider.compliance_status
+    except ProviderComplianceStatus.DoesNotExist:
+        status = None
+
+    if status is None or status.is_stale(timezone.now().date()):
+        refresh_provider_compliance([provider.id])
+        status = ProviderComplianceStatus.objects.get(service_provider_id=provider.id)
+        provider.compliance_status = status
+
+    return status
+
+
+def withheld_document_issues(status: ProviderComplianceStatus) -> List[str]:
+    """Describe the missing and expired documents that withhold the provider's payments"""
+    return [
+        f"Missing: {document['name']}" for document in status.missing_documents if document['withhold']
+    ] + [
+        f"Expired: {document['name']}" for document in status.expired_documents if document['withhold']
+    ]
+
+
+def apply_provider_compliance(statement) -> ProviderComplianceStatus:
+    """Copy the provider's compliance status onto a payment statement"""
+
+    status = get_provider_compliance(statement.service_provider)
+
+    statement.has_compliance_issues = status.status == 'N'
+    statement.compliance_notes = "\n".join(withheld_document_issues(status)) or None
+    statement.save(update_fields=['has_compliance_issues', 'compliance_notes', 'updated_at'])
+
+    statement.missing_documents.set([document['id'] for document in status.missing_documents])
+    statement.expired_documents.set([document['id'] for document in status.expired_documents])
+
+    return status
@@ -0,0 +1,190 @@
+import logging
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Iterable, Optional, Set
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from services.models import AdjudicationResult, Claim, ReviewQueueItem
+
+logger = logging.getLogger(__name__)
+
+
+def _get_setting(key, default):
+    return getattr(settings, 'FISCO_HUB_SUITE_SETTINGS', {}).get(key, default)
+
+
+def get_high_value_threshold() -> Decimal:
+    """Claimed amount above which a claim needs the high value adjudication permission"""
+    return Decimal(str(_get_setting('HIGH_VALUE_CLAIM_THRESHOLD', 10000)))
+
+
+def review_due_at(queued_at: datetime, claimed_amount: Decimal, clinical: bool) -> datetime:
+    """
+    When a pending claim should be reviewed
+
+    Claims are due REVIEW_TARGET_HOURS after they were queued. Clinical
+    reviews are brought forward 48 hours, high value claims 24 hours and
+    claims of 1000 or more 12 hours, so they sort ahead of routine claims
+    queued at the same time.
+    """
+
+    hours = _get_setting('REVIEW_TARGET_HOURS', 72)
+    if clinical:
+        hours -= 48
+    if claimed_amount > get_high_value_threshold():
+        hours -= 24
+    elif claimed_amount >= 1000:
+        hours -= 12
+    return queued_at + timedelta(hours=hours)
+
+
+def enqueue_claim_for_review(claim: Claim, clinical: bool = False) -> ReviewQueueItem:
+    """Queue a claim pending review, keeping its place if it is already queued"""
+
+    now = timezone.now()
+    item, created = ReviewQueueItem.objects.get_or_create(
+        claim=claim,
+        defaults={
+            'clinical': clinical,
+            'claimed_amount': claim.claimed_amount,
+            'queued_at': now,
+            'due_at': review_due_at(now, claim.claimed_amount, clinical),
+        }
+    )
+    if not created and clinical and not item.clinical:
+        item.clinical = True
+        item.due_at = review_due_at(item.queued_at, item.claimed_amount, True)
+        item.save(update_fields=['clinical', 'due_at', 'updated_at'])
+    return item
+
+
+def _lease_expiry() -> datetime:
+    return timezone.now() + timedelta(seconds=_get_setting('REVIEW_LEASE_SECONDS', 900))
+
+
+def claim_next_review(adjudicator) -> Optional[ReviewQueueItem]:
+    """
+    Lease the next claim due for review to an adjudicator
+
+    An adjudicator who still holds a lease gets the same claim back with the
+    lease renewed. Otherwise the earliest due unleased (or lapsed) item is
+    locked with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent adjudicators
+    each take a different row without waiting on one another. High value
+    claims are only offered to adjudicators allowed to decide them. Returns
+    None when nothing is available.
+    """
+
+    now = timezone.now()
+
+    with transaction.atomic():
+        item = ReviewQueueItem.objects.select_for_update(skip_locked=True).filter(
+            assigned_to=adjudicator, leased_until__gte=now
+        ).order_by('due_at').first()
+
+        if item is None:
+            available = ReviewQueueItem.objects.select_for_update(skip_locked=True).filter(
+                Q(leased_until__isnull=True) | Q(leased_until__lt=now)
+            )
+            if not adjudicator.has_perm('services.can_adjudicate_high_value'):
+                available = available.filter(claimed_amount__lte=get_high_value_threshold())
+            item = available.order_by('due_at').first()
+
+        if item is None:
+            return None
+
+        item.assigned_to = adjudicator
+        item.leased_until = _lease_expiry()
+        item.save(update_fields=['assigned_to', 'leased_until', 'updated_at'])
+
+    logger.info(f"Review of claim {item.claim_id} leased to {adjudicator.username} until {item.leased_until}")
+    return item
+
+
+def renew_review_lease(claim: Claim, adjudicator) -> bool:
+    """Extend an adjudicator's unexpired lease on a claim; False when they no longer hold it"""
+    return ReviewQueueItem.objects.filter(
+        claim=claim, assigned_to=adjudicator, leased_until__gte=timezone.now()
+    ).update(leased_until=_lease_expiry(), updated_at=timezone.now()) > 0
+
+
+def release_review(claim: Claim, adjudicator) -> bool:
+    """Return a leased claim to the queue without deciding it"""
+    return ReviewQueueItem.objects.filter(
+        claim=claim, assigned_to=adjudicator
+    ).update(assigned_to=None, leased_until=None, updated_at=timezone.now()) > 0
+
+
+def _held_by_other(item: ReviewQueueItem, adjudicator, now: datetime) -> bool:
+    return bool(
+        item.assigned_to_id and item.assigned_to_id != adjudicator.pk
+        and item.leased_until and item.leased_until >= now
+    )
+
+
+def take_review(claim: Claim, adjudicator) -> None:
+    """
+    Remove a claim from the queue as an adjudicator decides it
+
+    Call inside the transaction that records the decision, so the item comes
+    back if the decision fails. Raises ValueError when another adjudicator
+    holds an unexpired lease on the claim.
+    """
+
+    item = ReviewQueueItem.objects.select_for_update().filter(claim=claim).first()
+    if item is None:
+        return
+
+    if _held_by_other(item, adjudicator, timezone.now()):
+        raise ValueError(f"Claim {claim.transaction_number} is being reviewed by another adjudicator")
+
+    item.delete()
+
+
+def take_reviews(claim_ids: Iterable, adjudicator) -> Set:
+    """
+    Remove many claims from the queue as an adjudicator decides them in bulk
+
+    Like take_review, inside the deciding transaction. Claims leased to
+    another adjudicator are left queued and their ids returned.
+    """
+
+    now = timezone.now()
+    held, taken = set(), []
+    for item in ReviewQueueItem.objects.select_for_update().filter(claim_id__in=list(claim_ids)):
+        if _held_by_other(item, adjudicator, now):
+            held.add(item.claim_id)
+        else:
+            taken.append(item.pk)
+
+    if taken:
+        ReviewQueueItem.objects.filter(pk__in=taken).delete()
+    return held
+
+
+def sync_review_queue() -> dict:
+    """
+    Reconcile the queue with claim statuses
+
+    Queues claims pending review that have no item (e.g. set to pending
+    outside adjudication) and drops items whose claims were decided
+    elsewhere.
+    """
+
+    queued = 0
+    for claim in Claim.objects.filter(status='U', review_queue_item__isnull=True).annotate(
+        clinical=Exists(AdjudicationResult.objects.filter(
+            claim=OuterRef('pk'), is_active=True, result='PENDING_CLINICAL'
+        ))
+    ).only('id', 'claimed_amount'):
+        enqueue_claim_for_review(claim, clinical=claim.clinical)
+        queued += 1
+
+    removed, _ = ReviewQueueItem.objects.exclude(claim__status='U').delete()
+
+    if queued or removed:
+        logger.info(f"Review queue sync: {queued} claims queued, {removed} items removed")
+    return {'queued': queued, 'removed': removed}
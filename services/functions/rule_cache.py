@@ -0,0 +1,325 @@
+import logging
+import threading
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from services.models import AdjudicationRule
+
+logger = logging.getLogger(__name__)
+
+RULES_VERSION_CACHE_KEY = 'adjudication_rules_version'
+
+
+class CompiledRule:
+    """
+    In-memory predicate for a single AdjudicationRule
+
+    Holds the rule's scalar conditions and frozen copies of its
+    services, service provider types and provider tiers, so matching a
+    claim against the rule needs no database access.
+    """
+
+    __slots__ = (
+        'id', 'name', 'description', 'rule_type', 'action', 'priority',
+        'min_amount', 'max_amount', 'beneficiary_types', 'member_types',
+        'service_ids', 'service_provider_type_ids', 'provider_tier_ids',
+        'min_age', 'max_age', 'max_visits_per_year', 'max_visits_per_month',
+        'reduction_percentage', 'reduction_amount',
+        'co_payment_percentage', 'co_payment_amount',
+        'effective_from', 'effective_to',
+    )
+
+    def __init__(self, rule: AdjudicationRule, service_ids: Iterable = (),
+                 service_provider_type_ids: Iterable = (), provider_tier_ids: Iterable = ()):
+        self.id = rule.id
+        self.name = rule.name
+        self.description = rule.description
+        self.rule_type = rule.rule_type
+        self.action = rule.action
+        self.priority = rule.priority
+
+        self.min_amount = rule.min_amount
+        self.max_amount = rule.max_amount
+
+        # 'A' (All) or blank means the rule is not restricted by beneficiary type
+        if rule.beneficiary_type and rule.beneficiary_type != 'A':
+            self.beneficiary_types = frozenset(t.strip() for t in rule.beneficiary_type.split(','))
+        else:
+            self.beneficiary_types = None
+
+        if rule.member_types:
+            self.member_types = frozenset(t.strip() for t in rule.member_types.split(',') if t.strip())
+        else:
+            self.member_types = None
+
+        self.service_ids: FrozenSet = frozenset(service_ids)
+        self.service_provider_type_ids: FrozenSet = frozenset(service_provider_type_ids)
+        self.provider_tier_ids: FrozenSet = frozenset(provider_tier_ids)
+
+        self.min_age = rule.min_age
+        self.max_age = rule.max_age
+        self.max_visits_per_year = rule.max_visits_per_year
+        self.max_visits_per_month = rule.max_visits_per_month
+
+        self.reduction_percentage = rule.reduction_percentage
+        self.reduction_amount = rule.reduction_amount
+        self.co_payment_percentage = rule.co_payment_percentage
+        self.co_payment_amount = rule.co_payment_amount
+
+        self.effective_from = rule.effective_from
+        self.effective_to = rule.effective_to
+
+    @property
+    def has_frequency_limit(self) -> bool:
+        return bool(self.max_visits_per_year or self.max_visits_per_month)
+
+    def is_effective(self, on_date) -> bool:
+        if self.effective_from and self.effective_from > on_date:
+            return False
+        if self.effective_to and self.effective_to < on_date:
+            return False
+        return True
+
+    def applies_to(self, rule_type: str) -> bool:
+        return self.rule_type in (rule_type, 'B')
+
+    def matches(self, amount: Decimal, beneficiary_type: str, member_type: str,
+                provider_tier_id, service_ids: FrozenSet, service_provider_type_ids: FrozenSet,
+                age: int) -> bool:
+        """Check every condition of the rule except service frequency"""
+
+        # Check amount range
+        if self.min_amount and amount < self.min_amount:
+            return False
+        if self.max_amount and amount > self.max_amount:
+            return False
+
+        # Check beneficiary type
+        if self.beneficiary_types is not None and beneficiary_type not in self.beneficiary_types:
+            return False
+
+        # Check member types
+        if self.member_types is not None and member_type not in self.member_types:
+            return False
+
+        # Check provider tiers
+        if self.provider_tier_ids and provider_tier_id not in self.provider_tier_ids:
+            return False
+
+        # Check services
+        if self.service_ids and self.service_ids.isdisjoint(service_ids):
+            return False
+
+        # Check categories
+        if self.service_provider_type_ids and self.service_provider_type_ids.isdisjoint(service_provider_type_ids):
+            return False
+
+        # Check age limits
+        if self.min_age and age < self.min_age:
+            return False
+        if self.max_age and age > self.max_age:
+            return False
+
+        return True
+
+    def __repr__(self):
+        return f"<CompiledRule {self.name} ({self.action}) priority={self.priority}>"
+
+
+class CompiledRuleSet:
+    """
+    Active adjudication rules compiled at a given version, in priority order
+
+    Rules are also indexed by the claim attribute that restricts them most:
+    service, then service provider type (category), then provider tier.
+    Rules with none of these restrictions go into a wildcard bucket. Only
+    the rules reachable from a claim's services, categories and tier (plus
+    the wildcard bucket) are candidates for evaluation.
+    """
+
+    def __init__(self, version: Optional[str], rules: List[CompiledRule]):
+        self.version = version
+        self.rules = sorted(rules, key=lambda r: (r.priority, r.name))
+        self.compiled_at = timezone.now()
+
+        # Inverted index: attribute id -> positions in self.rules
+        self.by_service: Dict = defaultdict(list)
+        self.by_category: Dict = defaultdict(list)
+        self.by_tier: Dict = defaultdict(list)
+        self.wildcard: List[int] = []
+
+        for position, rule in enumerate(self.rules):
+            if rule.service_ids:
+                for service_id in rule.service_ids:
+                    self.by_service[service_id].append(position)
+            elif rule.service_provider_type_ids:
+                for category_id in rule.service_provider_type_ids:
+                    self.by_category[category_id].append(position)
+            elif rule.provider_tier_ids:
+                for tier_id in rule.provider_tier_ids:
+                    self.by_tier[tier_id].append(position)
+            else:
+                self.wildcard.append(position)
+
+    def effective_rules(self, on_date, rule_type: str = 'C') -> List[CompiledRule]:
+        """Rules in effect on a date for claims ('C') or service requests ('SR')"""
+        return [
+            rule for rule in self.rules
+            if rule.applies_to(rule_type) and rule.is_effective(on_date)
+        ]
+
+    def candidate_rules(self, on_date, service_ids: Iterable = (), service_provider_type_ids: Iterable = (),
+                        provider_tier_id=None, rule_type: str = 'C') -> List[CompiledRule]:
+        """
+        Rules that could match a claim with the given attributes, in priority order
+
+        Candidates still need CompiledRule.matches; the index only rules out
+        rules whose primary restriction the claim cannot satisfy.
+        """
+
+        positions = set(self.wildcard)
+        for service_id in service_ids:
+            positions.update(self.by_service.get(service_id, ()))
+        for category_id in service_provider_type_ids:
+            positions.update(self.by_category.get(category_id, ()))
+        if provider_tier_id is not None:
+            positions.update(self.by_tier.get(provider_tier_id, ()))
+
+        candidates = []
+        for position in sorted(positions):
+            rule = self.rules[position]
+            if rule.applies_to(rule_type) and rule.is_effective(on_date):
+                candidates.append(rule)
+
+        return candidates
+
+    def __len__(self):
+        return len(self.rules)
+
+
+def compile_rules(rules: Iterable[AdjudicationRule], version: Optional[str] = None) -> CompiledRuleSet:
+    """
+    Compile rules into in-memory predicates
+
+    Loads the M2M relations of all rules with one query per relation,
+    reading only the through tables.
+    """
+
+    rules = list(rules)
+    rule_ids = [rule.id for rule in rules]
+
+    relations = {
+        'services': ('service_id', AdjudicationRule.services.through),
+        'service_provider_type': ('serviceprovidertype_id', AdjudicationRule.service_provider_type.through),
+        'provider_tiers': ('tier_id', AdjudicationRule.provider_tiers.through),
+    }
+
+    related: Dict[str, Dict] = {}
+    for name, (column, through) in relations.items():
+        mapping = defaultdict(set)
+        for rule_id, related_id in through.objects.filter(
+            adjudicationrule_id__in=rule_ids
+        ).values_list('adjudicationrule_id', column):
+            mapping[rule_id].add(related_id)
+        related[name] = mapping
+
+    compiled = [
+        CompiledRule(
+            rule,
+            service_ids=related['services'].get(rule.id, ()),
+            service_provider_type_ids=related['service_provider_type'].get(rule.id, ()),
+            provider_tier_ids=related['provider_tiers'].get(rule.id, ()),
+        )
+        for rule in rules
+    ]
+
+    return CompiledRuleSet(version, compiled)
+
+
+class CacheVersion:
+    """
+    A version stamp in the shared cache
+
+    Whatever a worker built at one version is stale once the stamp is
+    bumped (the model signals bump it on commit). version() returns None
+    when the cache backend cannot hold the stamp (e.g. the dummy cache used
+    in tests), in which case nothing should be reused.
+    """
+
+    def __init__(self, key: str, label: str):
+        self.key = key
+        self.label = label
+
+    def get(self) -> Optional[str]:
+        version = cache.get(self.key)
+        if version is None:
+            cache.add(self.key, uuid.uuid4().hex, None)
+            version = cache.get(self.key)
+        return version
+
+    def bump(self) -> None:
+        cache.set(self.key, uuid.uuid4().hex, None)
+        logger.info(f"{self.label} version bumped")
+
+
+class ProcessCache:
+    """
+    A value built once per process and shared by its threads until its version changes
+
+    build(version) is called under a lock, so concurrent misses build the
+    value once.
+    """
+
+    def __init__(self, version: CacheVersion, build: Callable[[Optional[str]], Any]):
+        self.version = version
+        self.build = build
+        self._current: Optional[Tuple[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        version = self.version.get()
+        current = self._current
+        if current is not None and version is not None and current[0] == version:
+            return current[1]
+
+        with self._lock:
+            current = self._current
+            if current is not None and version is not None and current[0] == version:
+                return current[1]
+
+            value = self.build(version)
+            self._current = (version, value)
+
+        return value
+
+
+def _compile_active_rules(version: Optional[str]) -> CompiledRuleSet:
+    compiled = compile_rules(AdjudicationRule.objects.filter(is_active=True), version)
+    logger.info(f"Compiled {len(compiled)} adjudication rules (version {version})")
+    return compiled
+
+
+rules_version = CacheVersion(RULES_VERSION_CACHE_KEY, 'Adjudication rule set')
+
+# Process-level cache of the compiled active rule set
+_compiled_rules = ProcessCache(rules_version, _compile_active_rules)
+
+
+def get_rules_version() -> Optional[str]:
+    """Get the shared rule-set version stamp"""
+    return rules_version.get()
+
+
+def bump_rules_version() -> None:
+    """Mark the compiled rule set stale in every worker"""
+    rules_version.bump()
+
+
+def get_compiled_rules() -> CompiledRuleSet:
+    """Get the compiled active rule set, recompiling only when the version changed"""
+    return _compiled_rules.get()
@@ -0,0 +1,373 @@
+import logging
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from multiprocessing import get_context
+from typing import Dict, Iterable, List, Optional
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+from membership.models import Beneficiary
+from services.functions.adjudication_trace import AdjudicationTrace
+from services.functions.adjudication_context import AdjudicationContext, AdjudicationReferenceData
+from services.functions.auto_adjudication import ClaimAdjudicationEngine
+from services.functions.batch_adjudication import chunk_by_group, get_chunk_size
+from services.functions.provider_compliance import get_provider_compliance
+from services.functions.rule_cache import CompiledRule, CompiledRuleSet, compile_rules
+from services.functions.utilization import (
+    ANNUAL_VISIT_WINDOW_DAYS, UTILIZED_STATUSES, ServiceVisitHistory, get_utilization_history
+)
+from services.models import AdjudicationRule, BeneficiaryServiceVisit, Claim, ClaimServiceLine, ServiceRequest
+
+logger = logging.getLogger(__name__)
+
+# Claims that have been through adjudication and can be replayed
+SIMULATED_STATUSES = ('A', 'P', 'D', 'U')
+
+
+class SimulatedOutcome:
+    """The decision a rule set would have reached for a claim, without any records written"""
+
+    __slots__ = ('result', 'claimed_amount', 'accepted_amount', 'adjudicated_amount', 'co_payment_amount', 'rule_ids')
+
+    def __init__(self, result: str, claimed_amount: Decimal, accepted_amount: Decimal,
+                 adjudicated_amount: Decimal, co_payment_amount: Decimal, rule_ids: List):
+        self.result = result
+        self.claimed_amount = claimed_amount
+        self.accepted_amount = accepted_amount
+        self.adjudicated_amount = adjudicated_amount
+        self.co_payment_amount = co_payment_amount
+        self.rule_ids = rule_ids
+
+    @property
+    def payout(self) -> Decimal:
+        return self.adjudicated_amount if self.result == 'APPROVED' else Decimal('0.00')
+
+
+class SimulatedAdjudicationEngine(ClaimAdjudicationEngine):
+    """
+    Dry-run adjudication of a historical claim against a given rule set
+
+    Runs the engine's eligibility, coverage, provider, authorization and
+    rule steps on a preloaded snapshot and returns a SimulatedOutcome
+    instead of writing results, messages or transactions. Intake checks
+    (claim status, service date age), fraud counters and account balances
+    describe the state at the time the claim was first adjudicated and are
+    not replayed.
+    """
+
+    def __init__(self, claim: Claim, context: AdjudicationContext, rule_set: CompiledRuleSet, rule_date: date):
+        super().__init__(claim, context=context, defer_financials=True)
+        self.trace = AdjudicationTrace(enabled=False)
+        self.rule_set = rule_set
+        self.rule_date = rule_date
+        self.rule_ids = []
+
+    def _lock_claim(self) -> bool:
+        return True
+
+    def _pre_validation_checks(self) -> bool:
+        if not self.context.service_lines:
+            self._add_message('SERV001', 'No services found on claim')
+            return False
+        return True
+
+    def _candidate_rules(self) -> List[CompiledRule]:
+        return self.rule_set.candidate_rules(
+            self.rule_date,
+            service_ids=self.context.service_ids,
+            service_provider_type_ids=self.context.service_provider_type_ids,
+            provider_tier_id=self.provider.tier_id,
+            rule_type='C'
+        )
+
+    def _execute_rule_action(self, rule: CompiledRule):
+        self.rule_ids.append(rule.id)
+        return super()._execute_rule_action(rule)
+
+    def _fraud_detection_checks(self) -> List[str]:
+        return []
+
+    def _check_account_balance(self) -> bool:
+        return True
+
+    def _create_adjudication_result(self, result: str) -> SimulatedOutcome:
+        if result == 'APPROVED':
+            self.total_adjudicated = self.net_payable
+        elif result == 'DECLINED':
+            self.total_adjudicated = Decimal('0.00')
+
+        return SimulatedOutcome(
+            result=result,
+            claimed_amount=self.total_claimed,
+            accepted_amount=self.total_accepted,
+            adjudicated_amount=self.total_adjudicated,
+            co_payment_amount=self.co_payment_amount,
+            rule_ids=self.rule_ids
+        )
+
+
+class RuleSimulationReport:
+    """Aggregated comparison of the current and proposed rule sets over replayed claims"""
+
+    def __init__(self):
+        self.claims = 0
+        self.errors = 0
+        self.changed = 0
+        self.historical_payout = Decimal('0.00')
+        self.baseline_payout = Decimal('0.00')
+        self.proposed_payout = Decimal('0.00')
+        self.baseline_results: Counter = Counter()
+        self.proposed_results: Counter = Counter()
+        self.transitions: Counter = Counter()
+        self.baseline_hits: Counter = Counter()
+        self.proposed_hits: Counter = Counter()
+        # Payout change of the claims whose outcome a rule took part in, under either rule set
+        self.rule_payout_delta: Dict = {}
+
+    @property
+    def payout_delta(self) -> Decimal:
+        return self.proposed_payout - self.baseline_payout
+
+    def add(self, historical_payout: Decimal, baseline: SimulatedOutcome, proposed: SimulatedOutcome) -> None:
+        self.claims += 1
+        self.historical_payout += historical_payout
+        self.baseline_payout += baseline.payout
+        self.proposed_payout += proposed.payout
+        self.baseline_results[baseline.result] += 1
+        self.proposed_results[proposed.result] += 1
+        self.baseline_hits.update(baseline.rule_ids)
+        self.proposed_hits.update(proposed.rule_ids)
+
+        if baseline.result != proposed.result or baseline.adjudicated_amount != proposed.adjudicated_amount:
+            self.changed += 1
+            self.transitions[(baseline.result, proposed.result)] += 1
+
+            delta = proposed.payout - baseline.payout
+            for rule_id in set(baseline.rule_ids) | set(proposed.rule_ids):
+                self.rule_payout_delta[rule_id] = self.rule_payout_delta.get(rule_id, Decimal('0.00')) + delta
+
+    def merge(self, other: 'RuleSimulationReport') -> None:
+        self.claims += other.claims
+        self.errors += other.errors
+        self.changed += other.changed
+        self.historical_payout += other.historical_payout
+        self.baseline_payout += other.baseline_payout
+        self.proposed_payout += other.proposed_payout
+        self.baseline_results.update(other.baseline_results)
+        self.proposed_results.update(other.proposed_results)
+        self.transitions.update(other.transitions)
+        self.baseline_hits.update(other.baseline_hits)
+        self.proposed_hits.update(other.proposed_hits)
+        for rule_id, delta in other.rule_payout_delta.items():
+            self.rule_payout_delta[rule_id] = self.rule_payout_delta.get(rule_id, Decimal('0.00')) + delta
+
+    def as_dict(self, rule_names: Optional[Dict] = None) -> Dict:
+        rule_names = rule_names or {}
+        rule_ids = set(self.baseline_hits) | set(self.proposed_hits)
+
+        return {
+            'claims': self.claims,
+            'errors': self.errors,
+            'changed': self.changed,
+            'historical_payout': float(self.historical_payout),
+            'baseline_payout': float(self.baseline_payout),
+            'proposed_payout': float(self.proposed_payout),
+            'payout_delta': float(self.payout_delta),
+            'baseline_results': dict(self.baseline_results),
+            'proposed_results': dict(self.proposed_results),
+            'transitions': [
+                {'from': baseline, 'to': proposed, 'claims': count}
+                for (baseline, proposed), count in self.transitions.most_common()
+            ],
+            'rules': sorted([
+                {
+                    'rule_id': str(rule_id),
+                    'name': rule_names.get(rule_id, str(rule_id)),
+                    'baseline_hits': self.baseline_hits[rule_id],
+                    'proposed_hits': self.proposed_hits[rule_id],
+                    'payout_delta': float(self.rule_payout_delta.get(rule_id, Decimal('0.00'))),
+                }
+                for rule_id in rule_ids
+            ], key=lambda rule: (-abs(rule['proposed_hits'] - rule['baseline_hits']), rule['name'])),
+        }
+
+
+def _load_contexts(claims: List[Claim], reference: AdjudicationReferenceData) -> Dict:
+    """
+    Load the adjudication snapshots of a chunk of claims with one query per table
+
+    Visits and utilization totals are counted as they stood before each
+    claim: a replayed claim that was utilized has its own visit and amount
+    left out. Member accounts are left empty, see SimulatedAdjudicationEngine.
+    """
+
+    claim_ids = [claim.id for claim in claims]
+
+    beneficiaries = Beneficiary.objects.select_related(
+        'member__default_package', 'member__currency'
+    ).in_bulk({claim.beneficiary_id for claim in claims})
+
+    service_lines = defaultdict(list)
+    for line in ClaimServiceLine.objects.filter(claim_id__in=claim_ids).select_related('service__service_provider_type'):
+        service_lines[line.claim_id].append(line)
+
+    service_requests = ServiceRequest.objects.in_bulk(
+        {claim.service_request_id for claim in claims if claim.service_request_id}
+    )
+
+    visits = defaultdict(list)
+    for beneficiary_id, claim_id, service_id, visit_date, visit_count in BeneficiaryServiceVisit.objects.filter(
+        beneficiary_id__in=list(beneficiaries),
+        visit_date__gte=min(claim.start_date for claim in claims) - timedelta(days=ANNUAL_VISIT_WINDOW_DAYS),
+        visit_date__lte=max(claim.start_date for claim in claims),
+        visit_count__gt=0
+    ).values_list('beneficiary_id', 'claim_id', 'service_id', 'visit_date', 'visit_count'):
+        visits[beneficiary_id].append((claim_id, service_id, visit_date, visit_count))
+
+    utilization = get_utilization_history(beneficiaries, {claim.start_date.year for claim in claims})
+
+    contexts = {}
+    for claim in claims:
+        beneficiary = beneficiaries[claim.beneficiary_id]
+        provider = reference.get_provider(claim.provider_id)
+        lines = service_lines[claim.id]
+
+        claim.beneficiary = beneficiary
+        claim.provider = provider
+        annual_utilization, category_utilization = utilization.totals(beneficiary.id, claim.start_date, claim.id)
+
+        contexts[claim.id] = AdjudicationContext(
+            claim=claim,
+            beneficiary=beneficiary,
+            provider=provider,
+            service_lines=lines,
+            package_limits=reference.get_package_limits(beneficiary.member.default_package_id),
+            provider_compliance=get_provider_compliance(provider),
+            member_account=None,
+            annual_utilization=annual_utilization,
+            category_utilization=category_utilization,
+            service_request=service_requests.get(claim.service_request_id),
+            service_visits=ServiceVisitHistory(visit for visit in visits[beneficiary.id] if visit[0] != claim.id),
+            visit_date=claim.start_date,
+            tariffs=reference.get_tariffs()
+        )
+
+    return contexts
+
+
+def simulate_claims(claim_ids: Iterable, baseline: CompiledRuleSet, proposed: CompiledRuleSet,
+                    rule_date: date, reference: Optional[AdjudicationReferenceData] = None) -> RuleSimulationReport:
+    """
+    Replay claims against the baseline and proposed rule sets
+
+    Both rule sets see the same snapshot, so any difference between them
+    comes from the rules alone. Runs in a transaction that is always rolled
+    back, so nothing the engine touches can be written.
+    """
+
+    reference = reference or AdjudicationReferenceData()
+    report = RuleSimulationReport()
+
+    with transaction.atomic():
+        claims = list(Claim.objects.filter(id__in=list(claim_ids)))
+        contexts = _load_contexts(claims, reference) if claims else {}
+
+        for claim in claims:
+            historical_payout = claim.adjudicated_amount if claim.status in UTILIZED_STATUSES else Decimal('0.00')
+
+            try:
+                outcomes = [
+                    SimulatedAdjudicationEngine(claim, contexts[claim.id], rule_set, rule_date).process_adjudication()
+                    for rule_set in (baseline, proposed)
+                ]
+            except Exception as e:
+                report.errors += 1
+                logger.error(f"Rule simulation error for claim {claim.id}: {str(e)}")
+                continue
+
+            report.add(historical_payout, *outcomes)
+
+        transaction.set_rollback(True)
+
+    return report
+
+
+# Rule sets compiled once per worker process
+_worker_rule_sets: Dict = {}
+
+
+def _init_worker(baseline_ids: List, proposed_ids: List) -> None:
+    # Connections were closed before forking; each worker opens its own
+    _worker_rule_sets['baseline'] = compile_rules(AdjudicationRule.objects.filter(id__in=baseline_ids))
+    _worker_rule_sets['proposed'] = compile_rules(AdjudicationRule.objects.filter(id__in=proposed_ids))
+
+
+def _simulate_chunk(chunk: List, rule_date: date) -> RuleSimulationReport:
+    return simulate_claims(chunk, _worker_rule_sets['baseline'], _worker_rule_sets['proposed'], rule_date)
+
+
+def run_rule_simulation(start_date: date, end_date: date, add_rule_ids: Iterable = (),
+                        remove_rule_ids: Iterable = (), rule_date: Optional[date] = None,
+                        chunk_size: Optional[int] = None, workers: int = 1) -> Dict:
+    """
+    Estimate the impact of a rule change on historical claims
+
+    Replays the adjudicated claims with service dates in the range against
+    the active rule set and against the proposed one (the active rules plus
+    add_rule_ids, which may be inactive drafts, minus remove_rule_ids).
+    Rules are evaluated as in effect on rule_date (today by default).
+    Claims are replayed in beneficiary-ordered chunks, spread over worker
+    processes when workers > 1.
+
+    Returns per-rule hit counts, outcome transitions and the payout change.
+    """
+
+    rule_date = rule_date or timezone.now().date()
+
+    active_ids = set(AdjudicationRule.objects.filter(is_active=True).values_list('id', flat=True))
+    baseline_ids = list(active_ids)
+    proposed_ids = list((active_ids | set(add_rule_ids)) - set(remove_rule_ids))
+
+    rows = Claim.objects.filter(
+        start_date__gte=start_date,
+        start_date__lte=end_date,
+        status__in=SIMULATED_STATUSES,
+        reversed=False
+    ).order_by('beneficiary_id', 'start_date', 'created_at').values_list('id', 'beneficiary_id')
+    chunks = chunk_by_group(rows.iterator(), chunk_size or get_chunk_size())
+
+    logger.info(f"Simulating rule change over {sum(len(chunk) for chunk in chunks)} claims in {len(chunks)} chunks")
+
+    report = RuleSimulationReport()
+
+    if workers > 1 and len(chunks) > 1:
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context('fork'),
+            initializer=_init_worker,
+            initargs=(baseline_ids, proposed_ids)
+        ) as executor:
+            for chunk_report in executor.map(_simulate_chunk, chunks, [rule_date] * len(chunks)):
+                report.merge(chunk_report)
+    else:
+        baseline = compile_rules(AdjudicationRule.objects.filter(id__in=baseline_ids))
+        proposed = compile_rules(AdjudicationRule.objects.filter(id__in=proposed_ids))
+        reference = AdjudicationReferenceData()
+        for chunk in chunks:
+            report.merge(simulate_claims(chunk, baseline, proposed, rule_date, reference))
+
+    rule_names = dict(
+        AdjudicationRule.objects.filter(id__in=set(baseline_ids) | set(proposed_ids)).values_list('id', 'name')
+    )
+
+    summary = report.as_dict(rule_names)
+    summary.update({
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'rule_date': rule_date.isoformat(),
+    })
+    return summary
@@ -0,0 +1,143 @@
+import logging
+from bisect import bisect_right
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from configurations.models import ServiceTierPrice
+from services.functions.rule_cache import CacheVersion, ProcessCache
+
+logger = logging.getLogger(__name__)
+
+TARIFF_VERSION_CACHE_KEY = 'service_tariff_version'
+
+
+def _flatten_periods(periods: List) -> List:
+    """
+    Flatten a key's (effective_from, effective_to, max_payable) periods into disjoint ones
+
+    Wherever periods overlap the latest effective_from wins, so a period
+    nested in a longer one (a promotional price within the annual tariff)
+    applies for its own dates and the longer one resumes after it. Periods
+    must be sorted by effective_from.
+    """
+
+    boundaries = sorted(
+        {effective_from for effective_from, _, _ in periods}
+        | {effective_to + timedelta(days=1) for _, effective_to, _ in periods if effective_to}
+    )
+
+    flattened = []
+    for position, start in enumerate(boundaries):
+        in_force = [
+            max_payable for effective_from, effective_to, max_payable in periods
+            if effective_from <= start and (effective_to is None or effective_to >= start)
+        ]
+        if not in_force:
+            continue
+        end = boundaries[position + 1] - timedelta(days=1) if position + 1 < len(boundaries) else None
+        flattened.append((start, end, in_force[-1]))
+    return flattened
+
+
+class TariffIndex:
+    """
+    Effective-dated tier prices keyed by (service_id, tier_id)
+
+    Each key's prices are flattened into disjoint periods sorted by start,
+    so the price in force on a date is a bisect away. When periods overlap
+    the latest effective_from wins, as in the ServiceTierPrice ordering.
+    """
+
+    def __init__(self, version: Optional[str], prices: Iterable):
+        self.version = version
+        self.starts: Dict = {}
+        self.prices: Dict = {}
+        self.price_count = 0
+
+        # prices are (service_id, tier_id, effective_from, effective_to, max_payable_amount) tuples
+        periods: Dict = {}
+        for service_id, tier_id, effective_from, effective_to, max_payable in sorted(
+            prices, key=lambda price: price[2]
+        ):
+            periods.setdefault((service_id, tier_id), []).append((effective_from, effective_to, max_payable))
+            self.price_count += 1
+
+        for key, key_periods in periods.items():
+            flattened = _flatten_periods(key_periods)
+            self.starts[key] = [start for start, _, _ in flattened]
+            self.prices[key] = [(end, max_payable) for _, end, max_payable in flattened]
+
+    def __len__(self) -> int:
+        return self.price_count
+
+    def max_payable(self, service_id, tier_id, on_date: date) -> Optional[Decimal]:
+        """Maximum payable unit amount in force on a date, or None when there is no tariff"""
+
+        starts = self.starts.get((service_id, tier_id))
+        if not starts:
+            return None
+
+        position = bisect_right(starts, on_date) - 1
+        if position < 0:
+            return None
+
+        effective_to, max_payable = self.prices[(service_id, tier_id)][position]
+        if effective_to and effective_to < on_date:
+            return None
+        return max_payable
+
+    def reprice(self, service_lines: List, tier_id) -> Decimal:
+        """
+        Set each line's shortfall against the tariff at its service date
+
+        The tariff caps the unit amount, so a line can be paid at most
+        max_payable_amount times its quantity. Lines without a tariff, or
+        with a zero maximum, have no shortfall. Returns the total shortfall.
+        """
+
+        total = Decimal('0.00')
+        for line in service_lines:
+            max_payable = self.max_payable(line.service_id, tier_id, line.service_date)
+            if max_payable:
+                line.shortfall_amount = max(line.claimed_amount - max_payable * line.quantity, Decimal('0.00'))
+            else:
+                line.shortfall_amount = Decimal('0.00')
+            total += line.shortfall_amount
+        return total
+
+
+def build_tariff_index(prices: Iterable, version: Optional[str] = None) -> TariffIndex:
+    return TariffIndex(version, prices)
+
+
+def _load_tariff_index(version: Optional[str]) -> TariffIndex:
+    index = build_tariff_index(
+        ServiceTierPrice.objects.values_list(
+            'service_id', 'tier_id', 'effective_from', 'effective_to', 'max_payable_amount'
+        ).iterator(chunk_size=5000),
+        version
+    )
+    logger.info(f"Built tariff index of {len(index)} tier prices (version {version})")
+    return index
+
+
+tariff_version = CacheVersion(TARIFF_VERSION_CACHE_KEY, 'Service tariff')
+
+# Process-level cache of the tariff index
+_tariff_index = ProcessCache(tariff_version, _load_tariff_index)
+
+
+def get_tariff_version() -> Optional[str]:
+    """Get the shared tariff version stamp"""
+    return tariff_version.get()
+
+
+def bump_tariff_version() -> None:
+    """Mark the tariff index stale in every worker"""
+    tariff_version.bump()
+
+
+def get_tariff_index() -> TariffIndex:
+    """Get the tariff index, rebuilding it only when the version changed"""
+    return _tariff_index.get()
@@ -0,0 +1,151 @@
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from services.functions.compact_messages import compact_messages_enabled, encode_messages, get_message_codes
+from services.models import AdjudicationMessage, AdjudicationMessageCode, AdjudicationResult, Claim, ClaimServiceLine
+
+logger = logging.getLogger(__name__)
+
+
+class AdjudicationUnitOfWork:
+    """
+    Collects the writes of an adjudication and flushes them together
+
+    Results and messages are bulk-created and service lines bulk-updated,
+    so the write queries per claim stay the same however many lines and
+    messages it has. Claims are still saved through Claim.save, so the
+    ledgers are posted by the post_save signal. Callbacks registered with
+    on_flush (financial postings) run last, in the same transaction.
+    With compact messages (ADJUDICATION_COMPACT_MESSAGES), messages are
+    written as an array on their result instead of as rows.
+    """
+
+    def __init__(self, compact_messages: Optional[bool] = None):
+        self.compact_messages = compact_messages_enabled() if compact_messages is None else compact_messages
+        self.results: List[AdjudicationResult] = []
+        self.messages: List[Tuple] = []
+        self.claims: Dict = {}
+        self.service_lines: Dict = {}
+        self.service_line_fields = set()
+        self.superseding_claim_ids = set()
+        self.callbacks: List[Callable] = []
+
+    def add_result(self, result: AdjudicationResult) -> AdjudicationResult:
+        """Queue a new result; its primary key is already set, so messages can refer to it"""
+        self.results.append(result)
+        return result
+
+    def add_message(self, result: AdjudicationResult, code: str, description: Optional[str] = None,
+                    title: Optional[str] = None) -> None:
+        self.messages.append((result, code, description, title))
+
+    def add_messages(self, result: AdjudicationResult, messages: Iterable[Dict]) -> None:
+        """Queue engine messages, given as dicts with code and description"""
+        for message in messages:
+            self.add_message(result, message['code'], message.get('description'))
+
+    def save_claim(self, claim: Claim, fields: Iterable[str]) -> None:
+        if claim.pk in self.claims:
+            self.claims[claim.pk][1].update(fields)
+        else:
+            self.claims[claim.pk] = (claim, set(fields))
+
+    def update_service_lines(self, lines: Iterable[ClaimServiceLine], fields: Iterable[str]) -> None:
+        for line in lines:
+            self.service_lines[line.pk] = line
+        self.service_line_fields.update(fields)
+
+    def supersede_results(self, claim: Claim) -> None:
+        """Deactivate the claim's other active results when the new ones are written"""
+        self.superseding_claim_ids.add(claim.pk)
+
+    def on_flush(self, callback: Callable) -> None:
+        self.callbacks.append(callback)
+
+    def _message_codes(self) -> Dict:
+        codes = {code for _, code, _, _ in self.messages}
+        if not codes:
+            return {}
+        return AdjudicationMessageCode.objects.in_bulk(codes, field_name='code')
+
+    def _compact_messages(self, message_codes: Dict) -> None:
+        """Set each result's compact message array (empty when it has no messages)"""
+        messages = {result.pk: [] for result in self.results}
+        for result, code, description, title in self.messages:
+            if code not in message_codes:
+                logger.warning(f"Unknown adjudication message code {code}, message not recorded")
+                continue
+            messages.setdefault(result.pk, []).append((code, description, title))
+
+        for result in self.results:
+            result.compact_messages = encode_messages(messages[result.pk])
+
+    def _build_messages(self, message_codes: Dict) -> List[AdjudicationMessage]:
+        messages, sequence = [], {}
+        for result, code, description, title in self.messages:
+            message_code = message_codes.get(code)
+            if message_code is None:
+                logger.warning(f"Unknown adjudication message code {code}, message not recorded")
+                continue
+
+            sequence[result.pk] = sequence.get(result.pk, 0) + 1
+            messages.append(AdjudicationMessage(
+                adjudication_result=result,
+                message_code=message_code,
+                custom_title=title,
+                custom_description=description,
+                sequence_number=sequence[result.pk]
+            ))
+        return messages
+
+    def clear(self) -> None:
+        self.results = []
+        self.messages = []
+        self.claims = {}
+        self.service_lines = {}
+        self.service_line_fields = set()
+        self.superseding_claim_ids = set()
+        self.callbacks = []
+
+    def flush(self) -> None:
+        """Write everything collected so far in one transaction"""
+
+        try:
+            if self.compact_messages:
+                self._compact_messages(get_message_codes())
+                messages = []
+            else:
+                messages = self._build_messages(self._message_codes())
+            now = timezone.now()
+
+            with transaction.atomic():
+                if self.results:
+                    AdjudicationResult.objects.bulk_create(self.results)
+
+                if messages:
+                    AdjudicationMessage.objects.bulk_create(messages)
+
+                if self.superseding_claim_ids:
+                    AdjudicationResult.objects.filter(
+                        claim_id__in=self.superseding_claim_ids,
+                        is_active=True
+                    ).exclude(id__in=[result.pk for result in self.results]).update(is_active=False)
+
+                for claim, fields in self.claims.values():
+                    claim.save(update_fields=sorted(fields | {'updated_at'}))
+
+                if self.service_lines:
+                    for line in self.service_lines.values():
+                        line.updated_at = now
+                    ClaimServiceLine.objects.bulk_update(
+                        list(self.service_lines.values()),
+                        sorted(self.service_line_fields | {'updated_at'})
+                    )
+
+                for callback in self.callbacks:
+                    callback()
+        finally:
+            self.clear()
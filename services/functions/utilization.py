@@ -0,0 +1,437 @@
+import logging
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import ExtractYear
+from django.utils import timezone
+
+from services.models import (
+    Claim, ClaimServiceLine, BeneficiaryUtilization, BeneficiaryCategoryUtilization,
+    BeneficiaryServiceVisit
+)
+
+logger = logging.getLogger(__name__)
+
+# Claim statuses that count towards a beneficiary's utilization
+UTILIZED_STATUSES = ('A', 'P')
+
+CENT = Decimal('0.01')
+
+# Look-back windows for visit frequency limits
+MONTHLY_VISIT_WINDOW_DAYS = 30
+ANNUAL_VISIT_WINDOW_DAYS = 365
+
+
+def _is_utilized(status, reversed_) -> bool:
+    return status in UTILIZED_STATUSES and not reversed_
+
+
+def _allocate(amount: Decimal, weights: Dict) -> Dict:
+    """Split an amount across categories in proportion to their weights"""
+
+    total_weight = sum(weights.values(), Decimal('0.00'))
+    if not weights or total_weight <= 0:
+        return {}
+
+    allocation = {}
+    allocated = Decimal('0.00')
+    categories = sorted(weights, key=lambda category: weights[category])
+    for category in categories[:-1]:
+        share = (amount * weights[category] / total_weight).quantize(CENT, rounding=ROUND_HALF_UP)
+        allocation[category] = share
+        allocated += share
+
+    # The largest category absorbs the rounding remainder
+    allocation[categories[-1]] = amount - allocated
+    return allocation
+
+
+def _claim_lines(claim_id) -> List[Tuple]:
+    """(service, service provider type, claimed amount) for each line on a claim"""
+
+    return list(
+        ClaimServiceLine.objects.filter(claim_id=claim_id).values_list(
+            'service_id', 'service__service_provider_type_id', 'claimed_amount'
+        )
+    )
+
+
+def _category_weights(lines: List[Tuple]) -> Dict:
+    """Claimed amount per service provider type"""
+
+    weights = defaultdict(lambda: Decimal('0.00'))
+    for _, category_id, claimed_amount in lines:
+        weights[category_id] += claimed_amount
+    return dict(weights)
+
+
+def _post(beneficiary_id, benefit_year: int, amount: Decimal, claim_count: int, categories: Dict) -> None:
+    """Apply a delta to the annual and per-category ledger rows"""
+
+    row, _ = BeneficiaryUtilization.objects.get_or_create(
+        beneficiary_id=beneficiary_id,
+        benefit_year=benefit_year
+    )
+    BeneficiaryUtilization.objects.filter(pk=row.pk).update(
+        total_amount=F('total_amount') + amount,
+        claim_count=F('claim_count') + claim_count
+    )
+
+    for category_id, category_amount in categories.items():
+        row, _ = BeneficiaryCategoryUtilization.objects.get_or_create(
+            beneficiary_id=beneficiary_id,
+            benefit_year=benefit_year,
+            service_provider_type_id=category_id
+        )
+        BeneficiaryCategoryUtilization.objects.filter(pk=row.pk).update(
+            total_amount=F('total_amount') + category_amount,
+            claim_count=F('claim_count') + claim_count
+        )
+
+
+def _post_visits(beneficiary_id, claim_id, visit_date: date, service_ids: Iterable, visit_count: int) -> None:
+    """Apply a delta to the claim's visit rows for each of its services"""
+
+    for service_id in set(service_ids):
+        row, _ = BeneficiaryServiceVisit.objects.get_or_create(
+            beneficiary_id=beneficiary_id,
+            service_id=service_id,
+            visit_date=visit_date,
+            claim_id=claim_id
+        )
+        BeneficiaryServiceVisit.objects.filter(pk=row.pk).update(
+            visit_count=F('visit_count') + visit_count
+        )
+
+
+def record_claim_utilization(claim: Claim) -> None:
+    """
+    Post the change in a claim's utilization to the ledger
+
+    Compares the claim with the values it was loaded with (see
+    Claim.from_db) and moves its adjudicated amount in or out of the
+    beneficiary's annual and per-category totals, and its services in or
+    out of the visit rows. Runs inside the caller's transaction so
+    the ledger always moves together with the claim.
+    """
+
+    loaded = getattr(claim, '_loaded_values', None) or {}
+
+    was_utilized = _is_utilized(loaded.get('status'), loaded.get('reversed'))
+    is_utilized = _is_utilized(claim.status, claim.reversed)
+
+    previous_amount = loaded.get('adjudicated_amount') or Decimal('0.00')
+    previous_year = loaded['start_date'].year if loaded.get('start_date') else None
+    current_year = claim.start_date.year
+
+    unchanged = (
+        was_utilized == is_utilized and (
+            not is_utilized or (
+                previous_amount == claim.adjudicated_amount and
+                previous_year == current_year and
+                loaded.get('beneficiary_id') == claim.beneficiary_id
+            )
+        )
+    )
+
+    if not unchanged:
+        lines = _claim_lines(claim.pk)
+        weights = _category_weights(lines)
+        service_ids = [service_id for service_id, _, _ in lines]
+
+        # A visit only moves when the claim enters or leaves utilization, or its date or beneficiary changes
+        visits_moved = was_utilized != is_utilized or (
+            loaded.get('start_date') != claim.start_date or
+            loaded.get('beneficiary_id') != claim.beneficiary_id
+        )
+
+        with transaction.atomic():
+            if was_utilized:
+                _post(
+                    loaded['beneficiary_id'], previous_year,
+                    -previous_amount, -1, _allocate(-previous_amount, weights)
+                )
+                if visits_moved:
+                    _post_visits(loaded['beneficiary_id'], claim.pk, loaded['start_date'], service_ids, -1)
+
+            if is_utilized:
+                _post(
+                    claim.beneficiary_id, current_year,
+                    claim.adjudicated_amount, 1, _allocate(claim.adjudicated_amount, weights)
+                )
+                if visits_moved:
+                    _post_visits(claim.beneficiary_id, claim.pk, claim.start_date, service_ids, 1)
+
+
+def remove_claim_utilization(claim: Claim) -> None:
+    """Remove a deleted claim's contribution from the ledger"""
+
+    loaded = getattr(claim, '_loaded_values', None) or {}
+    if not _is_utilized(loaded.get('status'), loaded.get('reversed')):
+        return
+
+    lines = _claim_lines(claim.pk)
+    amount = loaded.get('adjudicated_amount') or Decimal('0.00')
+    _post(
+        loaded['beneficiary_id'], loaded['start_date'].year,
+        -amount, -1, _allocate(-amount, _category_weights(lines))
+    )
+    _post_visits(
+        loaded['beneficiary_id'], claim.pk, loaded['start_date'],
+        [service_id for service_id, _, _ in lines], -1
+    )
+
+
+def get_annual_utilization(beneficiary_id, benefit_year: Optional[int] = None) -> Decimal:
+    """Get a beneficiary's utilized amount for a benefit year"""
+
+    benefit_year = benefit_year or timezone.now().year
+
+    total = BeneficiaryUtilization.objects.filter(
+        beneficiary_id=beneficiary_id,
+        benefit_year=benefit_year
+    ).values_list('total_amount', flat=True).first()
+
+    return total or Decimal('0.00')
+
+
+def get_category_utilization(beneficiary_id, benefit_year: Optional[int] = None) -> Dict:
+    """Get a beneficiary's utilized amount per service provider type for a benefit year"""
+
+    benefit_year = benefit_year or timezone.now().year
+
+    return dict(
+        BeneficiaryCategoryUtilization.objects.filter(
+            beneficiary_id=beneficiary_id,
+            benefit_year=benefit_year
+        ).values_list('service_provider_type_id', 'total_amount')
+    )
+
+
+class ServiceVisitHistory:
+    """
+    A beneficiary's visits to a set of services
+
+    Visits are kept per service as dates sorted with the claim of each
+    visit, so a window is two binary searches per service. A claim billing
+    several of the services counts as one visit.
+    """
+
+    def __init__(self, visits: Iterable[Tuple] = ()):
+        net = defaultdict(int)
+        for claim_id, service_id, visit_date, visit_count in visits:
+            net[(service_id, visit_date, claim_id)] += visit_count
+
+        by_service = defaultdict(list)
+        for (service_id, visit_date, claim_id), visit_count in net.items():
+            if visit_count > 0:
+                by_service[service_id].append((visit_date, claim_id))
+
+        self._dates: Dict = {}
+        self._claims: Dict = {}
+        for service_id, service_visits in by_service.items():
+            service_visits.sort(key=lambda visit: visit[0])
+            self._dates[service_id] = [visit_date for visit_date, _ in service_visits]
+            self._claims[service_id] = [claim_id for _, claim_id in service_visits]
+
+    def count(self, service_ids: Iterable, since: date, until: date) -> int:
+        """Claims with a visit to any of the services between two dates, inclusive"""
+
+        claims = set()
+        for service_id in service_ids:
+            dates = self._dates.get(service_id)
+            if not dates:
+                continue
+            start = bisect_left(dates, since)
+            end = bisect_right(dates, until)
+            claims.update(self._claims[service_id][start:end])
+        return len(claims)
+
+    def count_in_window(self, service_ids: Iterable, on_date: date, days: int) -> int:
+        """Visits to any of the services in the given number of days up to a date"""
+        return self.count(service_ids, on_date - timedelta(days=days), on_date)
+
+
+def get_service_visit_history(beneficiary_id, service_ids: Iterable, on_date: Optional[date] = None,
+                              days: int = ANNUAL_VISIT_WINDOW_DAYS) -> ServiceVisitHistory:
+    """Load a beneficiary's visits to the given services over a window ending on a date"""
+
+    on_date = on_date or timezone.now().date()
+
+    return ServiceVisitHistory(
+        BeneficiaryServiceVisit.objects.filter(
+            beneficiary_id=beneficiary_id,
+            service_id__in=list(service_ids),
+            visit_date__gte=on_date - timedelta(days=days),
+            visit_date__lte=on_date,
+            visit_count__gt=0
+        ).values_list('claim_id', 'service_id', 'visit_date', 'visit_count')
+    )
+
+
+class UtilizationHistory:
+    """
+    Beneficiaries' utilized claims, to total their utilization as of a date
+
+    Each claim keeps its start date and its adjudicated amount split across
+    categories the same way ledger postings split it, so the totals match
+    what the ledger held once the claims up to that date were posted.
+    """
+
+    def __init__(self, claims: Iterable[Tuple] = (), lines: Iterable[Tuple] = ()):
+        weights = defaultdict(lambda: defaultdict(lambda: Decimal('0.00')))
+        for claim_id, category_id, claimed_amount in lines:
+            weights[claim_id][category_id] += claimed_amount
+
+        self._claims = defaultdict(list)
+        for claim_id, beneficiary_id, start_date, amount in claims:
+            amount = amount or Decimal('0.00')
+            self._claims[beneficiary_id].append(
+                (claim_id, start_date, amount, _allocate(amount, dict(weights[claim_id])))
+            )
+
+    def totals(self, beneficiary_id, on_date: date, exclude_claim_id=None) -> Tuple[Decimal, Dict]:
+        """Annual and per-category totals of the benefit year up to a date, inclusive"""
+
+        annual = Decimal('0.00')
+        categories = defaultdict(lambda: Decimal('0.00'))
+        for claim_id, start_date, amount, allocation in self._claims.get(beneficiary_id, ()):
+            if claim_id == exclude_claim_id or start_date.year != on_date.year or start_date > on_date:
+                continue
+            annual += amount
+            for category_id, category_amount in allocation.items():
+                categories[category_id] += category_amount
+        return annual, dict(categories)
+
+
+def get_utilization_history(beneficiary_ids: Iterable, benefit_years: Iterable[int]) -> UtilizationHistory:
+    """Load the utilized claims of beneficiaries in the given benefit years"""
+
+    claims = Claim.objects.filter(
+        beneficiary_id__in=list(beneficiary_ids),
+        start_date__year__in=list(benefit_years),
+        status__in=UTILIZED_STATUSES,
+        reversed=False
+    )
+
+    return UtilizationHistory(
+        claims.values_list('id', 'beneficiary_id', 'start_date', 'adjudicated_amount'),
+        ClaimServiceLine.objects.filter(claim__in=claims).values_list(
+            'claim_id', 'service__service_provider_type_id', 'claimed_amount'
+        )
+    )
+
+
+def rebuild_utilization(beneficiary_ids: Optional[Iterable] = None,
+                        benefit_years: Optional[Iterable[int]] = None) -> Dict:
+    """
+    Rebuild the utilization ledger from claim history
+
+    Replaces the ledger rows in scope (all beneficiaries and years by
+    default) with totals and visit rows recomputed from approved and paid
+    claims.
+    """
+
+    claims = Claim.objects.filter(status__in=UTILIZED_STATUSES, reversed=False)
+    annual_rows = BeneficiaryUtilization.objects.all()
+    category_rows = BeneficiaryCategoryUtilization.objects.all()
+    visit_rows = BeneficiaryServiceVisit.objects.all()
+
+    if beneficiary_ids is not None:
+        beneficiary_ids = list(beneficiary_ids)
+        claims = claims.filter(beneficiary_id__in=beneficiary_ids)
+        annual_rows = annual_rows.filter(beneficiary_id__in=beneficiary_ids)
+        category_rows = category_rows.filter(beneficiary_id__in=beneficiary_ids)
+        visit_rows = visit_rows.filter(beneficiary_id__in=beneficiary_ids)
+
+    if benefit_years is not None:
+        benefit_years = list(benefit_years)
+        claims = claims.filter(start_date__year__in=benefit_years)
+        annual_rows = annual_rows.filter(benefit_year__in=benefit_years)
+        category_rows = category_rows.filter(benefit_year__in=benefit_years)
+        visit_rows = visit_rows.filter(visit_date__year__in=benefit_years)
+
+    annual = [
+        BeneficiaryUtilization(
+            beneficiary_id=row['beneficiary_id'],
+            benefit_year=row['benefit_year'],
+            total_amount=row['total'] or Decimal('0.00'),
+            claim_count=row['count']
+        )
+        for row in claims.annotate(
+            benefit_year=ExtractYear('start_date')
+        ).values('beneficiary_id', 'benefit_year').annotate(
+            total=Sum('adjudicated_amount'),
+            count=Count('id')
+        ).order_by()
+    ]
+
+    # Split each claim across categories the same way incremental postings do
+    claim_lines = defaultdict(lambda: defaultdict(lambda: Decimal('0.00')))
+    claim_info = {}
+    for claim_id, beneficiary_id, start_date, amount, category_id, claimed_amount in ClaimServiceLine.objects.filter(
+        claim__in=claims
+    ).values_list(
+        'claim_id', 'claim__beneficiary_id', 'claim__start_date', 'claim__adjudicated_amount',
+        'service__service_provider_type_id', 'claimed_amount'
+    ).iterator():
+        claim_lines[claim_id][category_id] += claimed_amount
+        claim_info[claim_id] = (beneficiary_id, start_date.year, amount)
+
+    category_totals = defaultdict(lambda: [Decimal('0.00'), 0])
+    for claim_id, weights in claim_lines.items():
+        beneficiary_id, benefit_year, amount = claim_info[claim_id]
+        for category_id, category_amount in _allocate(amount, dict(weights)).items():
+            totals = category_totals[(beneficiary_id, benefit_year, category_id)]
+            totals[0] += category_amount
+            totals[1] += 1
+
+    category = [
+        BeneficiaryCategoryUtilization(
+            beneficiary_id=beneficiary_id,
+            benefit_year=benefit_year,
+            service_provider_type_id=category_id,
+            total_amount=total_amount,
+            claim_count=claim_count
+        )
+        for (beneficiary_id, benefit_year, category_id), (total_amount, claim_count) in category_totals.items()
+    ]
+
+    visits = [
+        BeneficiaryServiceVisit(
+            beneficiary_id=beneficiary_id,
+            service_id=service_id,
+            visit_date=visit_date,
+            claim_id=claim_id,
+            visit_count=1
+        )
+        for claim_id, beneficiary_id, service_id, visit_date in ClaimServiceLine.objects.filter(
+            claim__in=claims
+        ).values_list(
+            'claim_id', 'claim__beneficiary_id', 'service_id', 'claim__start_date'
+        ).distinct().order_by()
+    ]
+
+    with transaction.atomic():
+        annual_rows.delete()
+        category_rows.delete()
+        visit_rows.delete()
+        BeneficiaryUtilization.objects.bulk_create(annual, batch_size=1000)
+        BeneficiaryCategoryUtilization.objects.bulk_create(category, batch_size=1000)
+        BeneficiaryServiceVisit.objects.bulk_create(visits, batch_size=1000)
+
+    # Cached eligibility snapshots carry the old totals
+    from services.functions.eligibility import bump_eligibility_version
+    transaction.on_commit(bump_eligibility_version)
+
+    logger.info(
+        f"Rebuilt utilization ledger: {len(annual)} annual rows, {len(category)} category rows, "
+        f"{len(visits)} visit rows"
+    )
+
+    return {'annual_rows': len(annual), 'category_rows': len(category), 'visit_rows': len(visits)}
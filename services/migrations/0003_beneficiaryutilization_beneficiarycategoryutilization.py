@@ -0,0 +1,54 @@
+# Generated by Django 5.2.4 on 2026-10-19 09:00
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configurations', '0007_importresult_importerror_importsuccess'),
+        ('membership', '0006_remove_topup_net_amount_topup_photo'),
+        ('services', '0002_adjudicationresult_additional_conditions_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BeneficiaryUtilization',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('benefit_year', models.PositiveIntegerField(verbose_name='Benefit Year')),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Total Utilized Amount')),
+                ('claim_count', models.IntegerField(default=0, verbose_name='Claim Count')),
+                ('beneficiary', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='utilization', to='membership.beneficiary', verbose_name='Beneficiary')),
+            ],
+            options={
+                'verbose_name': 'Beneficiary Utilization',
+                'verbose_name_plural': 'Beneficiary Utilization',
+                'ordering': ['beneficiary', '-benefit_year'],
+                'unique_together': {('beneficiary', 'benefit_year')},
+            },
+        ),
+        migrations.CreateModel(
+            name='BeneficiaryCategoryUtilization',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('benefit_year', models.PositiveIntegerField(verbose_name='Benefit Year')),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Total Utilized Amount')),
+                ('claim_count', models.IntegerField(default=0, verbose_name='Claim Count')),
+                ('beneficiary', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='category_utilization', to='membership.beneficiary', verbose_name='Beneficiary')),
+                ('service_provider_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='beneficiary_utilization', to='configurations.serviceprovidertype', verbose_name='Category')),
+            ],
+            options={
+                'verbose_name': 'Beneficiary Category Utilization',
+                'verbose_name_plural': 'Beneficiary Category Utilization',
+                'ordering': ['beneficiary', '-benefit_year', 'service_provider_type'],
+                'unique_together': {('beneficiary', 'benefit_year', 'service_provider_type')},
+            },
+        ),
+    ]
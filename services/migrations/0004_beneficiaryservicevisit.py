@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-19 09:30
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configurations', '0007_importresult_importerror_importsuccess'),
+        ('membership', '0006_remove_topup_net_amount_topup_photo'),
+        ('services', '0003_beneficiaryutilization_beneficiarycategoryutilization'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BeneficiaryServiceVisit',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('visit_date', models.DateField(verbose_name='Visit Date')),
+                ('visit_count', models.IntegerField(default=0, verbose_name='Visit Count')),
+                ('beneficiary', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='service_visits', to='membership.beneficiary', verbose_name='Beneficiary')),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='beneficiary_visits', to='configurations.service', verbose_name='Service')),
+            ],
+            options={
+                'verbose_name': 'Beneficiary Service Visit',
+                'verbose_name_plural': 'Beneficiary Service Visits',
+                'ordering': ['beneficiary', 'service', '-visit_date'],
+                'unique_together': {('beneficiary', 'service', 'visit_date')},
+            },
+        ),
+    ]
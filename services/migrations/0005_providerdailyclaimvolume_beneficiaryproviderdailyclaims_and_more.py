@@ -0,0 +1,68 @@
+# Generated by Django 5.2.4 on 2026-10-19 10:15
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configurations', '0007_importresult_importerror_importsuccess'),
+        ('membership', '0006_remove_topup_net_amount_topup_photo'),
+        ('services', '0004_beneficiaryservicevisit'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProviderDailyClaimVolume',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('claim_date', models.DateField(verbose_name='Claim Date')),
+                ('claim_count', models.IntegerField(default=0, verbose_name='Claim Count')),
+                ('provider', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_claim_volume', to='configurations.serviceprovider', verbose_name='Service Provider')),
+            ],
+            options={
+                'verbose_name': 'Provider Daily Claim Volume',
+                'verbose_name_plural': 'Provider Daily Claim Volumes',
+                'ordering': ['provider', '-claim_date'],
+                'unique_together': {('provider', 'claim_date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='BeneficiaryProviderDailyClaims',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('claim_date', models.DateField(verbose_name='Claim Date')),
+                ('claim_count', models.IntegerField(default=0, verbose_name='Claim Count')),
+                ('claim_amount', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Adjudicated Amount')),
+                ('beneficiary', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_provider_claims', to='membership.beneficiary', verbose_name='Beneficiary')),
+                ('provider', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_beneficiary_claims', to='configurations.serviceprovider', verbose_name='Service Provider')),
+            ],
+            options={
+                'verbose_name': 'Beneficiary Provider Daily Claims',
+                'verbose_name_plural': 'Beneficiary Provider Daily Claims',
+                'ordering': ['beneficiary', '-claim_date'],
+                'indexes': [models.Index(fields=['beneficiary', 'claim_date'], name='services_be_benefic_7c41d2_idx')],
+                'unique_together': {('beneficiary', 'provider', 'claim_date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ClaimInvoiceFingerprint',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('fingerprint', models.CharField(db_index=True, max_length=64, verbose_name='Fingerprint')),
+                ('claim', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='invoice_fingerprint', to='services.claim', verbose_name='Claim')),
+            ],
+            options={
+                'verbose_name': 'Claim Invoice Fingerprint',
+                'verbose_name_plural': 'Claim Invoice Fingerprints',
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-19 11:00
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0005_providerdailyclaimvolume_beneficiaryproviderdailyclaims_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClaimAmountStatistics',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('scope', models.CharField(choices=[('B', 'Beneficiary'), ('P', 'Service Provider'), ('S', 'Service')], max_length=1, verbose_name='Scope')),
+                ('subject_id', models.UUIDField(verbose_name='Subject')),
+                ('observations', models.IntegerField(default=0, verbose_name='Observations')),
+                ('weight', models.FloatField(default=0, verbose_name='Decayed Weight')),
+                ('amount_sum', models.FloatField(default=0, verbose_name='Decayed Amount Sum')),
+                ('amount_square_sum', models.FloatField(default=0, verbose_name='Decayed Amount Square Sum')),
+                ('as_of', models.DateField(blank=True, null=True, verbose_name='As Of')),
+            ],
+            options={
+                'verbose_name': 'Claim Amount Statistics',
+                'verbose_name_plural': 'Claim Amount Statistics',
+                'ordering': ['scope', 'subject_id'],
+                'unique_together': {('scope', 'subject_id')},
+            },
+        ),
+    ]
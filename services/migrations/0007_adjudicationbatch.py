@@ -0,0 +1,43 @@
+# Generated by Django 5.2.4 on 2026-10-19 11:45
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0006_claimamountstatistics'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdjudicationBatch',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('status', models.CharField(choices=[('Q', 'Queued'), ('R', 'Running'), ('C', 'Completed'), ('F', 'Failed')], default='Q', max_length=1, verbose_name='Status')),
+                ('total_claims', models.IntegerField(default=0, verbose_name='Total Claims')),
+                ('chunk_count', models.IntegerField(default=0, verbose_name='Chunks')),
+                ('chunks_completed', models.IntegerField(default=0, verbose_name='Chunks Completed')),
+                ('processed', models.IntegerField(default=0, verbose_name='Processed')),
+                ('approved', models.IntegerField(default=0, verbose_name='Approved')),
+                ('declined', models.IntegerField(default=0, verbose_name='Declined')),
+                ('pending_review', models.IntegerField(default=0, verbose_name='Pending Review')),
+                ('pending_clinical', models.IntegerField(default=0, verbose_name='Pending Clinical')),
+                ('errors', models.IntegerField(default=0, verbose_name='Errors')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Started At')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='Completed At')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='adjudication_batches', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+            ],
+            options={
+                'verbose_name': 'Adjudication Batch',
+                'verbose_name_plural': 'Adjudication Batches',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
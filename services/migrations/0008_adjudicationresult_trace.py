@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0007_adjudicationbatch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='adjudicationresult',
+            name='trace',
+            field=models.JSONField(blank=True, null=True, verbose_name='Processing Trace'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0008_adjudicationresult_trace'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='claim',
+            name='content_fingerprint',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, null=True, verbose_name='Content Fingerprint'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-19 14:10
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0009_claim_content_fingerprint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewQueueItem',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('clinical', models.BooleanField(default=False, verbose_name='Clinical Review')),
+                ('claimed_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Claimed Amount')),
+                ('queued_at', models.DateTimeField(verbose_name='Queued At')),
+                ('due_at', models.DateTimeField(verbose_name='Due At')),
+                ('leased_until', models.DateTimeField(blank=True, null=True, verbose_name='Leased Until')),
+                ('assigned_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='review_queue_items', to=settings.AUTH_USER_MODEL, verbose_name='Assigned To')),
+                ('claim', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='review_queue_item', to='services.claim', verbose_name='Claim')),
+            ],
+            options={
+                'verbose_name': 'Review Queue Item',
+                'verbose_name_plural': 'Review Queue Items',
+                'ordering': ['due_at'],
+                'indexes': [models.Index(fields=['due_at'], name='services_re_due_at_8572c4_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.4 on 2026-10-19 14:40
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0010_reviewqueueitem'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdjudicatorDailyMetrics',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('decisions', models.IntegerField(default=0, verbose_name='Decisions')),
+                ('approved', models.IntegerField(default=0, verbose_name='Approved')),
+                ('declined', models.IntegerField(default=0, verbose_name='Declined')),
+                ('modified', models.IntegerField(default=0, verbose_name='Modified')),
+                ('claimed_amount', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Claimed Amount')),
+                ('adjudicated_amount', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Adjudicated Amount')),
+                ('turnaround_seconds', models.BigIntegerField(default=0, verbose_name='Total Turnaround (seconds)')),
+                ('turnaround_count', models.IntegerField(default=0, verbose_name='Decisions With Turnaround')),
+                ('adjudicator', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_metrics', to=settings.AUTH_USER_MODEL, verbose_name='Adjudicator')),
+            ],
+            options={
+                'verbose_name': 'Adjudicator Daily Metrics',
+                'verbose_name_plural': 'Adjudicator Daily Metrics',
+                'ordering': ['-date', 'adjudicator'],
+                'unique_together': {('adjudicator', 'date')},
+            },
+        ),
+    ]
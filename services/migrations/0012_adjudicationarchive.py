@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:05
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0011_adjudicatordailymetrics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdjudicationArchive',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('partition', models.CharField(db_index=True, max_length=7, verbose_name='Partition')),
+                ('period_start', models.DateTimeField(verbose_name='Period Start')),
+                ('period_end', models.DateTimeField(verbose_name='Period End')),
+                ('result_count', models.IntegerField(default=0, verbose_name='Results')),
+                ('message_count', models.IntegerField(default=0, verbose_name='Messages')),
+                ('override_count', models.IntegerField(default=0, verbose_name='Overrides')),
+                ('payload', models.BinaryField(verbose_name='Payload')),
+                ('claim', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='adjudication_archives', to='services.claim', verbose_name='Claim')),
+            ],
+            options={
+                'verbose_name': 'Adjudication Archive',
+                'verbose_name_plural': 'Adjudication Archives',
+                'ordering': ['-period_end'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0012_adjudicationarchive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='adjudicationresult',
+            name='compact_messages',
+            field=models.JSONField(blank=True, null=True, verbose_name='Compact Messages'),
+        ),
+    ]
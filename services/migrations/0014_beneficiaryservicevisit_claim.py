@@ -0,0 +1,52 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def clear_visits(apps, schema_editor):
+    # Daily totals cannot be split back into claims; they are rebuilt below
+    apps.get_model('services', 'BeneficiaryServiceVisit').objects.all().delete()
+
+
+def rebuild_visits(apps, schema_editor):
+    BeneficiaryServiceVisit = apps.get_model('services', 'BeneficiaryServiceVisit')
+    ClaimServiceLine = apps.get_model('services', 'ClaimServiceLine')
+
+    rows = ClaimServiceLine.objects.filter(
+        claim__status__in=['A', 'P'], claim__reversed=False
+    ).values_list('claim_id', 'claim__beneficiary_id', 'service_id', 'claim__start_date').distinct().order_by()
+
+    BeneficiaryServiceVisit.objects.bulk_create([
+        BeneficiaryServiceVisit(
+            claim_id=claim_id, beneficiary_id=beneficiary_id, service_id=service_id, visit_date=visit_date,
+            visit_count=1
+        )
+        for claim_id, beneficiary_id, service_id, visit_date in rows.iterator()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0013_adjudicationresult_compact_messages'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_visits, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='beneficiaryservicevisit',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='beneficiaryservicevisit',
+            name='claim',
+            field=models.ForeignKey(default=None, on_delete=django.db.models.deletion.CASCADE, related_name='service_visits', to='services.claim', verbose_name='Claim'),
+            preserve_default=False,
+        ),
+        migrations.AlterUniqueTogether(
+            name='beneficiaryservicevisit',
+            unique_together={('beneficiary', 'service', 'visit_date', 'claim')},
+        ),
+        migrations.RunPython(rebuild_visits, migrations.RunPython.noop),
+    ]
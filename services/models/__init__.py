@@ -4,6 +4,12 @@ from .statement import ProviderPaymentStatement
 from .adjudication import AdjudicationMessage, AdjudicationMessageCode, AdjudicationResult, AdjudicationRule, AdjudicationRuleApplication
 from .adjudiation_code import AdjudicationMessageCodeData
 from .adjudication_override import AdjudicationOverride
+from .utilization import BeneficiaryUtilization, BeneficiaryCategoryUtilization, BeneficiaryServiceVisit
+from .fraud_signal import ProviderDailyClaimVolume, BeneficiaryProviderDailyClaims, ClaimInvoiceFingerprint, ClaimAmountStatistics
+from .adjudication_batch import AdjudicationBatch
+from .review_queue import ReviewQueueItem
+from .adjudicator_metrics import AdjudicatorDailyMetrics
+from .adjudication_archive import AdjudicationArchive
 __all__ = [
     'ServiceRequest',
     'ServiceRequestItem',
@@ -17,5 +23,16 @@ __all__ = [
     'AdjudicationRuleApplication',
     'Claim',
     'AdjudicationMessageCodeData',
-    'AdjudicationOverride'
+    'AdjudicationOverride',
+    'BeneficiaryUtilization',
+    'BeneficiaryCategoryUtilization',
+    'BeneficiaryServiceVisit',
+    'ProviderDailyClaimVolume',
+    'BeneficiaryProviderDailyClaims',
+    'ClaimInvoiceFingerprint',
+    'ClaimAmountStatistics',
+    'AdjudicationBatch',
+    'ReviewQueueItem',
+    'AdjudicatorDailyMetrics',
+    'AdjudicationArchive',
 ]
@@ -58,6 +58,9 @@ class AdjudicationMessageCodeData:
         ("PACK003", "Waiting Period Active", "Service is in waiting period", "ERROR"),
         ("PACK004", "Co-payment Applied", "Co-payment has been applied", "INFO"),
 
+        # Tariff Messages (TARF)
+        ("TARF001", "Tariff Applied", "Amount reduced to the maximum payable tariff", "WARNING"),
+
         # Age-related Messages (AGER)
         ("AGER001", "Age Restriction", "Service has age restrictions", "ERROR"),
         ("AGER002", "Pediatric Service", "Service approved for pediatric beneficiary", "INFO"),
@@ -277,6 +277,12 @@ class AdjudicationResult(BaseModel):
     # Tracking
     is_active = models.BooleanField(default=True, verbose_name="Is Active")
 
+    # Per-step timings and query counts of automatic adjudication (see adjudication_trace)
+    trace = models.JSONField(null=True, blank=True, verbose_name="Processing Trace")
+
+    # Ordered [code, description, title] messages, used instead of AdjudicationMessage rows (see compact_messages)
+    compact_messages = models.JSONField(null=True, blank=True, verbose_name="Compact Messages")
+
 
     @property
     def is_overridden(self):
@@ -287,6 +293,12 @@ class AdjudicationResult(BaseModel):
     def final_payment_amount(self):
         return self.adjudicated_amount - self.withheld_amount
 
+    def get_messages(self):
+        """The result's messages in order, from the compact array or the message rows"""
+        from services.functions.compact_messages import get_result_messages
+
+        return get_result_messages(self)
+
     def __str__(self):
         entity = self.claim or self.service_request
         return f"Adjudication: {entity} - {self.get_result_display()}"
@@ -0,0 +1,27 @@
+from django.db import models
+
+from configurations.models.base_model import BaseModel
+
+
+class AdjudicationArchive(BaseModel):
+    claim = models.ForeignKey('services.Claim', on_delete=models.CASCADE, related_name="adjudication_archives", verbose_name="Claim")
+
+    # Month of the newest archived result (YYYY-MM), so whole periods can be found and dropped together
+    partition = models.CharField(max_length=7, db_index=True, verbose_name="Partition")
+    period_start = models.DateTimeField(verbose_name="Period Start")
+    period_end = models.DateTimeField(verbose_name="Period End")
+
+    result_count = models.IntegerField(default=0, verbose_name="Results")
+    message_count = models.IntegerField(default=0, verbose_name="Messages")
+    override_count = models.IntegerField(default=0, verbose_name="Overrides")
+
+    # zlib-compressed JSON of the archived results, messages, rule applications and overrides
+    payload = models.BinaryField(verbose_name="Payload")
+
+    def __str__(self):
+        return f"{self.claim} - {self.partition}: {self.result_count} results"
+
+    class Meta:
+        ordering = ["-period_end"]
+        verbose_name = "Adjudication Archive"
+        verbose_name_plural = "Adjudication Archives"
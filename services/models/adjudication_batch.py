@@ -0,0 +1,43 @@
+from django.db import models
+
+from configurations.models.base_model import BaseModel
+
+
+class AdjudicationBatch(BaseModel):
+    STATUS_CHOICES = [
+        ("Q", "Queued"),
+        ("R", "Running"),
+        ("C", "Completed"),
+        ("F", "Failed"),
+    ]
+    status = models.CharField(max_length=1, choices=STATUS_CHOICES, default="Q", verbose_name="Status")
+    created_by = models.ForeignKey('authentication.User', on_delete=models.SET_NULL, null=True, blank=True, related_name="adjudication_batches", verbose_name="Created By")
+
+    total_claims = models.IntegerField(default=0, verbose_name="Total Claims")
+    chunk_count = models.IntegerField(default=0, verbose_name="Chunks")
+    chunks_completed = models.IntegerField(default=0, verbose_name="Chunks Completed")
+
+    # Progress counters, updated as each chunk reports in
+    processed = models.IntegerField(default=0, verbose_name="Processed")
+    approved = models.IntegerField(default=0, verbose_name="Approved")
+    declined = models.IntegerField(default=0, verbose_name="Declined")
+    pending_review = models.IntegerField(default=0, verbose_name="Pending Review")
+    pending_clinical = models.IntegerField(default=0, verbose_name="Pending Clinical")
+    errors = models.IntegerField(default=0, verbose_name="Errors")
+
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="Started At")
+    completed_at = models.DateTimeField(null=True, blank=True, verbose_name="Completed At")
+
+    @property
+    def progress_percentage(self):
+        if not self.total_claims:
+            return 100
+        return round((self.processed + self.errors) * 100 / self.total_claims, 1)
+
+    def __str__(self):
+        return f"Adjudication batch {self.created_at:%Y-%m-%d %H:%M} ({self.get_status_display()})"
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Adjudication Batch"
+        verbose_name_plural = "Adjudication Batches"
@@ -0,0 +1,29 @@
+from django.db import models
+
+from configurations.models.base_model import BaseModel
+
+
+class AdjudicatorDailyMetrics(BaseModel):
+    adjudicator = models.ForeignKey('authentication.User', on_delete=models.CASCADE, related_name="daily_metrics", verbose_name="Adjudicator")
+    date = models.DateField(verbose_name="Date")
+
+    # Manual decisions made that day
+    decisions = models.IntegerField(default=0, verbose_name="Decisions")
+    approved = models.IntegerField(default=0, verbose_name="Approved")
+    declined = models.IntegerField(default=0, verbose_name="Declined")
+    modified = models.IntegerField(default=0, verbose_name="Modified")
+    claimed_amount = models.DecimalField(max_digits=20, decimal_places=2, default=0, verbose_name="Claimed Amount")
+    adjudicated_amount = models.DecimalField(max_digits=20, decimal_places=2, default=0, verbose_name="Adjudicated Amount")
+
+    # Time from the automatic referral to the decision, over the decisions that had one
+    turnaround_seconds = models.BigIntegerField(default=0, verbose_name="Total Turnaround (seconds)")
+    turnaround_count = models.IntegerField(default=0, verbose_name="Decisions With Turnaround")
+
+    def __str__(self):
+        return f"{self.adjudicator} - {self.date}: {self.decisions} decisions"
+
+    class Meta:
+        unique_together = [("adjudicator", "date")]
+        ordering = ["-date", "adjudicator"]
+        verbose_name = "Adjudicator Daily Metrics"
+        verbose_name_plural = "Adjudicator Daily Metrics"
@@ -49,6 +49,9 @@ class Claim(BaseModel):
     start_date = models.DateField(verbose_name="Service Start Date")
     end_date = models.DateField(verbose_name="Service End Date")
 
+    # Hash of beneficiary, provider and the sorted service lines, set when the claim is first adjudicated
+    content_fingerprint = models.CharField(max_length=64, null=True, blank=True, db_index=True, editable=False, verbose_name="Content Fingerprint")
+
     def save(self, *args, **kwargs):
         if not self.transaction_number:
             from sequences import Sequence
@@ -70,6 +73,19 @@ class Claim(BaseModel):
 
         super().save(*args, **kwargs)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored values so status transitions can be detected on save
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def refresh_loaded_values(self):
+        """Treat the current field values as stored, once the ledgers have been posted"""
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname) for field in self._meta.concrete_fields
+        }
+
     class Meta:
         verbose_name = "Claim"
         verbose_name_plural = "Claims"
@@ -0,0 +1,82 @@
+from django.db import models
+
+from configurations.models.base_model import BaseModel
+
+
+class ProviderDailyClaimVolume(BaseModel):
+    provider = models.ForeignKey('configurations.ServiceProvider', on_delete=models.CASCADE, related_name="daily_claim_volume", verbose_name="Service Provider")
+    claim_date = models.DateField(verbose_name="Claim Date")
+
+    # Approved and paid claims filed by the provider on this day
+    claim_count = models.IntegerField(default=0, verbose_name="Claim Count")
+
+    def __str__(self):
+        return f"{self.provider} - {self.claim_date}: {self.claim_count}"
+
+    class Meta:
+        unique_together = [("provider", "claim_date")]
+        ordering = ["provider", "-claim_date"]
+        verbose_name = "Provider Daily Claim Volume"
+        verbose_name_plural = "Provider Daily Claim Volumes"
+
+
+class BeneficiaryProviderDailyClaims(BaseModel):
+    beneficiary = models.ForeignKey('membership.Beneficiary', on_delete=models.CASCADE, related_name="daily_provider_claims", verbose_name="Beneficiary")
+    provider = models.ForeignKey('configurations.ServiceProvider', on_delete=models.CASCADE, related_name="daily_beneficiary_claims", verbose_name="Service Provider")
+    claim_date = models.DateField(verbose_name="Claim Date")
+
+    # Approved and paid claims for the beneficiary at the provider on this day
+    claim_count = models.IntegerField(default=0, verbose_name="Claim Count")
+    claim_amount = models.DecimalField(max_digits=20, decimal_places=2, default=0, verbose_name="Adjudicated Amount")
+
+    def __str__(self):
+        return f"{self.beneficiary} - {self.provider} - {self.claim_date}: {self.claim_count}"
+
+    class Meta:
+        unique_together = [("beneficiary", "provider", "claim_date")]
+        ordering = ["beneficiary", "-claim_date"]
+        indexes = [
+            models.Index(fields=["beneficiary", "claim_date"], name="services_be_benefic_7c41d2_idx"),
+        ]
+        verbose_name = "Beneficiary Provider Daily Claims"
+        verbose_name_plural = "Beneficiary Provider Daily Claims"
+
+
+class ClaimInvoiceFingerprint(BaseModel):
+    claim = models.OneToOneField('services.Claim', on_delete=models.CASCADE, related_name="invoice_fingerprint", verbose_name="Claim")
+
+    # Hash of the beneficiary, provider and normalised invoice number
+    fingerprint = models.CharField(max_length=64, db_index=True, verbose_name="Fingerprint")
+
+    def __str__(self):
+        return f"{self.claim} - {self.fingerprint}"
+
+    class Meta:
+        verbose_name = "Claim Invoice Fingerprint"
+        verbose_name_plural = "Claim Invoice Fingerprints"
+
+
+class ClaimAmountStatistics(BaseModel):
+    SCOPE_CHOICES = [
+        ("B", "Beneficiary"),
+        ("P", "Service Provider"),
+        ("S", "Service"),
+    ]
+    scope = models.CharField(max_length=1, choices=SCOPE_CHOICES, verbose_name="Scope")
+    subject_id = models.UUIDField(verbose_name="Subject")
+
+    # Exponentially decayed sums of claimed amounts, as of the given date
+    observations = models.IntegerField(default=0, verbose_name="Observations")
+    weight = models.FloatField(default=0, verbose_name="Decayed Weight")
+    amount_sum = models.FloatField(default=0, verbose_name="Decayed Amount Sum")
+    amount_square_sum = models.FloatField(default=0, verbose_name="Decayed Amount Square Sum")
+    as_of = models.DateField(null=True, blank=True, verbose_name="As Of")
+
+    def __str__(self):
+        return f"{self.get_scope_display()} {self.subject_id}: {self.observations} observations"
+
+    class Meta:
+        unique_together = [("scope", "subject_id")]
+        ordering = ["scope", "subject_id"]
+        verbose_name = "Claim Amount Statistics"
+        verbose_name_plural = "Claim Amount Statistics"
@@ -0,0 +1,25 @@
+from django.db import models
+
+from configurations.models.base_model import BaseModel
+
+
+class ReviewQueueItem(BaseModel):
+    claim = models.OneToOneField('services.Claim', on_delete=models.CASCADE, related_name="review_queue_item", verbose_name="Claim")
+    clinical = models.BooleanField(default=False, verbose_name="Clinical Review")
+    claimed_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name="Claimed Amount")
+    queued_at = models.DateTimeField(verbose_name="Queued At")
+    # Queue order: the queue time brought forward for clinical and high value claims
+    due_at = models.DateTimeField(verbose_name="Due At")
+
+    # Lease held by the adjudicator working the claim; an expired lease returns it to the queue
+    assigned_to = models.ForeignKey('authentication.User', on_delete=models.SET_NULL, null=True, blank=True, related_name="review_queue_items", verbose_name="Assigned To")
+    leased_until = models.DateTimeField(null=True, blank=True, verbose_name="Leased Until")
+
+    def __str__(self):
+        return f"{self.claim} - due {self.due_at:%Y-%m-%d %H:%M}"
+
+    class Meta:
+        ordering = ["due_at"]
+        indexes = [models.Index(fields=["due_at"])]
+        verbose_name = "Review Queue Item"
+        verbose_name_plural = "Review Queue Items"
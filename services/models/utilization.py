@@ -0,0 +1,59 @@
+from django.db import models
+
+from configurations.models.base_model import BaseModel
+
+
+class BeneficiaryUtilization(BaseModel):
+    beneficiary = models.ForeignKey('membership.Beneficiary', on_delete=models.CASCADE, related_name="utilization", verbose_name="Beneficiary")
+    benefit_year = models.PositiveIntegerField(verbose_name="Benefit Year")
+
+    # Running totals of approved and paid claims
+    total_amount = models.DecimalField(max_digits=20, decimal_places=2, default=0, verbose_name="Total Utilized Amount")
+    claim_count = models.IntegerField(default=0, verbose_name="Claim Count")
+
+    def __str__(self):
+        return f"{self.beneficiary} - {self.benefit_year}: {self.total_amount}"
+
+    class Meta:
+        unique_together = [("beneficiary", "benefit_year")]
+        ordering = ["beneficiary", "-benefit_year"]
+        verbose_name = "Beneficiary Utilization"
+        verbose_name_plural = "Beneficiary Utilization"
+
+
+class BeneficiaryCategoryUtilization(BaseModel):
+    beneficiary = models.ForeignKey('membership.Beneficiary', on_delete=models.CASCADE, related_name="category_utilization", verbose_name="Beneficiary")
+    benefit_year = models.PositiveIntegerField(verbose_name="Benefit Year")
+    service_provider_type = models.ForeignKey('configurations.ServiceProviderType', on_delete=models.CASCADE, related_name="beneficiary_utilization", verbose_name="Category")
+
+    # Running totals of approved and paid claims in this category
+    total_amount = models.DecimalField(max_digits=20, decimal_places=2, default=0, verbose_name="Total Utilized Amount")
+    claim_count = models.IntegerField(default=0, verbose_name="Claim Count")
+
+    def __str__(self):
+        return f"{self.beneficiary} - {self.benefit_year} - {self.service_provider_type}: {self.total_amount}"
+
+    class Meta:
+        unique_together = [("beneficiary", "benefit_year", "service_provider_type")]
+        ordering = ["beneficiary", "-benefit_year", "service_provider_type"]
+        verbose_name = "Beneficiary Category Utilization"
+        verbose_name_plural = "Beneficiary Category Utilization"
+
+
+class BeneficiaryServiceVisit(BaseModel):
+    beneficiary = models.ForeignKey('membership.Beneficiary', on_delete=models.CASCADE, related_name="service_visits", verbose_name="Beneficiary")
+    service = models.ForeignKey('configurations.Service', on_delete=models.CASCADE, related_name="beneficiary_visits", verbose_name="Service")
+    visit_date = models.DateField(verbose_name="Visit Date")
+    claim = models.ForeignKey('services.Claim', on_delete=models.CASCADE, related_name="service_visits", verbose_name="Claim")
+
+    # 1 while the claim is approved or paid, so a visit billing several services counts once per rule
+    visit_count = models.IntegerField(default=0, verbose_name="Visit Count")
+
+    def __str__(self):
+        return f"{self.beneficiary} - {self.service} - {self.visit_date}: {self.visit_count}"
+
+    class Meta:
+        unique_together = [("beneficiary", "service", "visit_date", "claim")]
+        ordering = ["beneficiary", "service", "-visit_date"]
+        verbose_name = "Beneficiary Service Visit"
+        verbose_name_plural = "Beneficiary Service Visits"
@@ -1,60 +1,51 @@
 import logging
 from decimal import Decimal
 
-from django.db import models
-from django.db.models.signals import post_save
+from django.db import models, transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save, m2m_changed
 from django.dispatch import receiver
 from django.utils import timezone
 
-from services.models import Claim, ServiceRequest, AdjudicationResult
+from accounting.models import MemberAccount
+from configurations.models import Member, Package, PackageLimit, ServiceTierPrice
+from membership.models import Beneficiary
+from services.models import Claim, ServiceRequest, AdjudicationResult, AdjudicationRule, AdjudicationMessageCode
 
 logger = logging.getLogger(__name__)
 
 @receiver(post_save, sender=Claim)
 def auto_adjudicate_claim(sender, instance, created, **kwargs):
-    """Automatically adjudicate claims when created"""
+    """Queue new claims for auto-adjudication once the submission has been committed"""
     if created and instance.status == 'N':
-        try:
-            # from services.functions.adjudication import process_claim_adjudication
-
-            # Process adjudication
-            result = process_claim_adjudication(instance)
-
-            logger.info(f"Auto-adjudicated claim {instance.transaction_number}: {result.get_result_display()}")
+        from services.functions.claim_pipeline import queue_claim_adjudication
 
-            # Send notification based on result
-            if result.result == 'APPROVED':
-                send_claim_approval_notification(instance)
-            elif result.result == 'DECLINED':
-                send_claim_decline_notification(instance, result.decline_reason)
-            elif result.result in ['PENDING_REVIEW', 'PENDING_CLINICAL']:
-                send_claim_review_notification(instance)
-
-        except Exception as e:
-            logger.error(f"Failed to auto-adjudicate claim {instance.transaction_number}: {str(e)}")
+        queue_claim_adjudication(instance)
 
 
 @receiver(post_save, sender=ServiceRequest)
 def auto_adjudicate_service_request(sender, instance, created, **kwargs):
-    """Automatically adjudicate service requests when created"""
+    """Pre-authorize new service requests once the request and its items have been committed"""
     if created and instance.status == 'P':
-        try:
-            from services.functions.adjudication import process_service_request_adjudication
+        service_request_id = instance.pk
 
-            # Process adjudication
-            result = process_service_request_adjudication(instance)
+        def adjudicate():
+            try:
+                from services.functions.preauthorization import process_service_request_adjudication
+                from services.tasks import complete_service_request_authorization_task
 
-            logger.info(f"Auto-adjudicated service request {instance.request_number}: {result.get_result_display()}")
+                service_request = ServiceRequest.objects.get(pk=service_request_id)
+                result = process_service_request_adjudication(service_request)
 
-            # Reserve funds if approved
-            if result.result == 'APPROVED':
-                reserve_funds_for_authorization(instance, result.adjudicated_amount)
-                send_authorization_notification(instance)
-            elif result.result == 'DECLINED':
-                send_service_request_decline_notification(instance, result.decline_reason)
+                logger.info(f"Auto-adjudicated service request {service_request.request_number}: {result.get_result_display()}")
 
-        except Exception as e:
-            logger.error(f"Failed to auto-adjudicate service request {instance.request_number}: {str(e)}")
+                # Fund reservation and notifications stay off the front-desk request
+                if result.result in ['APPROVED', 'DECLINED']:
+                    transaction.on_commit(lambda: complete_service_request_authorization_task.delay(str(result.pk)))
+
+            except Exception as e:
+                logger.error(f"Failed to auto-adjudicate service request {service_request_id}: {str(e)}")
+
+        transaction.on_commit(adjudicate)
 
 
 @receiver(post_save, sender=AdjudicationResult)
@@ -292,3 +283,136 @@ def create_provider_payment_transaction(sender, instance, created, **kwargs):
 
         except Exception as e:
             logger.error(f"Failed to create provider payment transaction: {str(e)}")
+
+
+@receiver(post_save, sender=AdjudicationRule)
+@receiver(post_delete, sender=AdjudicationRule)
+@receiver(m2m_changed, sender=AdjudicationRule.services.through)
+@receiver(m2m_changed, sender=AdjudicationRule.service_provider_type.through)
+@receiver(m2m_changed, sender=AdjudicationRule.provider_tiers.through)
+def invalidate_compiled_rules(sender, **kwargs):
+    """Bump the rule-set version so every worker recompiles its cached rules"""
+    try:
+        from services.functions.rule_cache import bump_rules_version
+
+        # Bump after commit so workers never recompile from uncommitted rows
+        transaction.on_commit(bump_rules_version)
+
+    except Exception as e:
+        logger.error(f"Failed to invalidate compiled adjudication rules: {str(e)}")
+
+
+@receiver(post_save, sender=Claim)
+def update_claim_ledgers(sender, instance, created, **kwargs):
+    """
+    Keep the utilization ledger and fraud counters in step with claim status changes
+
+    Errors are not swallowed: the ledgers must move in the same transaction
+    as the claim, so a failed posting rolls the claim change back.
+    """
+    from services.functions.eligibility import invalidate_eligibility
+    from services.functions.fraud_signals import record_claim_fraud_signals
+    from services.functions.utilization import record_claim_utilization
+
+    record_claim_utilization(instance)
+    record_claim_fraud_signals(instance)
+
+    loaded = getattr(instance, '_loaded_values', None) or {}
+    invalidate_eligibility([instance.beneficiary_id, loaded.get('beneficiary_id')])
+
+    # Later saves of the same instance are measured against what was just posted
+    instance.refresh_loaded_values()
+
+
+@receiver(pre_delete, sender=Claim)
+def remove_claim_from_ledgers(sender, instance, **kwargs):
+    """Remove a deleted claim from the utilization ledger and fraud counters (before its lines are cascaded)"""
+    from services.functions.eligibility import invalidate_eligibility
+    from services.functions.fraud_signals import remove_claim_fraud_signals
+    from services.functions.utilization import remove_claim_utilization
+
+    remove_claim_utilization(instance)
+    remove_claim_fraud_signals(instance)
+    invalidate_eligibility([instance.beneficiary_id])
+
+
+@receiver(pre_save, sender=Beneficiary)
+def remember_beneficiary_numbers(sender, instance, **kwargs):
+    """Keep the stored membership number and dependent code (save re-derives them from the member)"""
+    instance._stored_numbers = None
+    if not instance._state.adding:
+        instance._stored_numbers = sender.objects.filter(pk=instance.pk).values_list(
+            'membership_number', 'dependent_code'
+        ).first()
+
+
+@receiver(post_save, sender=Beneficiary)
+@receiver(post_delete, sender=Beneficiary)
+def invalidate_beneficiary_eligibility(sender, instance, **kwargs):
+    """Drop the beneficiary's cached eligibility snapshot, and its cached id when deleted or renumbered"""
+    from services.functions.eligibility import forget_beneficiary, invalidate_eligibility
+
+    invalidate_eligibility([instance.pk])
+    if kwargs.get('signal') is post_delete:
+        forget_beneficiary(instance.membership_number, instance.dependent_code)
+        return
+
+    stored_numbers = getattr(instance, '_stored_numbers', None)
+    if stored_numbers and stored_numbers != (instance.membership_number, instance.dependent_code):
+        forget_beneficiary(*stored_numbers)
+
+
+@receiver(post_save, sender=Member)
+def invalidate_member_eligibility(sender, instance, created, **kwargs):
+    """Member status and package changes reach every beneficiary of the member"""
+    if not created:
+        from services.functions.eligibility import invalidate_member_eligibility as invalidate
+
+        invalidate(instance.pk)
+
+
+@receiver(post_save, sender=MemberAccount)
+def invalidate_member_account_eligibility(sender, instance, **kwargs):
+    """Account balances are part of the eligibility snapshot"""
+    from services.functions.eligibility import invalidate_member_eligibility as invalidate
+
+    invalidate(instance.member_id)
+
+
+@receiver(post_save, sender=Package)
+@receiver(post_save, sender=PackageLimit)
+@receiver(post_delete, sender=PackageLimit)
+def invalidate_package_eligibility(sender, **kwargs):
+    """Package limits are shared by many beneficiaries, so every snapshot is retired"""
+    from services.functions.eligibility import bump_eligibility_version
+
+    transaction.on_commit(bump_eligibility_version)
+
+
+@receiver(post_save, sender=Package)
+@receiver(post_save, sender=PackageLimit)
+@receiver(post_delete, sender=PackageLimit)
+def invalidate_coverage_matrix(sender, **kwargs):
+    """Bump the coverage version so every worker rebuilds its package coverage matrix"""
+    from services.functions.coverage import bump_coverage_version
+
+    # Bump after commit so workers never rebuild from uncommitted rows
+    transaction.on_commit(bump_coverage_version)
+
+
+@receiver(post_save, sender=ServiceTierPrice)
+@receiver(post_delete, sender=ServiceTierPrice)
+def invalidate_tariff_index(sender, **kwargs):
+    """Bump the tariff version so every worker rebuilds its tariff index"""
+    from services.functions.tariff import bump_tariff_version
+
+    transaction.on_commit(bump_tariff_version)
+
+
+@receiver(post_save, sender=AdjudicationMessageCode)
+@receiver(post_delete, sender=AdjudicationMessageCode)
+def invalidate_message_codes(sender, **kwargs):
+    """Bump the message code version so every worker reloads the codes compact messages are decoded with"""
+    from services.functions.compact_messages import bump_message_codes_version
+
+    transaction.on_commit(bump_message_codes_version)
@@ -0,0 +1,152 @@
+from celery import shared_task
+from django.utils import timezone
+from datetime import timedelta
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def adjudicate_claim_chunk(batch_id, claim_ids):
+    """Adjudicate one chunk of an adjudication batch"""
+    from services.functions.batch_adjudication import run_batch_chunk
+
+    results = run_batch_chunk(batch_id, claim_ids)
+
+    logger.info(
+        f"Adjudication batch {batch_id}: chunk of {len(claim_ids)} claims done "
+        f"({results['total_processed']} processed, {results['errors']} errors)"
+    )
+
+
+@shared_task
+def process_pending_adjudications():
+    """Queue new claims that have not been adjudicated yet"""
+    try:
+        from services.functions.batch_adjudication import start_batch_adjudication
+        from services.models import AdjudicationBatch, Claim
+
+        # Leave claims that the submission pipeline may still be waiting on
+        cutoff = timezone.now() - timedelta(minutes=15)
+
+        # Don't queue claims again while an earlier batch is still running (unless it has stalled)
+        if AdjudicationBatch.objects.filter(
+            status__in=['Q', 'R'],
+            created_at__gte=timezone.now() - timedelta(hours=6)
+        ).exists():
+            logger.info("Pending adjudication sweep skipped: previous batch still running")
+            return
+
+        claim_ids = list(
+            Claim.objects.filter(status='N', created_at__lt=cutoff).values_list('id', flat=True)
+        )
+
+        if claim_ids:
+            batch = start_batch_adjudication(claim_ids)
+            logger.info(f"Queued {batch.total_claims} pending claims in batch {batch.id}")
+
+    except Exception as e:
+        logger.error(f"Failed to queue pending adjudications: {str(e)}")
+
+
+@shared_task
+def sync_review_queue():
+    """Queue pending-review claims missing from the review queue and drop decided ones"""
+    try:
+        from services.functions.review_queue import sync_review_queue as sync
+
+        return sync()
+
+    except Exception as e:
+        logger.error(f"Failed to sync review queue: {str(e)}")
+
+
+@shared_task
+def rollup_adjudicator_metrics():
+    """Bring the adjudicator daily metrics up to date"""
+    try:
+        from services.functions.adjudicator_metrics import rollup_adjudicator_metrics as rollup
+
+        return rollup()
+
+    except Exception as e:
+        logger.error(f"Failed to roll up adjudicator metrics: {str(e)}")
+
+
+@shared_task
+def archive_adjudication_history():
+    """Move old superseded adjudication history of closed claims into the archive"""
+    try:
+        from services.functions.adjudication_archive import archive_adjudication_history as archive
+
+        return archive()
+
+    except Exception as e:
+        logger.error(f"Failed to archive adjudication history: {str(e)}")
+
+
+@shared_task(bind=True, max_retries=5, default_retry_delay=60)
+def adjudicate_claim_task(self, claim_id):
+    """First pipeline step: adjudicate a new claim and reserve its approved amount once its service lines are in"""
+    from services.functions.auto_adjudication import process_claim_adjudication
+    from services.models import Claim, ClaimServiceLine
+
+    claim = Claim.objects.filter(pk=claim_id, status='N').first()
+    if claim is None:
+        logger.info(f"Claim {claim_id} no longer awaiting adjudication")
+        return None
+
+    # Claims are saved before their lines; wait for them rather than decline an empty claim
+    if not ClaimServiceLine.objects.filter(claim_id=claim_id).exists():
+        if self.request.retries >= self.max_retries:
+            logger.warning(f"Claim {claim.transaction_number} has no service lines; left for the pending sweep")
+            return None
+        raise self.retry()
+
+    result = process_claim_adjudication(claim)
+    if result is None:
+        logger.info(f"Claim {claim.transaction_number} was adjudicated by another worker")
+        return None
+
+    logger.info(f"Auto-adjudicated claim {claim.transaction_number}: {result.get_result_display()}")
+
+    return {'claim_id': str(claim.pk), 'result_id': str(result.pk)}
+
+
+@shared_task
+def notify_claim_result_task(payload):
+    """Last pipeline step: notify the member of the outcome"""
+    if not payload:
+        return None
+
+    try:
+        from services.functions.claim_pipeline import notify_claim_result
+        from services.models import AdjudicationResult
+
+        result = AdjudicationResult.objects.select_related(
+            'claim__beneficiary__member', 'claim__provider'
+        ).get(pk=payload['result_id'])
+
+        notify_claim_result(result.claim, result)
+
+    except Exception as e:
+        logger.error(f"Failed to send claim notification for claim {payload['claim_id']}: {str(e)}")
+
+    return payload
+
+
+@shared_task
+def complete_service_request_authorization_task(result_id):
+    """Reserve funds and notify the member once a pre-authorization has been decided"""
+    try:
+        from services.functions.preauthorization import complete_service_request_authorization
+        from services.models import AdjudicationResult
+
+        result = AdjudicationResult.objects.select_related(
+            'service_request__beneficiary__member', 'service_request__service_provider'
+        ).get(pk=result_id)
+
+        complete_service_request_authorization(result.service_request, result)
+
+    except Exception as e:
+        logger.error(f"Failed to complete authorization for adjudication result {result_id}: {str(e)}")
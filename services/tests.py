@@ -1,3 +1,1110 @@
-from django.test import TestCase
+import datetime
+import io
+import math
+import uuid
+from decimal import Decimal
 
-# Create your tests here.
+import pandas as pd
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from accounting.models import MemberAccount, MemberTransaction
+from configurations.models import (
+    Package, PackageLimit, ProviderComplianceStatus, ServiceProvider, ServiceProviderDocumentType,
+    ServiceProviderType, ServiceProviderTypeRequirement
+)
+from membership.models import Beneficiary
+
+from services.functions.adjudication_archive import history_entries, pack_history, unpack_history
+from services.functions.adjudication_trace import AdjudicationTrace, TraceHistogram, TraceSummary
+from services.functions.adjudication_context import AdjudicationReferenceData, load_adjudication_context
+from services.functions.adjudicator_metrics import quality_metrics, summarize_adjudicator_days
+from services.functions.auto_adjudication import process_claim_adjudication
+from services.functions.batch_adjudication import chunk_by_group, start_batch_adjudication
+from services.functions.benchmark import SyntheticCorpus, summarize_timings
+from services.functions.claim_pipeline import get_claim_adjudication_status, reserve_claim_funds
+from services.functions.compact_messages import decode_messages, encode_messages
+from services.functions.coverage import build_coverage_matrix
+from services.functions.eligibility import evaluate_eligibility, get_eligibility
+from services.functions.fraud_signals import (
+    PROVIDER_SCOPE, SERVICE_SCOPE, AmountStatistics, claim_content_fingerprint, invoice_fingerprint
+)
+from services.functions.manual_adjudication import (
+    ManualAdjudicationEngine, bulk_review_permission_error, post_review_transactions, process_bulk_manual_review
+)
+from services.functions.preauthorization import AuthorizationCodeAllocator
+from services.functions.prescreen import evaluate_prescreen
+from services.functions.provider_compliance import evaluate_provider_compliance, refresh_provider_compliance
+from services.functions.review_queue import review_due_at
+from services.functions.rule_cache import CacheVersion, CompiledRule, CompiledRuleSet, ProcessCache
+from services.functions.rule_simulation import RuleSimulationReport, SimulatedOutcome, _load_contexts
+from services.functions.tariff import build_tariff_index
+from services.functions.unit_of_work import AdjudicationUnitOfWork
+from services.functions.utilization import (
+    ServiceVisitHistory, UtilizationHistory, get_annual_utilization, get_utilization_history
+)
+from services.models import (
+    AdjudicationMessageCode, AdjudicationResult, AdjudicationRule, BeneficiaryCategoryUtilization,
+    BeneficiaryServiceVisit, ClaimAmountStatistics, BeneficiaryUtilization, Claim, ClaimServiceLine
+)
+
+
+def make_rule(**kwargs):
+    """Build an unsaved rule with sensible defaults"""
+    defaults = {
+        'id': uuid.uuid4(),
+        'name': 'Test Rule',
+        'action': 'MANUAL_REVIEW',
+        'effective_from': datetime.date(2025, 1, 1),
+    }
+    defaults.update(kwargs)
+    return AdjudicationRule(**defaults)
+
+
+def build_corpus(**scale):
+    """Build a tiny synthetic corpus for database tests"""
+    defaults = {
+        'members': 2, 'beneficiaries_per_member': 2, 'providers': 2, 'services': 20,
+        'rules': 1, 'history_claims': 1, 'claims': 2,
+    }
+    defaults.update(scale)
+    return SyntheticCorpus(seed=7, **defaults).build()
+
+
+class CompiledRuleTest(SimpleTestCase):
+    def setUp(self):
+        self.service_id = uuid.uuid4()
+        self.category_id = uuid.uuid4()
+        self.tier_id = uuid.uuid4()
+        self.claim = {
+            'amount': Decimal('150.00'),
+            'beneficiary_type': 'D',
+            'member_type': 'IN',
+            'provider_tier_id': self.tier_id,
+            'service_ids': frozenset([self.service_id]),
+            'service_provider_type_ids': frozenset([self.category_id]),
+            'age': 10,
+        }
+
+    def test_unrestricted_rule_matches(self):
+        """A rule with only defaults ('A' beneficiary type, no M2M sets) matches any claim"""
+        rule = CompiledRule(make_rule())
+        self.assertTrue(rule.matches(**self.claim))
+
+    def test_beneficiary_and_member_types(self):
+        self.assertFalse(CompiledRule(make_rule(beneficiary_type='P')).matches(**self.claim))
+        self.assertTrue(CompiledRule(make_rule(member_types='CO, IN')).matches(**self.claim))
+        self.assertFalse(CompiledRule(make_rule(member_types='CO')).matches(**self.claim))
+
+    def test_frozen_relations(self):
+        self.assertTrue(CompiledRule(make_rule(), service_ids=[self.service_id]).matches(**self.claim))
+        self.assertFalse(CompiledRule(make_rule(), service_ids=[uuid.uuid4()]).matches(**self.claim))
+        self.assertFalse(CompiledRule(make_rule(), provider_tier_ids=[uuid.uuid4()]).matches(**self.claim))
+        self.assertFalse(
+            CompiledRule(make_rule(), service_provider_type_ids=[uuid.uuid4()]).matches(**self.claim)
+        )
+
+    def test_amount_and_age(self):
+        self.assertFalse(CompiledRule(make_rule(min_amount=Decimal('200'))).matches(**self.claim))
+        self.assertFalse(CompiledRule(make_rule(max_amount=Decimal('100'))).matches(**self.claim))
+        self.assertFalse(CompiledRule(make_rule(min_age=18)).matches(**self.claim))
+
+    def test_effective_rules_in_priority_order(self):
+        today = datetime.date(2025, 6, 1)
+        rules = CompiledRuleSet('v1', [
+            CompiledRule(make_rule(name='Late', priority=200)),
+            CompiledRule(make_rule(name='Early', priority=10)),
+            CompiledRule(make_rule(name='Expired', priority=1, effective_to=datetime.date(2025, 2, 1))),
+            CompiledRule(make_rule(name='Requests only', priority=5, rule_type='SR')),
+        ])
+
+        self.assertEqual([rule.name for rule in rules.effective_rules(today, 'C')], ['Early', 'Late'])
+        self.assertEqual(
+            [rule.name for rule in rules.effective_rules(today, 'SR')],
+            ['Requests only', 'Early', 'Late']
+        )
+
+    def test_candidate_rules_use_index(self):
+        today = datetime.date(2025, 6, 1)
+        other_service = uuid.uuid4()
+        rules = CompiledRuleSet('v1', [
+            CompiledRule(make_rule(name='Wildcard', priority=50)),
+            CompiledRule(make_rule(name='Service', priority=20), service_ids=[self.service_id]),
+            CompiledRule(make_rule(name='Other service', priority=10), service_ids=[other_service]),
+            CompiledRule(make_rule(name='Category', priority=30), service_provider_type_ids=[self.category_id]),
+            CompiledRule(make_rule(name='Tier', priority=40), provider_tier_ids=[self.tier_id]),
+        ])
+
+        candidates = rules.candidate_rules(
+            today,
+            service_ids=self.claim['service_ids'],
+            service_provider_type_ids=self.claim['service_provider_type_ids'],
+            provider_tier_id=self.tier_id,
+        )
+
+        self.assertEqual([rule.name for rule in candidates], ['Service', 'Category', 'Tier', 'Wildcard'])
+
+
+class ServiceVisitHistoryTest(SimpleTestCase):
+    def test_windows(self):
+        consultation, xray = uuid.uuid4(), uuid.uuid4()
+        today = datetime.date(2025, 6, 30)
+        history = ServiceVisitHistory([
+            (1, consultation, datetime.date(2025, 6, 20), 1),
+            (2, consultation, datetime.date(2025, 6, 20), 1),
+            (3, consultation, datetime.date(2025, 3, 1), 1),
+            (4, consultation, datetime.date(2024, 6, 1), 1),
+            (5, xray, datetime.date(2025, 6, 29), 1),
+        ])
+
+        self.assertEqual(history.count_in_window([consultation], today, 30), 2)
+        self.assertEqual(history.count_in_window([consultation], today, 365), 3)
+        self.assertEqual(history.count_in_window([consultation, xray], today, 30), 3)
+        self.assertEqual(history.count_in_window([uuid.uuid4()], today, 365), 0)
+
+    def test_claim_billing_several_services_is_one_visit(self):
+        consultation, xray = uuid.uuid4(), uuid.uuid4()
+        today = datetime.date(2025, 6, 30)
+        history = ServiceVisitHistory([
+            (1, consultation, datetime.date(2025, 6, 20), 1),
+            (1, xray, datetime.date(2025, 6, 20), 1),
+            (2, xray, datetime.date(2025, 6, 25), 1),
+            (2, xray, datetime.date(2025, 6, 25), -1),
+        ])
+
+        self.assertEqual(history.count_in_window([consultation, xray], today, 30), 1)
+        self.assertEqual(history.count_in_window([xray], today, 30), 1)
+
+
+class UtilizationHistoryTest(SimpleTestCase):
+    def test_totals_as_of_a_date(self):
+        beneficiary, gp, dental = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        history = UtilizationHistory(
+            [
+                (1, beneficiary, datetime.date(2025, 3, 1), Decimal('100.00')),
+                (2, beneficiary, datetime.date(2025, 6, 30), Decimal('40.00')),
+                (3, beneficiary, datetime.date(2025, 7, 1), Decimal('500.00')),
+                (4, beneficiary, datetime.date(2024, 12, 31), Decimal('900.00')),
+            ],
+            [
+                (1, gp, Decimal('30.00')),
+                (1, dental, Decimal('90.00')),
+                (2, gp, Decimal('50.00')),
+            ]
+        )
+
+        annual, categories = history.totals(beneficiary, datetime.date(2025, 6, 30))
+        self.assertEqual(annual, Decimal('140.00'))
+        self.assertEqual(categories, {gp: Decimal('65.00'), dental: Decimal('75.00')})
+
+        annual, categories = history.totals(beneficiary, datetime.date(2025, 6, 30), exclude_claim_id=2)
+        self.assertEqual(annual, Decimal('100.00'))
+        self.assertEqual(history.totals(uuid.uuid4(), datetime.date(2025, 6, 30)), (Decimal('0.00'), {}))
+
+
+class InvoiceFingerprintTest(SimpleTestCase):
+    def test_normalised_invoice_numbers_collide(self):
+        beneficiary, provider = uuid.uuid4(), uuid.uuid4()
+        self.assertEqual(
+            invoice_fingerprint(beneficiary, provider, 'inv-0012'),
+            invoice_fingerprint(beneficiary, provider, 'INV 0012')
+        )
+        self.assertNotEqual(
+            invoice_fingerprint(beneficiary, provider, 'INV-0012'),
+            invoice_fingerprint(uuid.uuid4(), provider, 'INV-0012')
+        )
+
+
+class ClaimContentFingerprintTest(SimpleTestCase):
+    def test_line_order_and_formatting_do_not_matter(self):
+        beneficiary, provider = uuid.uuid4(), uuid.uuid4()
+        visit = datetime.date(2024, 3, 1)
+        lines = [('GP-01', Decimal('1'), Decimal('45.5'), visit), ('XR02', Decimal('2.00'), Decimal('120.00'), visit)]
+        resubmitted = [('xr 02', Decimal('2'), Decimal('120'), visit), ('gp01', Decimal('1.00'), Decimal('45.50'), visit)]
+
+        self.assertEqual(
+            claim_content_fingerprint(beneficiary, provider, lines),
+            claim_content_fingerprint(beneficiary, provider, resubmitted)
+        )
+
+    def test_any_content_change_differs(self):
+        beneficiary, provider = uuid.uuid4(), uuid.uuid4()
+        visit = datetime.date(2024, 3, 1)
+        line = ('GP01', Decimal('1'), Decimal('45.50'), visit)
+        fingerprint = claim_content_fingerprint(beneficiary, provider, [line])
+
+        for changed in [('GP01', Decimal('2'), Decimal('45.50'), visit), ('GP01', Decimal('1'), Decimal('45.51'), visit),
+                        ('GP01', Decimal('1'), Decimal('45.50'), visit + datetime.timedelta(days=1))]:
+            self.assertNotEqual(claim_content_fingerprint(beneficiary, provider, [changed]), fingerprint)
+        self.assertNotEqual(claim_content_fingerprint(beneficiary, uuid.uuid4(), [line]), fingerprint)
+
+
+class AmountStatisticsTest(SimpleTestCase):
+    def test_mean_and_removal(self):
+        statistics = AmountStatistics(half_life_days=90)
+        day = datetime.date(2025, 6, 1)
+        for amount in (100, 120, 80, 110, 90):
+            statistics.add(Decimal(amount), day)
+
+        self.assertAlmostEqual(statistics.mean, 100.0)
+        self.assertAlmostEqual(statistics.standard_deviation, math.sqrt(200.0))
+
+        statistics.add(Decimal(120), day, sign=-1)
+        self.assertEqual(statistics.observations, 4)
+        self.assertAlmostEqual(statistics.mean, 95.0)
+
+    def test_older_observations_weigh_less(self):
+        statistics = AmountStatistics(half_life_days=30)
+        statistics.add(1000, datetime.date(2025, 1, 1))
+        statistics.add(100, datetime.date(2025, 1, 31))
+
+        self.assertAlmostEqual(statistics.weight, 1.5)
+        self.assertAlmostEqual(statistics.mean, 400.0)
+
+    def test_outlier(self):
+        statistics = AmountStatistics(half_life_days=90)
+        day = datetime.date(2025, 6, 1)
+        for amount in (100, 120, 80, 110, 90):
+            statistics.add(amount, day)
+
+        self.assertTrue(statistics.is_outlier(200, day))
+        self.assertFalse(statistics.is_outlier(130, day))
+        self.assertFalse(AmountStatistics(half_life_days=90).is_outlier(10000, day))
+
+
+class ChunkByGroupTest(SimpleTestCase):
+    def test_group_claims_stay_together_in_order(self):
+        rows = [(1, 'a'), (2, 'a'), (3, 'b'), (4, 'c'), (5, 'c'), (6, 'c'), (7, 'd')]
+
+        self.assertEqual(chunk_by_group(rows, 3), [[1, 2, 3], [4, 5, 6], [7]])
+        self.assertEqual(chunk_by_group(rows, 2), [[1, 2], [3], [4, 5, 6], [7]])
+        self.assertEqual(chunk_by_group([], 2), [])
+
+
+class EvaluatePrescreenTest(SimpleTestCase):
+    def test_first_failing_check_decides(self):
+        today = datetime.date(2025, 6, 1)
+        claims = pd.DataFrame({
+            'id': ['ok', 'empty', 'old', 'inactive', 'over_limit', 'pediatric', 'no_package'],
+            'beneficiary_id': ['b1', 'b1', 'b1', 'b2', 'b3', 'b1', 'b4'],
+        })
+        lines = pd.DataFrame({
+            'claim_id': ['ok', 'old', 'old', 'inactive', 'over_limit', 'pediatric', 'no_package'],
+            'service_date': [
+                datetime.date(2025, 5, 30), datetime.date(2024, 1, 1), datetime.date(2025, 5, 1),
+                datetime.date(2025, 5, 30), datetime.date(2025, 5, 30), datetime.date(2025, 5, 30),
+                datetime.date(2025, 5, 30),
+            ],
+            'description': ['Consultation', 'Consultation', 'X-Ray', 'Consultation', 'Consultation',
+                            'Pediatric Consultation', 'Pediatric Consultation'],
+        })
+        beneficiaries = pd.DataFrame({
+            'id': ['b1', 'b2', 'b3', 'b4'],
+            'status': ['A', 'I', 'A', 'A'],
+            'benefit_start_date': [datetime.date(2024, 1, 1)] * 4,
+            'date_of_birth': [datetime.date(1980, 1, 1)] * 4,
+            'package_id': ['p1', 'p1', 'p1', None],
+            'annual_limit': [Decimal('1000.00'), Decimal('1000.00'), Decimal('1000.00'), None],
+            'utilized': [Decimal('100.00'), None, Decimal('1000.00'), None],
+        })
+
+        declined, survivors = evaluate_prescreen(claims, lines, beneficiaries, today, 365)
+
+        self.assertEqual(survivors, ['ok', 'no_package'])
+        self.assertEqual({claim_id: code for claim_id, (code, _) in declined.items()}, {
+            'empty': 'SERV001',
+            'old': 'TIME001',
+            'inactive': 'BENF001',
+            'over_limit': 'LIMT002',
+            'pediatric': 'AGER001',
+        })
+        self.assertEqual(declined['old'][1], 'Service date too old: 2024-01-01')
+
+
+class ProcessCacheTest(SimpleTestCase):
+    def test_value_is_rebuilt_only_after_a_bump(self):
+        builds = []
+        version = CacheVersion(f"test_version_{uuid.uuid4().hex}", 'Test')
+        values = ProcessCache(version, lambda stamp: builds.append(stamp) or len(builds))
+
+        self.assertEqual(values.get(), 1)
+        self.assertEqual(values.get(), 1)
+        version.bump()
+        self.assertEqual(values.get(), 2)
+        self.assertEqual(builds[1], version.get())
+
+    def test_value_is_rebuilt_every_call_without_a_stamp(self):
+        version = CacheVersion('unused', 'Test')
+        version.get = lambda: None
+        values = ProcessCache(version, lambda stamp: object())
+
+        self.assertIsNot(values.get(), values.get())
+
+
+class RuleSimulationReportTest(SimpleTestCase):
+    def outcome(self, result, amount, rule_ids=()):
+        amount = Decimal(amount)
+        return SimulatedOutcome(result, amount, amount, amount, Decimal('0.00'), list(rule_ids))
+
+    def test_payout_and_rule_hits(self):
+        report = RuleSimulationReport()
+        report.add(Decimal('100.00'), self.outcome('APPROVED', '100.00'), self.outcome('APPROVED', '100.00'))
+        report.add(Decimal('200.00'), self.outcome('APPROVED', '200.00'), self.outcome('DECLINED', '0.00', ['new']))
+        report.add(Decimal('0.00'), self.outcome('PENDING_REVIEW', '50.00', ['old']),
+                   self.outcome('APPROVED', '50.00', ['old']))
+
+        other = RuleSimulationReport()
+        other.add(Decimal('80.00'), self.outcome('APPROVED', '80.00'), self.outcome('APPROVED', '40.00', ['new']))
+        report.merge(other)
+
+        self.assertEqual(report.claims, 4)
+        self.assertEqual(report.changed, 3)
+        self.assertEqual(report.baseline_payout, Decimal('380.00'))
+        self.assertEqual(report.proposed_payout, Decimal('190.00'))
+        self.assertEqual(report.payout_delta, Decimal('-190.00'))
+        self.assertEqual(report.proposed_hits['new'], 2)
+        self.assertEqual(report.rule_payout_delta['new'], Decimal('-240.00'))
+        self.assertEqual(report.transitions[('APPROVED', 'DECLINED')], 1)
+
+        summary = report.as_dict({'new': 'New Rule'})
+        self.assertEqual(summary['rules'][0]['name'], 'New Rule')
+        self.assertEqual(summary['historical_payout'], 380.0)
+
+
+class AdjudicationUnitOfWorkTest(SimpleTestCase):
+    def test_messages_are_numbered_per_result_and_unknown_codes_skipped(self):
+        unit_of_work = AdjudicationUnitOfWork()
+        first = unit_of_work.add_result(AdjudicationResult(result='APPROVED'))
+        second = unit_of_work.add_result(AdjudicationResult(result='DECLINED'))
+
+        unit_of_work.add_messages(first, [
+            {'code': 'BENF100', 'description': 'Beneficiary eligibility confirmed'},
+            {'code': 'PACK004', 'description': 'Co-payment applied'},
+        ])
+        unit_of_work.add_message(second, 'NOPE001', 'Unknown')
+        unit_of_work.add_message(second, 'LIMT002', 'Annual limit exceeded')
+
+        codes = {code: AdjudicationMessageCode(code=code) for code in ('BENF100', 'PACK004', 'LIMT002')}
+        messages = unit_of_work._build_messages(codes)
+
+        self.assertEqual(
+            [(message.adjudication_result, message.message_code.code, message.sequence_number) for message in messages],
+            [(first, 'BENF100', 1), (first, 'PACK004', 2), (second, 'LIMT002', 1)]
+        )
+
+
+class AuthorizationCodeAllocatorTest(SimpleTestCase):
+    def test_codes_come_from_reserved_blocks(self):
+        blocks = iter([range(1, 4), range(11, 14)])
+
+        class Allocator(AuthorizationCodeAllocator):
+            reserved = 0
+
+            def _reserve_block(self):
+                self.reserved += 1
+                return list(next(blocks))
+
+        allocator = Allocator(block_size=3)
+        codes = [allocator.next_code() for _ in range(5)]
+
+        self.assertEqual(codes, ['AUTH000001', 'AUTH000002', 'AUTH000003', 'AUTH000011', 'AUTH000012'])
+        self.assertEqual(allocator.reserved, 2)
+
+
+class EvaluateEligibilityTest(SimpleTestCase):
+    def snapshot(self, **overrides):
+        snapshot = {
+            'status': 'A',
+            'benefit_start_date': datetime.date(2024, 1, 1),
+            'annual_remaining': Decimal('500.00'),
+            'categories': [
+                {'name': 'Dental', 'waiting_period_ends': datetime.date(2024, 7, 1)},
+                {'name': 'GP', 'waiting_period_ends': None},
+            ],
+        }
+        snapshot.update(overrides)
+        return snapshot
+
+    def test_eligible_with_waiting_periods(self):
+        result = evaluate_eligibility(self.snapshot(), datetime.date(2024, 3, 1))
+
+        self.assertTrue(result['eligible'])
+        self.assertIsNone(result['reason'])
+        self.assertEqual([c['in_waiting_period'] for c in result['categories']], [True, False])
+
+    def test_first_failing_check_gives_reason(self):
+        on_date = datetime.date(2024, 3, 1)
+
+        suspended = evaluate_eligibility(self.snapshot(status='S', annual_remaining=Decimal('0')), on_date)
+        self.assertEqual(suspended['reason'], 'Beneficiary is suspended')
+
+        not_started = evaluate_eligibility(self.snapshot(benefit_start_date=datetime.date(2024, 6, 1)), on_date)
+        self.assertEqual(not_started['reason'], 'Benefits start on 2024-06-01')
+
+        exhausted = evaluate_eligibility(self.snapshot(annual_remaining=Decimal('0.00')), on_date)
+        self.assertFalse(exhausted['eligible'])
+        self.assertEqual(exhausted['reason'], 'Annual limit exceeded')
+
+
+class AdjudicationTraceTest(SimpleTestCase):
+    def test_steps_record_time_and_query_delta(self):
+        trace = AdjudicationTrace()
+        with trace.step('_check_beneficiary_eligibility'):
+            trace.queries += 2
+        with trace.rule('High value review'):
+            pass
+
+        data = trace.as_dict()
+        self.assertEqual(data['q'], 2)
+        self.assertEqual([(name, queries) for name, _, queries in data['steps']], [('_check_beneficiary_eligibility', 2)])
+        self.assertEqual([name for name, _, _ in data['rules']], ['High value review'])
+
+    def test_disabled_trace_records_nothing(self):
+        trace = AdjudicationTrace(enabled=False)
+        with trace.step('_pre_validation_checks'):
+            pass
+
+        self.assertEqual(trace.steps, [])
+        self.assertIsNone(trace.as_dict())
+
+    def test_histogram_percentiles_within_bucket_precision(self):
+        histogram = TraceHistogram()
+        for ms in range(1, 101):
+            histogram.add(float(ms), 1)
+
+        self.assertAlmostEqual(histogram.percentile(50), 50, delta=5)
+        self.assertAlmostEqual(histogram.percentile(99), 99, delta=10)
+        self.assertEqual(histogram.percentile(100), 100)
+        self.assertEqual(histogram.mean_queries, 1)
+
+    def test_summary_groups_by_step_and_rule(self):
+        summary = TraceSummary().add_all([
+            {'ms': 5.0, 'q': 4, 'steps': [['_pre_validation_checks', 1.0, 0]], 'rules': [['R1', 0.2, 1]]},
+            {'ms': 7.0, 'q': 6, 'steps': [['_pre_validation_checks', 3.0, 2]], 'rules': []},
+            None,
+        ]).as_dict()
+
+        self.assertEqual(summary['total']['count'], 2)
+        self.assertEqual(summary['steps'][0]['name'], '_pre_validation_checks')
+        self.assertEqual(summary['steps'][0]['mean_queries'], 1)
+        self.assertEqual([row['name'] for row in summary['rules']], ['R1'])
+
+
+class SummarizeTimingsTest(SimpleTestCase):
+    def test_throughput_percentiles_and_queries(self):
+        summary = summarize_timings([float(ms) for ms in range(1, 101)], queries=250, claims=100, elapsed=2.0)
+
+        self.assertEqual(summary['claims_per_second'], 50.0)
+        self.assertAlmostEqual(summary['p50_ms'], 50.5)
+        self.assertAlmostEqual(summary['p99_ms'], 99.01)
+        self.assertEqual(summary['queries_per_claim'], 2.5)
+
+    def test_empty_run(self):
+        summary = summarize_timings([], queries=0, claims=0, elapsed=0.0)
+
+        self.assertEqual(summary['claims_per_second'], 0.0)
+        self.assertEqual(summary['queries_per_claim'], 0.0)
+
+
+class EvaluateProviderComplianceTest(SimpleTestCase):
+    def requirement(self, name, **kwargs):
+        return ServiceProviderTypeRequirement(document_type=ServiceProviderDocumentType(name=name), **kwargs)
+
+    def test_missing_expired_and_next_expiry(self):
+        licence = self.requirement('Practising Licence', withhold_payment_if_expired=True)
+        tax = self.requirement('Tax Clearance', withhold_payment_if_missing=True)
+        indemnity = self.requirement('Indemnity Cover')
+        registration = self.requirement('Registration')
+        documents = {
+            licence.document_type.id: datetime.date(2024, 2, 28),
+            indemnity.document_type.id: datetime.date(2024, 9, 30),
+            registration.document_type.id: None,
+        }
+
+        result = evaluate_provider_compliance([licence, tax, indemnity, registration], documents, datetime.date(2024, 3, 1))
+
+        self.assertEqual(result['status'], 'N')
+        self.assertEqual([(d['name'], d['withhold']) for d in result['missing_documents']], [('Tax Clearance', True)])
+        self.assertEqual([(d['name'], d['withhold']) for d in result['expired_documents']], [('Practising Licence', True)])
+        self.assertEqual(result['next_expiry_date'], datetime.date(2024, 9, 30))
+
+    def test_document_expiring_today_is_current(self):
+        licence = self.requirement('Practising Licence')
+        documents = {licence.document_type.id: datetime.date(2024, 3, 1)}
+
+        result = evaluate_provider_compliance([licence], documents, datetime.date(2024, 3, 1))
+
+        self.assertEqual(result['status'], 'C')
+        self.assertEqual(result['next_expiry_date'], datetime.date(2024, 3, 1))
+
+
+class CoverageMatrixTest(SimpleTestCase):
+    def limit(self, package_id, name, **kwargs):
+        return PackageLimit(package_id=package_id, service_provider_type=ServiceProviderType(name=name), **kwargs)
+
+    def test_lookup_by_package_and_provider_type(self):
+        package_id, other_package_id = uuid.uuid4(), uuid.uuid4()
+        dental = self.limit(package_id, 'Dental', annual_limit=Decimal('1000.00'))
+        optical = self.limit(other_package_id, 'Optical')
+
+        matrix = build_coverage_matrix([dental, optical], 'v1')
+
+        self.assertEqual(len(matrix), 2)
+        self.assertEqual(matrix.get(package_id, dental.service_provider_type_id).name, 'Dental')
+        self.assertIsNone(matrix.get(package_id, optical.service_provider_type_id))
+        self.assertEqual(list(matrix.for_package(other_package_id)), [optical.service_provider_type_id])
+        self.assertEqual(matrix.for_package(None), {})
+
+    def test_per_visit_cap_and_co_payment(self):
+        package_id = uuid.uuid4()
+        matrix = build_coverage_matrix([
+            self.limit(package_id, 'GP', per_visit_limit=Decimal('80.00'), co_payment_percentage=Decimal('12.5')),
+            self.limit(package_id, 'Dental', co_payment_amount=Decimal('25.00')),
+        ])
+        gp, dental = matrix.for_package(package_id).values()
+
+        self.assertEqual(gp.cap_visit(Decimal('120.00')), Decimal('80.00'))
+        self.assertEqual(gp.co_payment(Decimal('80.00')), Decimal('10.00'))
+        self.assertEqual(dental.cap_visit(Decimal('120.00')), Decimal('120.00'))
+        self.assertEqual(dental.co_payment(Decimal('20.00')), Decimal('20.00'))
+
+
+class TariffIndexTest(SimpleTestCase):
+    def setUp(self):
+        self.service_id, self.tier_id = uuid.uuid4(), uuid.uuid4()
+        self.index = build_tariff_index([
+            (self.service_id, self.tier_id, datetime.date(2024, 7, 1), None, Decimal('120.00')),
+            (self.service_id, self.tier_id, datetime.date(2023, 1, 1), datetime.date(2023, 12, 31), Decimal('90.00')),
+            (self.service_id, self.tier_id, datetime.date(2024, 1, 1), datetime.date(2024, 6, 30), Decimal('100.00')),
+        ])
+
+    def test_price_in_force_on_date(self):
+        lookup = lambda on_date: self.index.max_payable(self.service_id, self.tier_id, on_date)
+
+        self.assertIsNone(lookup(datetime.date(2022, 12, 31)))
+        self.assertEqual(lookup(datetime.date(2023, 12, 31)), Decimal('90.00'))
+        self.assertEqual(lookup(datetime.date(2024, 6, 30)), Decimal('100.00'))
+        self.assertEqual(lookup(datetime.date(2030, 1, 1)), Decimal('120.00'))
+        self.assertIsNone(self.index.max_payable(self.service_id, uuid.uuid4(), datetime.date(2024, 3, 1)))
+
+    def test_outer_price_resumes_after_a_nested_one(self):
+        index = build_tariff_index([
+            (self.service_id, self.tier_id, datetime.date(2026, 1, 1), datetime.date(2026, 12, 31), Decimal('100.00')),
+            (self.service_id, self.tier_id, datetime.date(2026, 3, 1), datetime.date(2026, 4, 30), Decimal('80.00')),
+        ])
+        lookup = lambda on_date: index.max_payable(self.service_id, self.tier_id, on_date)
+
+        self.assertEqual(lookup(datetime.date(2026, 2, 28)), Decimal('100.00'))
+        self.assertEqual(lookup(datetime.date(2026, 3, 1)), Decimal('80.00'))
+        self.assertEqual(lookup(datetime.date(2026, 4, 30)), Decimal('80.00'))
+        self.assertEqual(lookup(datetime.date(2026, 5, 15)), Decimal('100.00'))
+        self.assertEqual(lookup(datetime.date(2026, 12, 31)), Decimal('100.00'))
+        self.assertIsNone(lookup(datetime.date(2027, 1, 1)))
+        self.assertEqual(len(index), 2)
+
+    def test_reprice_sets_line_shortfalls(self):
+        line = lambda service_id, quantity, amount: ClaimServiceLine(
+            service_id=service_id, service_date=datetime.date(2024, 3, 1),
+            quantity=Decimal(quantity), claimed_amount=Decimal(amount)
+        )
+        lines = [line(self.service_id, 2, '250.00'), line(self.service_id, 1, '80.00'), line(uuid.uuid4(), 1, '999.00')]
+
+        shortfall = self.index.reprice(lines, self.tier_id)
+
+        self.assertEqual([l.shortfall_amount for l in lines], [Decimal('50.00'), Decimal('0.00'), Decimal('0.00')])
+        self.assertEqual(shortfall, Decimal('50.00'))
+
+
+class ReviewDueAtTest(SimpleTestCase):
+    def test_clinical_and_high_value_claims_are_due_first(self):
+        queued_at = datetime.datetime(2025, 3, 1, 9, 0)
+        due = lambda amount, clinical=False: review_due_at(queued_at, Decimal(amount), clinical)
+
+        self.assertEqual(due('200.00'), queued_at + datetime.timedelta(hours=72))
+        self.assertEqual(due('1000.00'), queued_at + datetime.timedelta(hours=60))
+        self.assertEqual(due('25000.00'), queued_at + datetime.timedelta(hours=48))
+        self.assertEqual(due('200.00', clinical=True), queued_at + datetime.timedelta(hours=24))
+        self.assertLess(due('25000.00', clinical=True), due('200.00', clinical=True))
+
+
+class BulkReviewPermissionErrorTest(SimpleTestCase):
+    def test_high_value_and_automatic_results_need_permissions(self):
+        threshold = Decimal('10000')
+        automatic = AdjudicationResult(original_amount=Decimal('25000.00'), processing_type='AUTOMATIC')
+        manual = AdjudicationResult(original_amount=Decimal('500.00'), processing_type='MANUAL')
+        allowed = {'high_value': True, 'override_auto': True}
+
+        self.assertIsNone(bulk_review_permission_error(None, {'high_value': False, 'override_auto': False}, threshold))
+        self.assertIsNone(bulk_review_permission_error(automatic, allowed, threshold))
+        self.assertIsNone(bulk_review_permission_error(manual, dict(allowed, high_value=False), threshold))
+        self.assertIsNotNone(bulk_review_permission_error(automatic, dict(allowed, high_value=False), threshold))
+        self.assertIsNotNone(bulk_review_permission_error(automatic, dict(allowed, override_auto=False), threshold))
+
+
+class AdjudicatorMetricsTest(SimpleTestCase):
+    def test_decisions_roll_up_by_adjudicator_and_day(self):
+        adjudicator_id = uuid.uuid4()
+        decided = datetime.datetime(2025, 3, 3, 10, 0, tzinfo=datetime.timezone.utc)
+        referred = decided - datetime.timedelta(hours=6)
+
+        days = summarize_adjudicator_days([
+            (adjudicator_id, decided, referred, 'APPROVED', False, Decimal('300.00'), Decimal('300.00')),
+            (adjudicator_id, decided, None, 'APPROVED', True, Decimal('500.00'), Decimal('400.00')),
+            (adjudicator_id, decided, referred, 'DECLINED', False, Decimal('200.00'), Decimal('0.00')),
+        ])
+
+        metrics = days[(adjudicator_id, datetime.date(2025, 3, 3))]
+        self.assertEqual((metrics['decisions'], metrics['approved'], metrics['declined'], metrics['modified']), (3, 2, 1, 1))
+        self.assertEqual(metrics['claimed_amount'], Decimal('1000.00'))
+        self.assertEqual(metrics['adjudicated_amount'], Decimal('700.00'))
+        self.assertEqual((metrics['turnaround_seconds'], metrics['turnaround_count']), (43200, 2))
+
+        report = quality_metrics(metrics, 30)
+        self.assertAlmostEqual(report['approval_rate'], 200 / 3)
+        self.assertEqual(report['savings_percentage'], 30.0)
+        self.assertEqual(report['average_turnaround_hours'], 6.0)
+        self.assertEqual(quality_metrics({'decisions': None}, 30), {'message': 'No recent decisions found'})
+
+
+class AdjudicationArchiveTest(SimpleTestCase):
+    def test_archived_rows_read_back_like_live_rows(self):
+        result = AdjudicationResult(
+            id=uuid.uuid4(), result='PENDING_REVIEW', processing_type='AUTOMATIC',
+            original_amount=Decimal('120.50'), adjudicated_amount=Decimal('120.50'),
+            processed_at=datetime.datetime(2024, 5, 1, 8, 30, tzinfo=datetime.timezone.utc), is_active=False
+        )
+        row = {field.attname: getattr(result, field.attname) for field in result._meta.concrete_fields}
+        message = {'adjudication_result_id': result.id, 'code': 'REVW001', 'custom_title': None,
+                   'custom_description': 'Referred for review', 'sequence_number': 1}
+
+        live = history_entries([row], [message], archived=False)
+        history = unpack_history(pack_history({'results': [row], 'messages': [message]}))
+        archived = history_entries(history['results'], history['messages'], archived=True)
+
+        self.assertEqual(archived[0].pop('archived'), True)
+        self.assertEqual(live[0].pop('archived'), False)
+        self.assertEqual(archived, live)
+        self.assertEqual(live[0]['messages'][0]['code'], 'REVW001')
+
+
+class CompactMessagesTest(SimpleTestCase):
+    def test_messages_round_trip_with_code_defaults(self):
+        compact = encode_messages([
+            ('BENF100', None, None),
+            ('PACK004', 'Co-payment of $20.00 applied', None),
+            ('REVW002', 'Override reason: duplicate', 'Reviewed'),
+        ])
+        self.assertEqual(compact, [
+            ['BENF100'], ['PACK004', 'Co-payment of $20.00 applied'], ['REVW002', 'Override reason: duplicate', 'Reviewed']
+        ])
+
+        codes = {'BENF100': AdjudicationMessageCode(
+            code='BENF100', title='Eligible', description='Beneficiary eligibility confirmed', message_type='INFO'
+        )}
+        messages = decode_messages(compact, codes)
+
+        self.assertEqual([message.sequence_number for message in messages], [1, 2, 3])
+        self.assertEqual((messages[0].title, messages[0].description), ('Eligible', 'Beneficiary eligibility confirmed'))
+        self.assertEqual((messages[1].title, messages[1].description), ('PACK004', 'Co-payment of $20.00 applied'))
+        self.assertEqual(messages[2].title, 'Reviewed')
+
+    def test_unit_of_work_writes_compact_arrays(self):
+        unit_of_work = AdjudicationUnitOfWork(compact_messages=True)
+        first = unit_of_work.add_result(AdjudicationResult(result='APPROVED'))
+        second = unit_of_work.add_result(AdjudicationResult(result='DECLINED'))
+        unit_of_work.add_message(first, 'BENF100', 'Beneficiary eligibility confirmed')
+        unit_of_work.add_message(first, 'NOPE001', 'Unknown')
+
+        unit_of_work._compact_messages({'BENF100': AdjudicationMessageCode(code='BENF100')})
+
+        self.assertEqual(first.compact_messages, [['BENF100', 'Beneficiary eligibility confirmed']])
+        self.assertEqual(second.compact_messages, [])
+
+
+class AdjudicationContextQueryBudgetTest(TestCase):
+    def test_query_count_does_not_grow_with_service_lines(self):
+        corpus = build_corpus()
+        short, long = Claim.objects.filter(pk__in=corpus.claim_sets['process_claim_adjudication'])
+        ClaimServiceLine.objects.filter(claim=short).exclude(
+            pk=ClaimServiceLine.objects.filter(claim=short).values('pk')[:1]
+        ).delete()
+        ClaimServiceLine.objects.filter(claim=long).delete()
+        ClaimServiceLine.objects.bulk_create([
+            ClaimServiceLine(
+                claim=long, service=service, service_date=long.start_date,
+                quantity=Decimal('1'), unit_price=service.base_price, claimed_amount=service.base_price
+            )
+            for service in corpus.services
+        ])
+
+        # Warm the process-level caches and compute provider compliance first
+        for claim in (short, long):
+            load_adjudication_context(Claim.objects.get(pk=claim.pk))
+
+        for claim, lines in ((short, 1), (long, 20)):
+            claim = Claim.objects.get(pk=claim.pk)
+            with self.assertNumQueries(7):
+                context = load_adjudication_context(claim)
+            self.assertEqual(len(context.service_lines), lines)
+
+
+def utilization_ledger():
+    """The utilization ledger's non-zero rows, keyed for comparison"""
+    return {
+        'annual': {
+            (row.beneficiary_id, row.benefit_year): (row.total_amount, row.claim_count)
+            for row in BeneficiaryUtilization.objects.exclude(total_amount=0, claim_count=0)
+        },
+        'category': {
+            (row.beneficiary_id, row.benefit_year, row.service_provider_type_id): (row.total_amount, row.claim_count)
+            for row in BeneficiaryCategoryUtilization.objects.exclude(total_amount=0, claim_count=0)
+        },
+        'visits': {
+            (row.beneficiary_id, row.service_id, row.visit_date, row.claim_id): row.visit_count
+            for row in BeneficiaryServiceVisit.objects.exclude(visit_count=0)
+        },
+    }
+
+
+class UtilizationLedgerTest(TestCase):
+    def setUp(self):
+        self.corpus = build_corpus(claims=3)
+        self.baseline = utilization_ledger()
+        self.claim = Claim.objects.get(pk=self.corpus.claim_sets['process_claim_adjudication'][0])
+        self.year = self.claim.start_date.year
+
+    def approve(self, amount='150.00'):
+        self.claim.status = 'A'
+        self.claim.adjudicated_amount = Decimal(amount)
+        self.claim.save()
+
+    def annual(self):
+        return utilization_ledger()['annual'].get((self.claim.beneficiary_id, self.year), (Decimal('0.00'), 0))
+
+    def test_approval_posts_amount_and_visits(self):
+        before = self.annual()
+        self.approve('150.00')
+
+        self.assertEqual(self.annual(), (before[0] + Decimal('150.00'), before[1] + 1))
+        visits = utilization_ledger()['visits']
+        for service_id in self.claim.services.values_list('service_id', flat=True):
+            self.assertEqual(visits[(self.claim.beneficiary_id, service_id, self.claim.start_date, self.claim.pk)], 1)
+
+    def test_replay_sees_utilization_before_the_claim(self):
+        Claim.objects.filter(beneficiary_id=self.claim.beneficiary_id).exclude(pk=self.claim.pk).update(status='D')
+        self.approve('150.00')
+
+        annual, categories = get_utilization_history([self.claim.beneficiary_id], [self.year]).totals(
+            self.claim.beneficiary_id, self.claim.start_date
+        )
+        self.assertEqual(annual, Decimal('150.00'))
+        self.assertEqual(sum(categories.values()), Decimal('150.00'))
+
+        claim = Claim.objects.get(pk=self.claim.pk)
+        context = _load_contexts([claim], AdjudicationReferenceData())[claim.pk]
+        self.assertEqual(context.annual_utilization, Decimal('0.00'))
+        self.assertEqual(context.category_utilization, {})
+
+    def test_amount_change_posts_only_the_difference(self):
+        before = self.annual()
+        self.approve('150.00')
+        visits = utilization_ledger()['visits']
+
+        claim = Claim.objects.get(pk=self.claim.pk)
+        claim.adjudicated_amount = Decimal('100.00')
+        claim.save()
+
+        self.assertEqual(self.annual(), (before[0] + Decimal('100.00'), before[1] + 1))
+        self.assertEqual(utilization_ledger()['visits'], visits)
+
+    def test_decline_and_reversal_take_the_claim_out(self):
+        self.approve()
+        self.claim.status = 'D'
+        self.claim.save()
+        self.assertEqual(utilization_ledger(), self.baseline)
+
+        self.approve()
+        self.claim.reversed = True
+        self.claim.save()
+        self.assertEqual(utilization_ledger(), self.baseline)
+
+    def test_deleting_an_approved_claim_removes_it(self):
+        self.approve()
+        Claim.objects.get(pk=self.claim.pk).delete()
+
+        self.assertEqual(utilization_ledger(), self.baseline)
+
+    def test_rebuild_equals_incremental_postings(self):
+        self.approve('150.00')
+        paid = Claim.objects.get(pk=self.corpus.claim_sets['process_claim_adjudication'][1])
+        paid.status, paid.adjudicated_amount = 'P', Decimal('75.50')
+        paid.save()
+        history = Claim.objects.filter(status='P', beneficiary=paid.beneficiary).exclude(pk=paid.pk).first()
+        history.status = 'D'
+        history.save()
+
+        incremental = utilization_ledger()
+        call_command('rebuild_utilization_ledger', stdout=io.StringIO())
+
+        self.assertEqual(utilization_ledger(), incremental)
+
+
+class AmountStatisticsPostingTest(TestCase):
+    def observations(self, scope, subject_id):
+        return ClaimAmountStatistics.objects.filter(
+            scope=scope, subject_id=subject_id
+        ).values_list('observations', flat=True).first() or 0
+
+    def test_statistics_are_posted_once_the_claim_commits(self):
+        corpus = build_corpus()
+        claim = Claim.objects.get(pk=corpus.claim_sets['process_claim_adjudication'][0])
+        service_ids = list(claim.services.values_list('service_id', flat=True))
+        before = [self.observations(PROVIDER_SCOPE, claim.provider_id)] + [
+            self.observations(SERVICE_SCOPE, service_id) for service_id in service_ids
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            claim.status, claim.adjudicated_amount = 'A', claim.claimed_amount
+            claim.save()
+            self.assertEqual(self.observations(PROVIDER_SCOPE, claim.provider_id), before[0])
+
+        after = [self.observations(PROVIDER_SCOPE, claim.provider_id)] + [
+            self.observations(SERVICE_SCOPE, service_id) for service_id in service_ids
+        ]
+        self.assertEqual(after, [count + 1 for count in before])
+
+
+class StartBatchAdjudicationTest(TestCase):
+    def test_a_members_claims_share_a_chunk(self):
+        corpus = build_corpus(claims=8)
+        claim_ids = corpus.claim_sets['process_claim_adjudication']
+
+        with self.captureOnCommitCallbacks():
+            batch = start_batch_adjudication(claim_ids, chunk_size=1)
+
+        pending = Claim.objects.filter(id__in=claim_ids, status='N')
+        beneficiaries = pending.values('beneficiary_id').distinct().count()
+        members = pending.values('beneficiary__member_id').distinct().count()
+        self.assertLess(members, beneficiaries)
+        self.assertEqual(batch.chunk_count, members)
+
+
+class ClaimReservationTest(TestCase):
+    def setUp(self):
+        self.corpus = build_corpus(claims=3)
+        self.claim = Claim.objects.select_related('beneficiary__member').get(
+            pk=self.corpus.claim_sets['process_claim_adjudication'][0]
+        )
+
+    def account(self):
+        member = self.claim.beneficiary.member
+        return MemberAccount.objects.get(member_id=member.id, currency_id=member.currency_id)
+
+    def test_approval_reserves_the_amount_once(self):
+        before = self.account()
+        result = process_claim_adjudication(self.claim)
+        self.assertEqual(result.result, 'APPROVED')
+
+        after = self.account()
+        amount = result.adjudicated_amount
+        self.assertEqual(after.available_balance, before.available_balance - amount)
+        self.assertEqual(after.reserved_balance, before.reserved_balance + amount)
+        self.assertEqual(after.balance, before.balance)
+
+        # A retried pipeline step finds the reserve and leaves the account alone
+        self.assertIsNone(reserve_claim_funds(Claim.objects.get(pk=self.claim.pk)))
+        self.assertEqual(self.account().reserved_balance, after.reserved_balance)
+
+    def test_status_reports_an_approval_without_reserve(self):
+        process_claim_adjudication(self.claim)
+        claim = Claim.objects.get(pk=self.claim.pk)
+        self.assertEqual(get_claim_adjudication_status(claim)['stage'], 'COMPLETED')
+
+        MemberTransaction.objects.filter(claim=claim, transaction_type='R').delete()
+        self.assertEqual(get_claim_adjudication_status(claim)['stage'], 'NO_RESERVE')
+
+    def test_identical_claim_is_declined_as_a_duplicate(self):
+        lines = list(ClaimServiceLine.objects.filter(claim=self.claim))
+        twin = Claim.objects.get(pk=self.claim.pk)
+        twin.id = uuid.uuid4()
+        twin._state.adding = True
+        twin.transaction_number = None
+        twin.invoice_number = f"{twin.invoice_number}-B"
+        twin.save()
+        for line in lines:
+            line.id = uuid.uuid4()
+            line._state.adding = True
+            line.claim = twin
+        ClaimServiceLine.objects.bulk_create(lines)
+
+        self.assertEqual(process_claim_adjudication(self.claim).result, 'APPROVED')
+        result = process_claim_adjudication(Claim.objects.get(pk=twin.pk))
+
+        self.assertEqual(result.result, 'DECLINED')
+        self.assertIn('FRAU001', [entry[0] for entry in result.compact_messages or []] + list(
+            result.messages.values_list('message_code__code', flat=True)
+        ))
+
+    def test_claim_adjudicated_elsewhere_is_skipped(self):
+        stale = Claim.objects.get(pk=self.claim.pk)
+        process_claim_adjudication(self.claim)
+        results = AdjudicationResult.objects.filter(claim=self.claim).count()
+        reserved = self.account().reserved_balance
+
+        self.assertIsNone(process_claim_adjudication(stale))
+        self.assertEqual(AdjudicationResult.objects.filter(claim=self.claim).count(), results)
+        self.assertEqual(self.account().reserved_balance, reserved)
+
+
+class SyntheticCorpusTest(TestCase):
+    def test_a_second_corpus_reuses_the_tiers(self):
+        first = build_corpus()
+        second = SyntheticCorpus(seed=8, members=1, beneficiaries_per_member=1, providers=1, services=5,
+                                 rules=1, history_claims=1, claims=1).build()
+
+        self.assertEqual([tier.pk for tier in second.tiers], [tier.pk for tier in first.tiers])
+
+
+class ProviderTypeChangeTest(TestCase):
+    def test_compliance_follows_the_new_type(self):
+        corpus = build_corpus()
+        provider = corpus.providers[0]
+        refresh_provider_compliance([provider.id])
+        self.assertEqual(ProviderComplianceStatus.objects.get(service_provider_id=provider.id).missing_documents, [])
+
+        new_type = next(provider_type for provider_type in corpus.provider_types if provider_type.pk != provider.type_id)
+        document_type = ServiceProviderDocumentType.objects.create(name='Practising Licence')
+        ServiceProviderTypeRequirement.objects.create(
+            provider_type=new_type, document_type=document_type, is_required=True
+        )
+
+        provider = ServiceProvider.objects.get(pk=provider.pk)
+        provider.type = new_type
+        provider.save()
+
+        status = ProviderComplianceStatus.objects.get(service_provider_id=provider.id)
+        self.assertEqual([document['name'] for document in status.missing_documents], ['Practising Licence'])
+
+
+class GetEligibilityTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        build_corpus()
+        self.beneficiary, self.other = Beneficiary.objects.order_by('membership_number', 'dependent_code')[:2]
+
+    def inquire(self, membership_number, dependent_code):
+        result = get_eligibility(membership_number, dependent_code)
+        return result and result['beneficiary_id']
+
+    def test_renumbered_beneficiary_is_not_found_under_the_old_numbers(self):
+        old = (self.beneficiary.membership_number, self.beneficiary.dependent_code)
+        self.assertEqual(self.inquire(*old), str(self.beneficiary.pk))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.beneficiary.dependent_code = '099'
+            self.beneficiary.package = self.beneficiary.member.default_package
+            self.beneficiary.save()
+
+        self.assertIsNone(self.inquire(*old))
+        self.assertEqual(self.inquire(self.beneficiary.membership_number, '099'), str(self.beneficiary.pk))
+
+    def test_stale_cached_id_is_looked_up_again(self):
+        numbers = (self.beneficiary.membership_number, self.beneficiary.dependent_code)
+        self.inquire(self.other.membership_number, self.other.dependent_code)
+        cache.set(f"eligibility_beneficiary:{numbers[0]}:{numbers[1]}", str(self.other.pk))
+
+        self.assertEqual(self.inquire(*numbers), str(self.beneficiary.pk))
+
+
+class ReviewPostingTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.corpus = build_corpus(claims=4)
+        self.claim_ids = self.corpus.claim_sets['manual_review']
+
+        # One claim already holds a reserve, as after an earlier approval
+        reserved = Claim.objects.select_related('beneficiary__member').get(pk=self.claim_ids[0])
+        reserved.status, reserved.adjudicated_amount = 'A', Decimal('40.00')
+        reserve_claim_funds(reserved)
+
+    def balances(self):
+        return {
+            account.pk: (account.balance, account.available_balance, account.reserved_balance)
+            for account in MemberAccount.objects.all()
+        }
+
+    def review(self, review_data, bulk):
+        with transaction.atomic():
+            if bulk:
+                process_bulk_manual_review(self.claim_ids, review_data, self.corpus.user)
+            else:
+                for claim_id in self.claim_ids:
+                    ManualAdjudicationEngine(Claim.objects.get(pk=claim_id), self.corpus.user).review_claim(review_data)
+            balances = self.balances()
+            transaction.set_rollback(True)
+        return balances
+
+    def test_bulk_and_single_reviews_post_the_same_balances(self):
+        before = self.balances()
+        for decision in ('approve', 'decline'):
+            review_data = {'decision': decision, 'override_reason': 'Reviewed'}
+            single = self.review(review_data, bulk=False)
+
+            self.assertNotEqual(single, before)
+            self.assertEqual(self.review(review_data, bulk=True), single)
+
+    def test_posting_drops_cached_eligibility(self):
+        claim = Claim.objects.select_related('beneficiary__member').get(pk=self.claim_ids[1])
+        numbers = (claim.beneficiary.membership_number, claim.beneficiary.dependent_code)
+        cached = get_eligibility(*numbers)['account']['available_balance']
+
+        # Claim saves drop the snapshot too, so post on its own
+        with self.captureOnCommitCallbacks(execute=True):
+            post_review_transactions(
+                [(claim, AdjudicationResult(result='APPROVED', adjudicated_amount=Decimal('25.00')))], timezone.now()
+            )
+
+        self.assertEqual(get_eligibility(*numbers)['account']['available_balance'], cached - Decimal('25.00'))
+
+
+class CategoryLimitEnforcementTest(TestCase):
+    def setUp(self):
+        self.corpus = build_corpus(claims=3)
+        # Leave the amounts to the package limits
+        AdjudicationRule.objects.update(is_active=False)
+        self.claim_id = self.corpus.claim_sets['process_claim_adjudication'][0]
+        claim = Claim.objects.select_related('beneficiary').get(pk=self.claim_id)
+        self.used = get_annual_utilization(claim.beneficiary_id, claim.start_date.year)
+        self.categories = claim.services.values('service__service_provider_type_id').distinct().count()
+
+    def adjudicate(self, per_visit_limit, annual_remaining, co_payment_percentage):
+        PackageLimit.objects.filter(package=self.corpus.package).update(
+            annual_limit=Decimal('0.00'), per_visit_limit=Decimal(per_visit_limit), max_visits_per_year=0,
+            co_payment_percentage=Decimal(co_payment_percentage), co_payment_amount=Decimal('0.00'),
+            waiting_period_days=0,
+        )
+        Package.objects.filter(pk=self.corpus.package.pk).update(
+            global_annual_limit=self.used + Decimal(annual_remaining)
+        )
+        # Drop the coverage matrix built before the limits changed
+        cache.clear()
+        return process_claim_adjudication(Claim.objects.get(pk=self.claim_id))
+
+    def test_per_visit_cap_applies_before_the_annual_cap(self):
+        result = self.adjudicate('1.00', '10.00', '10')
+
+        self.assertEqual(result.result, 'APPROVED')
+        self.assertEqual(result.claim.accepted_amount, Decimal('1.00') * self.categories)
+        self.assertEqual(result.co_payment_amount, Decimal('0.10') * self.categories)
+        self.assertEqual(result.adjudicated_amount, Decimal('0.90') * self.categories)
+
+    def test_co_payment_is_taken_from_the_annual_capped_amount(self):
+        result = self.adjudicate('0.00', '10.00', '10')
+
+        self.assertEqual(result.result, 'APPROVED')
+        self.assertEqual(result.claim.accepted_amount, Decimal('10.00'))
+        self.assertAlmostEqual(result.co_payment_amount, Decimal('1.00'), delta=Decimal('0.01') * self.categories)
+        self.assertEqual(result.adjudicated_amount, Decimal('10.00') - result.co_payment_amount)
@@ -59,4 +59,15 @@ urlpatterns = [
     path('htmx/adjudicate-claim/<uuid:pk>/', views.adjudicate_claim, name='adjudicate_claim'),
     path('htmx/approve-request/<uuid:pk>/', views.approve_service_request, name='approve_service_request'),
     path('htmx/decline-request/<uuid:pk>/', views.decline_service_request, name='decline_service_request'),
+    path('htmx/claim/<uuid:pk>/adjudication-status/', views.claim_adjudication_status, name='claim_adjudication_status'),
+    path('htmx/claim/<uuid:pk>/adjudication-history/', views.claim_adjudication_history, name='claim_adjudication_history'),
+    path('htmx/adjudication-batch/<uuid:pk>/status/', views.adjudication_batch_status, name='adjudication_batch_status'),
+
+    # Manual review queue
+    path('review-queue/next/', views.review_queue_next, name='review_queue_next'),
+    path('review-queue/<uuid:pk>/renew/', views.review_queue_renew, name='review_queue_renew'),
+    path('review-queue/<uuid:pk>/release/', views.review_queue_release, name='review_queue_release'),
+
+    # Eligibility inquiry
+    path('eligibility/inquiry/', views.eligibility_inquiry, name='eligibility_inquiry'),
 ]
\ No newline at end of file
@@ -20,6 +20,7 @@ from datetime import datetime, timedelta
 from .models.claim import Claim, ClaimServiceLine
 from .models.service_request import ServiceRequest, ServiceRequestItem
 from .models.adjudication import AdjudicationMessageCode
+from .models.adjudication_batch import AdjudicationBatch
 from configurations.models.service import Service, ServiceModifier, ServiceTierPrice
 from configurations.models.service_provider import ServiceProvider
 from membership.models import Beneficiary
@@ -794,6 +795,120 @@ def adjudicate_claim(request, claim_id):
         return htmx_error_response(f"Error adjudicating claim: {str(e)}")
 
 
+@login_required
+def claim_adjudication_status(request, pk):
+    """JSON endpoint for polling a submitted claim's adjudication outcome"""
+    from services.functions.claim_pipeline import get_claim_adjudication_status
+
+    claim = get_object_or_404(Claim, pk=pk)
+
+    return JsonResponse(get_claim_adjudication_status(claim))
+
+
+@login_required
+def claim_adjudication_history(request, pk):
+    """JSON endpoint for a claim's adjudication history; ?archived=1 adds the archived results"""
+    from services.functions.adjudication_archive import get_claim_adjudication_history
+
+    claim = get_object_or_404(Claim, pk=pk)
+    include_archived = request.GET.get('archived') in ('1', 'true')
+
+    return JsonResponse({'history': get_claim_adjudication_history(claim, include_archived)})
+
+
+@login_required
+def adjudication_batch_status(request, pk):
+    """JSON endpoint for polling the progress of an adjudication batch"""
+    batch = get_object_or_404(AdjudicationBatch, pk=pk)
+
+    return JsonResponse({
+        'id': str(batch.id),
+        'status': batch.status,
+        'status_display': batch.get_status_display(),
+        'total_claims': batch.total_claims,
+        'processed': batch.processed,
+        'approved': batch.approved,
+        'declined': batch.declined,
+        'pending_review': batch.pending_review,
+        'pending_clinical': batch.pending_clinical,
+        'errors': batch.errors,
+        'progress_percentage': batch.progress_percentage,
+        'started_at': batch.started_at.isoformat() if batch.started_at else None,
+        'completed_at': batch.completed_at.isoformat() if batch.completed_at else None,
+    })
+
+
+def _review_queue_item_json(item):
+    claim = item.claim
+    return {
+        'claim_id': str(claim.id),
+        'transaction_number': claim.transaction_number,
+        'claimed_amount': str(item.claimed_amount),
+        'clinical': item.clinical,
+        'due_at': item.due_at.isoformat(),
+        'leased_until': item.leased_until.isoformat(),
+    }
+
+
+@login_required
+@require_http_methods(["POST"])
+def review_queue_next(request):
+    """JSON endpoint that leases the next claim due for manual review to the current user"""
+    from services.functions.review_queue import claim_next_review
+
+    if not request.user.has_perm('services.can_adjudicate_claims'):
+        return JsonResponse({'error': 'Insufficient permissions'}, status=403)
+
+    item = claim_next_review(request.user)
+    if item is None:
+        return JsonResponse({'claim': None})
+
+    return JsonResponse({'claim': _review_queue_item_json(item)})
+
+
+@login_required
+@require_http_methods(["POST"])
+def review_queue_renew(request, pk):
+    """JSON endpoint that extends the current user's lease on a claim under review"""
+    from services.functions.review_queue import renew_review_lease
+
+    claim = get_object_or_404(Claim, pk=pk)
+    if not renew_review_lease(claim, request.user):
+        return JsonResponse({'error': 'Lease expired or held by another adjudicator'}, status=409)
+
+    return JsonResponse({'renewed': True})
+
+
+@login_required
+@require_http_methods(["POST"])
+def review_queue_release(request, pk):
+    """JSON endpoint that returns a leased claim to the review queue undecided"""
+    from services.functions.review_queue import release_review
+
+    claim = get_object_or_404(Claim, pk=pk)
+
+    return JsonResponse({'released': release_review(claim, request.user)})
+
+
+@login_required
+@require_http_methods(["GET"])
+def eligibility_inquiry(request):
+    """Read-only JSON endpoint for eligibility and remaining benefits, served from the cached snapshot"""
+    from services.functions.eligibility import get_eligibility
+
+    membership_number = request.GET.get('membership_number', '').strip()
+    dependent_code = request.GET.get('dependent_code', '000').strip()
+
+    if not membership_number:
+        return JsonResponse({'error': 'membership_number is required'}, status=400)
+
+    eligibility = get_eligibility(membership_number, dependent_code)
+    if eligibility is None:
+        return JsonResponse({'error': 'Beneficiary not found'}, status=404)
+
+    return JsonResponse(eligibility)
+
+
 def approve_service_request(request, request_id):
     """HTMX endpoint for service request approval"""
     if request.method != 'POST':